@@ -0,0 +1,97 @@
+# ruff: noqa: T201
+"""
+Measure how long importing each part of the package takes in a fresh interpreter, using `python -X importtime`, and
+which of the heavy dependencies each one imports.
+
+Usage:
+    benchmarks/import_time_benchmark.py [options]
+
+Run from the repository root with `python -m benchmarks.import_time_benchmark`.
+
+Options:
+    --repeat=<n>            Number of fresh interpreters to time each import in, taking the median [default: 10]
+    --output=<file>         Write the results as JSON to this file
+    --baseline=<file>       Results of an earlier run to compare with. Exits with status 1 if any import is more than
+                            the threshold slower, or imports a heavy dependency it didn't before
+    --threshold=<percent>   How much slower than the baseline counts as a regression [default: 20]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+from docopt import docopt
+
+MODULES = [
+    "notifications_python_client",
+    "notifications_python_client.authentication",
+    "notifications_python_client.notifications",
+    "notifications_python_client.async_notifications",
+]
+
+HEAVY_DEPENDENCIES = ["requests", "jwt", "cryptography", "jsonschema", "httpx", "orjson", "opentelemetry", "pyarrow"]
+
+
+def import_time(module):
+    """
+    :return: tuple of the microseconds importing module took, and the set of the names of the modules it imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    total = 0
+    imported = set()
+    after_startup = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if after_startup:
+            imported.add(name.strip())
+            # only count the imports made by the import statement itself, not those they make in turn
+            if not name.startswith("  "):
+                total += int(cumulative)
+        after_startup = after_startup or name.strip() == "site"
+    return total, imported
+
+
+def measure(module, repeat):
+    times = []
+    for _ in range(repeat):
+        microseconds, imported = import_time(module)
+        times.append(microseconds)
+    heavy = sorted(dependency for dependency in HEAVY_DEPENDENCIES if dependency in imported)
+    return {"module": module, "milliseconds": statistics.median(times) / 1000, "heavy_dependencies": heavy}
+
+
+def regressions(results, baseline, threshold):
+    previous = {result["module"]: result for result in baseline["results"]}
+    for result in results:
+        before = previous.get(result["module"])
+        if before is None:
+            continue
+        if result["milliseconds"] > before["milliseconds"] * (1 + threshold / 100):
+            yield f"{result['module']} took {result['milliseconds']:.1f}ms, was {before['milliseconds']:.1f}ms"
+        new_dependencies = set(result["heavy_dependencies"]) - set(before["heavy_dependencies"])
+        if new_dependencies:
+            yield f"{result['module']} now imports {', '.join(sorted(new_dependencies))}"
+
+
+if __name__ == "__main__":
+    arguments = docopt(__doc__)
+    results = [measure(module, int(arguments["--repeat"])) for module in MODULES]
+
+    for result in results:
+        print(f"{result['module']:50} {result['milliseconds']:7.1f}ms  {', '.join(result['heavy_dependencies'])}")
+
+    if arguments["--output"]:
+        with open(arguments["--output"], "w") as output:
+            json.dump({"python": sys.version.split()[0], "results": results}, output, indent=2)
+
+    if arguments["--baseline"]:
+        with open(arguments["--baseline"]) as baseline_file:
+            found = list(regressions(results, json.load(baseline_file), float(arguments["--threshold"])))
+        for regression in found:
+            print(f"Regression: {regression}")
+        sys.exit(1 if found else 0)
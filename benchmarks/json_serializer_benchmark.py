@@ -0,0 +1,95 @@
+# ruff: noqa: T201
+"""
+Compare the JSON serializers on a large email send and on parsing a full page of notifications.
+
+Usage:
+    benchmarks/json_serializer_benchmark.py [--number=<n>]
+
+Run from the repository root with `python -m benchmarks.json_serializer_benchmark`. Serializers whose library is
+not installed are skipped.
+
+Options:
+    --number=<n>  Times to serialise or parse each payload for each serializer [default: 2000]
+"""
+
+import timeit
+import uuid
+from functools import partial
+
+from docopt import docopt
+
+from notifications_python_client.base import BaseAPIClient
+from notifications_python_client.serializers import SERIALIZERS
+
+API_KEY = "key_name-c745a8d8-b48a-4b0d-96e5-dbea0165ebd1-8b3aa916-ec82-434e-b0c5-d5d9b371d6a3"
+
+
+def email_request():
+    return {
+        "email_address": "someone@example.com",
+        "template_id": str(uuid.uuid4()),
+        "reference": "benchmark",
+        "personalisation": {
+            **{f"field_{i}": "Lorem ipsum dolor sit amet, consectetur adipiscing élit. " * 4 for i in range(50)},
+            "items": {f"item {i}" for i in range(50)},
+        },
+    }
+
+
+def notifications_page():
+    return {
+        "notifications": [
+            {
+                "id": str(uuid.uuid4()),
+                "reference": f"ref-{i}",
+                "email_address": None,
+                "phone_number": "+447900900123",
+                "line_1": None,
+                "line_2": None,
+                "postcode": None,
+                "type": "sms",
+                "status": "delivered",
+                "template": {"id": str(uuid.uuid4()), "version": 3, "uri": "https://example.com/template"},
+                "body": "Hello Zoë, your appointment is on Tuesday at 10am. Reply STOP to opt out.",
+                "subject": None,
+                "created_at": "2026-10-18T10:00:00.000000Z",
+                "created_by_name": None,
+                "sent_at": "2026-10-18T10:00:01.000000Z",
+                "completed_at": "2026-10-18T10:00:05.000000Z",
+                "scheduled_for": None,
+                "postage": None,
+                "cost_in_pounds": 0.0227,
+                "cost_details": {"billable_sms_fragments": 1, "international_rate_multiplier": 1.0},
+            }
+            for i in range(250)
+        ],
+        "links": {
+            "current": "https://api.notifications.service.gov.uk/v2/notifications",
+            "next": "https://api.notifications.service.gov.uk/v2/notifications?older_than=" + str(uuid.uuid4()),
+        },
+    }
+
+
+def time_per_call(function, number):
+    return timeit.timeit(function, number=number) / number
+
+
+if __name__ == "__main__":
+    arguments = docopt(__doc__)
+    number = int(arguments["--number"])
+
+    request = email_request()
+    page = notifications_page()
+    page_content = SERIALIZERS["json"]().dumps(page).encode()
+
+    print(f"{'serializer':<12}{'email request':>16}{'notifications page':>22}")
+    for name in SERIALIZERS:
+        try:
+            client = BaseAPIClient(api_key=API_KEY, json_serializer=name)
+        except ImportError:
+            print(f"{name:<12}{'not installed':>16}")
+            continue
+
+        serialise = time_per_call(partial(client._serialize_data, request), number)
+        parse = time_per_call(partial(client.json_serializer.loads, page_content), number)
+        print(f"{name:<12}{serialise * 1e6:14.1f}µs{parse * 1e6:20.1f}µs")
@@ -0,0 +1,38 @@
+# ruff: noqa: T201
+"""
+Compare the per-request cost of authenticating with a freshly signed JWT token against reusing a cached one.
+
+Usage:
+    benchmarks/jwt_token_benchmark.py [--number=<n>]
+
+Run from the repository root with `python -m benchmarks.jwt_token_benchmark`.
+
+Options:
+    --number=<n>  Requests to time for each case [default: 20000]
+"""
+
+import timeit
+
+from docopt import docopt
+
+from notifications_python_client.base import BaseAPIClient
+
+API_KEY = "key_name-c745a8d8-b48a-4b0d-96e5-dbea0165ebd1-8b3aa916-ec82-434e-b0c5-d5d9b371d6a3"
+
+
+def per_request_cost(jwt_token_lifetime, number):
+    client = BaseAPIClient(api_key=API_KEY, jwt_token_lifetime=jwt_token_lifetime)
+    seconds = timeit.timeit(lambda: client._create_request_objects("/v2/notifications", None, None), number=number)
+    return seconds / number
+
+
+if __name__ == "__main__":
+    arguments = docopt(__doc__)
+    number = int(arguments["--number"])
+
+    uncached = per_request_cost(0, number)
+    cached = per_request_cost(10, number)
+
+    print(f"signing every request:  {uncached * 1e6:8.2f}µs per request")
+    print(f"cached for 10 seconds:  {cached * 1e6:8.2f}µs per request")
+    print(f"speed up:               {uncached / cached:8.1f}x")
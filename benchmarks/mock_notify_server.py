@@ -0,0 +1,204 @@
+"""
+A local stand-in for the GOV.UK Notify API, for benchmarking the client without a live service.
+
+It answers the endpoints the client uses with responses shaped like the real API's, and does little work beyond
+reading the request body. Run it in its own process with `serve_in_subprocess`, so that it doesn't compete with
+the client being measured for the GIL.
+"""
+
+import contextlib
+import json
+import multiprocessing
+import threading
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_SIZE = 250
+
+
+def _id(number):
+    return str(uuid.UUID(int=number))
+
+
+def _notification(number, notification_type="sms"):
+    return {
+        "id": _id(number),
+        "reference": f"ref-{number}",
+        "email_address": "someone@example.com" if notification_type == "email" else None,
+        "phone_number": "+447900900123" if notification_type == "sms" else None,
+        "line_1": None,
+        "line_2": None,
+        "postcode": None,
+        "type": notification_type,
+        "status": "delivered",
+        "template": {"id": _id(0), "version": 1, "uri": "http://localhost/v2/template/" + _id(0)},
+        "body": "Hello, your appointment is on Tuesday at 10am.",
+        "subject": None,
+        "created_at": "2026-10-18T10:00:00.000000Z",
+        "created_by_name": None,
+        "sent_at": "2026-10-18T10:00:01.000000Z",
+        "completed_at": "2026-10-18T10:00:05.000000Z",
+        "scheduled_for": None,
+        "postage": None,
+    }
+
+
+def _received_text(number):
+    return {
+        "id": _id(number),
+        "user_number": "447900900123",
+        "notify_number": "07900900000",
+        "content": "Yes, I will be there",
+        "created_at": "2026-10-18T10:00:00.000000Z",
+        "service_id": _id(0),
+    }
+
+
+def _template(number):
+    return {
+        "id": _id(number),
+        "name": f"Template {number}",
+        "type": "email",
+        "created_at": "2026-10-18T10:00:00.000000Z",
+        "updated_at": None,
+        "created_by": "someone@example.com",
+        "version": 1,
+        "body": "Hello ((name)), your appointment is on ((date)).",
+        "subject": "Your appointment",
+        "letter_contact_block": None,
+    }
+
+
+class MockNotifyServer(ThreadingHTTPServer):
+    """
+    Serves the mock API from a background thread. Use it as a context manager:
+
+        with MockNotifyServer(total_items=2500) as server:
+            client = NotificationsAPIClient(api_key, base_url=server.url)
+    """
+
+    daemon_threads = True
+    # don't refuse connections when many benchmark threads connect at once
+    request_queue_size = 128
+
+    def __init__(self, total_items=PAGE_SIZE * 10, port=0):
+        """
+        :param total_items - number of notifications, and of received texts, the paginated endpoints return:
+        :param port - port to listen on, 0 for any free port:
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.total_items = total_items
+        # pages never change, so each is only serialised once
+        self._pages = {}
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def page(self, path, older_than, make_item, items_key):
+        key = (path, older_than)
+        if key not in self._pages:
+            self._pages[key] = json.dumps(self._make_page(path, older_than, make_item, items_key)).encode()
+        return self._pages[key]
+
+    def _make_page(self, path, older_than, make_item, items_key):
+        # items are numbered from total_items down to 1, newest first, and each id encodes its number
+        start = uuid.UUID(older_than).int - 1 if older_than else self.total_items
+        numbers = range(start, max(start - PAGE_SIZE, 0), -1)
+        links = {"current": self.url + path}
+        if len(numbers) == PAGE_SIZE and numbers[-1] > 1:
+            links["next"] = f"{self.url}{path}?older_than={_id(numbers[-1])}"
+        return {items_key: [make_item(number) for number in numbers], "links": links}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # buffer each response so its headers and body are sent together, and send it straight away. Otherwise delayed
+    # ACKs add around 40ms to every request
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        parts = url.path.strip("/").split("/")
+
+        if url.path == "/v2/notifications":
+            self._respond(200, self.server.page(url.path, query.get("older_than"), _notification, "notifications"))
+        elif url.path == "/v2/received-text-messages":
+            self._respond(
+                200, self.server.page(url.path, query.get("older_than"), _received_text, "received_text_messages")
+            )
+        elif url.path == "/v2/templates":
+            self._respond(200, {"templates": [_template(number) for number in range(1, 51)]})
+        elif parts[:2] == ["v2", "notifications"] and len(parts) == 3:
+            self._respond(200, _notification(uuid.UUID(parts[2]).int))
+        elif parts[:2] == ["v2", "template"] and len(parts) in (3, 5):
+            self._respond(200, _template(uuid.UUID(parts[2]).int))
+        else:
+            self._respond(404, {"errors": [{"error": "NotFound", "message": "Not found"}], "status_code": 404})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        if self.path in ("/v2/notifications/sms", "/v2/notifications/email", "/v2/notifications/letter"):
+            notification_type = self.path.rsplit("/", 1)[1]
+            response = {
+                "id": _id(1),
+                "reference": body.get("reference"),
+                "content": {"body": "Hello", "subject": None if notification_type == "sms" else "Subject"},
+                "uri": f"{self.server.url}/v2/notifications/{_id(1)}",
+                "template": {"id": body.get("template_id"), "version": 1, "uri": "http://localhost/v2/template"},
+            }
+            self._respond(201, response)
+        else:
+            self._respond(404, {"errors": [{"error": "NotFound", "message": "Not found"}], "status_code": 404})
+
+    def _respond(self, status_code, data):
+        content = data if isinstance(data, bytes) else json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@contextlib.contextmanager
+def serve_in_subprocess(total_items=PAGE_SIZE * 10):
+    """
+    Run a MockNotifyServer in a child process.
+
+    :param total_items: number of notifications, and of received texts, the paginated endpoints return
+    :return: context manager giving the server's URL
+    """
+    context = multiprocessing.get_context("spawn")
+    urls = context.Queue()
+    process = context.Process(target=_serve, args=(total_items, urls), daemon=True)
+    process.start()
+    try:
+        yield urls.get(timeout=30)
+    finally:
+        process.terminate()
+        process.join()
+
+
+def _serve(total_items, urls):
+    with MockNotifyServer(total_items=total_items) as server:
+        urls.put(server.url)
+        server._thread.join()
@@ -0,0 +1,85 @@
+# ruff: noqa: T201
+"""
+Compare the memory taken by the notifications parsed from pages of the API's responses when they are kept as dicts
+and when they are kept as Notification models, and the cost of making the models.
+
+Usage:
+    benchmarks/model_memory_benchmark.py [--pages=<n>]
+
+Run from the repository root with `python -m benchmarks.model_memory_benchmark`.
+
+Options:
+    --pages=<n>  Pages of 250 notifications to keep [default: 200]
+"""
+
+import json
+import time
+import tracemalloc
+import uuid
+
+from docopt import docopt
+
+from benchmarks.json_serializer_benchmark import notifications_page
+from notifications_python_client.models import Notification
+
+# a service sends most of its notifications from a handful of templates
+TEMPLATE_IDS = [str(uuid.uuid4()) for _ in range(5)]
+
+
+def page_content():
+    page = notifications_page()
+    for i, notification in enumerate(page["notifications"]):
+        notification["template"]["id"] = TEMPLATE_IDS[i % len(TEMPLATE_IDS)]
+    return json.dumps(page)
+
+
+def keep_notifications(page_contents, models):
+    """
+    Parse each page and keep its notifications, as a program paging through get_all_notifications_iterator would
+
+    :return: list of the notifications
+    """
+    kept = []
+    for content in page_contents:
+        notifications = json.loads(content)["notifications"]
+        kept.extend(map(Notification, notifications) if models else notifications)
+    return kept
+
+
+def memory_used(page_contents, models):
+    """
+    :return: bytes allocated for the notifications kept
+    """
+    tracemalloc.start()
+    kept = keep_notifications(page_contents, models)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return allocated
+
+
+def time_taken(page_contents, models):
+    """
+    :return: seconds it took to parse and keep the notifications, measured apart from memory as tracing slows
+        allocations down
+    """
+    start_time = time.perf_counter()
+    keep_notifications(page_contents, models)
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    arguments = docopt(__doc__)
+    pages = int(arguments["--pages"])
+    # each page parsed separately, so that no strings are shared between pages
+    page_contents = [page_content() for _ in range(pages)]
+    count = pages * len(notifications_page()["notifications"])
+
+    dict_bytes, dict_time = memory_used(page_contents, False), time_taken(page_contents, False)
+    model_bytes, model_time = memory_used(page_contents, True), time_taken(page_contents, True)
+
+    print(f"{count} notifications")
+    print(f"{'':<10}{'bytes each':>12}{'µs each':>10}")
+    print(f"{'dict':<10}{dict_bytes / count:12.0f}{dict_time / count * 1e6:10.1f}")
+    print(f"{'model':<10}{model_bytes / count:12.0f}{model_time / count * 1e6:10.1f}")
+    print(f"Models take {1 - model_bytes / dict_bytes:.0%} less memory")
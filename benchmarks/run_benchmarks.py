@@ -0,0 +1,233 @@
+# ruff: noqa: T201
+"""
+Benchmark the client's hot paths against a local mock Notify server, and write the results as JSON.
+
+Each benchmark is run at each concurrency level for a fixed time, with that many threads sharing one client. The
+results give the throughput and the p50 and p99 latency of each operation. Compare them with a baseline from an
+earlier release to catch regressions.
+
+Usage:
+    benchmarks/run_benchmarks.py [options]
+
+Run from the repository root with `python -m benchmarks.run_benchmarks`, or `make benchmark`.
+
+Options:
+    --duration=<seconds>        Time to run each benchmark at each concurrency level for [default: 2]
+    --concurrency=<levels>      Comma separated numbers of threads [default: 1,8,32]
+    --only=<names>              Comma separated names of the benchmarks to run, rather than all of them
+    --json-serializer=<name>    JSON serializer for the client to use [default: json]
+    --output=<file>             Write the results to this file rather than to stdout
+    --baseline=<file>           Results of an earlier run to compare with. Exits with status 1 if any benchmark's
+                                p50 latency or throughput is more than the threshold worse
+    --threshold=<percent>       How much worse than the baseline counts as a regression [default: 10]
+"""
+
+import io
+import itertools
+import json
+import math
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from docopt import docopt
+
+from benchmarks.mock_notify_server import PAGE_SIZE, serve_in_subprocess
+from notifications_python_client import __version__
+from notifications_python_client.authentication import create_jwt_token
+from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.utils import prepare_upload
+
+SERVICE_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+API_KEY_ID = "8b3aa916-ec82-434e-b0c5-d5d9b371d6a3"
+API_KEY = f"key_name-{SERVICE_ID}-{API_KEY_ID}"
+TEMPLATE_ID = "5ba4d6f4-6e5a-4bde-9bd2-9c0e8b0b4e4a"
+
+KB = 1024
+
+
+def personalisation(size):
+    """
+    :param size: approximate size in bytes of the personalisation, split into 100 character fields
+    """
+    return {f"field_{i}": "x" * 100 for i in range(max(1, size // 100))}
+
+
+def benchmarks(client):
+    """
+    :return: list of (name, params, operation) for each benchmark, where operation is a function taking no arguments
+    """
+    cases = [
+        ("create_jwt_token", {}, lambda: create_jwt_token(API_KEY_ID, SERVICE_ID)),
+    ]
+    for size in (100, 10 * KB):
+        fields = personalisation(size)
+        cases.append(
+            (
+                "send_sms_notification",
+                {"personalisation_bytes": size},
+                lambda fields=fields: client.send_sms_notification("07700900123", TEMPLATE_ID, fields),
+            )
+        )
+    for size in (100, 10 * KB, 100 * KB):
+        fields = personalisation(size)
+        cases.append(
+            (
+                "send_email_notification",
+                {"personalisation_bytes": size},
+                lambda fields=fields: client.send_email_notification("someone@example.com", TEMPLATE_ID, fields),
+            )
+        )
+    fields = {"address_line_1": "A Person", "address_line_2": "1 Street", "address_line_3": "SW1A 1AA"}
+    cases.append(
+        ("send_letter_notification", {}, lambda: client.send_letter_notification(TEMPLATE_ID, fields)),
+    )
+    for size in (10 * KB, 1024 * KB, 5 * 1024 * KB):
+        pdf = b"%PDF-1.4" + b"x" * (size - 8)
+        cases.append(
+            (
+                "send_precompiled_letter_notification",
+                {"pdf_bytes": size},
+                lambda pdf=pdf: client.send_precompiled_letter_notification("ref", io.BytesIO(pdf)),
+            )
+        )
+    for size in (10 * KB, 1024 * KB, 2 * 1024 * KB):
+        document = b"x" * size
+        cases.append(
+            ("prepare_upload", {"file_bytes": size}, lambda document=document: prepare_upload(io.BytesIO(document)))
+        )
+    for pages, prefetch_pages in ((1, 0), (10, 0), (10, 2)):
+        cases.append(
+            (
+                "get_all_notifications_iterator",
+                {"pages": pages, "prefetch_pages": prefetch_pages},
+                lambda pages=pages, prefetch_pages=prefetch_pages: _consume(
+                    client.get_all_notifications_iterator(prefetch_pages=prefetch_pages), pages * PAGE_SIZE
+                ),
+            )
+        )
+    return cases
+
+
+def _consume(iterator, number):
+    for _ in itertools.islice(iterator, number):
+        pass
+
+
+def run(operation, concurrency, duration):
+    """
+    Call operation repeatedly from concurrency threads for duration seconds.
+
+    :return: dict of the number of operations, throughput and latency percentiles
+    """
+    # the first call opens connections and signs a token, which later calls reuse
+    operation()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        deadline = started + duration
+        futures = [executor.submit(_time_until, operation, deadline) for _ in range(concurrency)]
+        latencies = sorted(latency for future in futures for latency in future.result())
+    elapsed = time.perf_counter() - started
+
+    return {
+        "operations": len(latencies),
+        "throughput_per_second": len(latencies) / elapsed,
+        "latency_seconds": {
+            "mean": sum(latencies) / len(latencies),
+            "p50": _percentile(latencies, 50),
+            "p99": _percentile(latencies, 99),
+            "max": latencies[-1],
+        },
+    }
+
+
+def _time_until(operation, deadline):
+    latencies = []
+    while True:
+        start = time.perf_counter()
+        if start >= deadline and latencies:
+            return latencies
+        operation()
+        latencies.append(time.perf_counter() - start)
+
+
+def _percentile(sorted_values, percent):
+    # nearest rank, so that it is always one of the measured values
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+
+def run_all(names, concurrency_levels, duration, json_serializer):
+    results = []
+    with serve_in_subprocess(total_items=10 * PAGE_SIZE) as url:
+        for concurrency in concurrency_levels:
+            client = NotificationsAPIClient(
+                API_KEY, base_url=url, pool_maxsize=concurrency, json_serializer=json_serializer
+            )
+            for name, params, operation in benchmarks(client):
+                if names and name not in names:
+                    continue
+                print(f"{name} {params} with {concurrency} threads", file=sys.stderr)
+                results.append(
+                    {"name": name, "params": params, "concurrency": concurrency} | run(operation, concurrency, duration)
+                )
+    return results
+
+
+def regressions(results, baseline, threshold):
+    """
+    :return: list of messages describing each result more than threshold percent worse than the same benchmark in
+        baseline
+    """
+
+    def key(result):
+        return result["name"], json.dumps(result["params"], sort_keys=True), result["concurrency"]
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+    messages = []
+    for result in results:
+        before = baseline_results.get(key(result))
+        if before is None:
+            continue
+        p50_change = 100 * (result["latency_seconds"]["p50"] / before["latency_seconds"]["p50"] - 1)
+        throughput_change = 100 * (1 - result["throughput_per_second"] / before["throughput_per_second"])
+        if p50_change > threshold or throughput_change > threshold:
+            messages.append(
+                f"{result['name']} {result['params']} with {result['concurrency']} threads: "
+                f"p50 {p50_change:+.1f}%, throughput {-throughput_change:+.1f}%"
+            )
+    return messages
+
+
+def main(arguments):
+    names = set(arguments["--only"].split(",")) if arguments["--only"] else None
+    concurrency_levels = [int(level) for level in arguments["--concurrency"].split(",")]
+    results = run_all(names, concurrency_levels, float(arguments["--duration"]), arguments["--json-serializer"])
+
+    report = {
+        "client_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "json_serializer": arguments["--json-serializer"],
+        "created_at": datetime.now(timezone.utc).isoformat(),  # noqa: UP017 – Python <3.11 compatibility
+        "results": results,
+    }
+    if arguments["--output"]:
+        with open(arguments["--output"], "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if arguments["--baseline"]:
+        with open(arguments["--baseline"]) as f:
+            messages = regressions(results, json.load(f), float(arguments["--threshold"]))
+        for message in messages:
+            print(f"Regression: {message}", file=sys.stderr)
+        return 1 if messages else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(docopt(__doc__)))
@@ -0,0 +1,93 @@
+# ruff: noqa: T201
+"""
+Compare the cost of verifying a token with TokenVerifier against get_token_issuer followed by decode_jwt_token,
+and measure what a ReplayCache adds to each.
+
+Usage:
+    benchmarks/token_verifier_benchmark.py [--number=<n>]
+
+Run from the repository root with `python -m benchmarks.token_verifier_benchmark`.
+
+Options:
+    --number=<n>  Tokens to verify for each case [default: 20000]
+"""
+
+import timeit
+from functools import partial
+
+import jwt
+from docopt import docopt
+
+from notifications_python_client.authentication import (
+    ReplayCache,
+    TokenVerifier,
+    create_jwt_token,
+    decode_jwt_token,
+    epoch_seconds,
+    get_token_issuer,
+)
+from notifications_python_client.errors import TokenError
+
+SERVICE_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+SECRET = "8b3aa916-ec82-434e-b0c5-d5d9b371d6a3"
+SECRETS = {SERVICE_ID: SECRET}
+
+
+def verify_with_functions(token):
+    try:
+        decode_jwt_token(token, SECRETS[get_token_issuer(token)])
+    except TokenError:
+        pass
+
+
+def verify_with_verifier(verifier, token):
+    try:
+        verifier.verify(token)
+    except TokenError:
+        pass
+
+
+def per_token_cost(verify, token, number):
+    return timeit.timeit(lambda: verify(token), number=number) / number
+
+
+def map_all(function, items):
+    for item in items:
+        function(item)
+
+
+def replay_cache_cost(number):
+    """
+    :return: per token cost of TokenVerifier without and with a ReplayCache, verifying number different tokens
+    """
+    tokens = [jwt.encode({"iss": SERVICE_ID, "iat": epoch_seconds(), "jti": str(i)}, SECRET) for i in range(number)]
+    costs = []
+    for replay_cache in (None, ReplayCache()):
+        verify = TokenVerifier(SECRETS, replay_cache=replay_cache).verify
+        costs.append(timeit.timeit(partial(map_all, verify, tokens), number=1) / number)
+    return costs
+
+
+if __name__ == "__main__":
+    arguments = docopt(__doc__)
+    number = int(arguments["--number"])
+    verifier = TokenVerifier(SECRETS)
+
+    tokens = {
+        "valid": create_jwt_token(SECRET, SERVICE_ID),
+        "wrong signature": create_jwt_token(SECRET[::-1], SERVICE_ID),
+        "iat in the future": jwt.encode({"iss": SERVICE_ID, "iat": epoch_seconds() + 3600}, SECRET),
+    }
+    for name, token in tokens.items():
+        functions = per_token_cost(verify_with_functions, token, number)
+        verifier_cost = per_token_cost(lambda token: verify_with_verifier(verifier, token), token, number)
+        print(
+            f"{name + ':':20} functions {functions * 1e6:7.2f}µs  TokenVerifier {verifier_cost * 1e6:7.2f}µs  ", end=""
+        )
+        print(f"speed up {functions / verifier_cost:5.1f}x")
+
+    without_cache, with_cache = replay_cache_cost(number)
+    print(
+        f"{'replay cache:':20} without {without_cache * 1e6:7.2f}µs  with {with_cache * 1e6:7.2f}µs  "
+        f"adds {(with_cache - without_cache) * 1e6:5.2f}µs"
+    )
@@ -1,4 +1,9 @@
-from integration_test.schemas.v2.definitions import https_url, personalisation, uuid
+from integration_test.schemas.v2.definitions import uuid
+from notifications_python_client.schemas import (  # noqa: F401
+    post_email_request,
+    post_letter_request,
+    post_sms_request,
+)
 
 template = {
     "$schema": "http://json-schema.org/draft-04/schema#",
@@ -77,21 +82,6 @@ get_notifications_response = {
     "required": ["notifications", "links"],
 }
 
-post_sms_request = {
-    "$schema": "http://json-schema.org/draft-04/schema#",
-    "description": "POST sms notification schema",
-    "type": "object",
-    "title": "POST v2/notifications/sms",
-    "properties": {
-        "reference": {"type": "string"},
-        "phone_number": {"type": "string", "format": "phone_number"},
-        "template_id": uuid,
-        "sms_sender_id": uuid,
-        "personalisation": personalisation,
-    },
-    "required": ["phone_number", "template_id"],
-}
-
 sms_content = {
     "$schema": "http://json-schema.org/draft-04/schema#",
     "description": "content schema for SMS notification response schema",
@@ -115,24 +105,6 @@ post_sms_response = {
     },
     "required": ["id", "content", "uri", "template"],
 }
-# TODO: this doesn't seem to be used anywhere, do we still need it?
-post_email_request = {
-    "$schema": "http://json-schema.org/draft-04/schema#",
-    "description": "POST email notification schema",
-    "type": "object",
-    "title": "POST v2/notifications/email",
-    "properties": {
-        "reference": {"type": "string"},
-        "email_address": {"type": "string", "format": "email_address"},
-        "template_id": uuid,
-        "email_reply_to_id": uuid,
-        "personalisation": personalisation,
-        "one_click_unsubscribe_url": https_url,
-        "sanitise_content_for": {"type": "array", "items": {"type": "string"}},
-    },
-    "required": ["email_address", "template_id"],
-}
-
 email_content = {
     "$schema": "http://json-schema.org/draft-04/schema#",
     "description": "Email content for POST email notification",
@@ -162,15 +134,6 @@ post_email_response = {
     "required": ["id", "content", "uri", "template", "sanitised_content"],
 }
 
-post_letter_request = {
-    "$schema": "http://json-schema.org/draft-04/schema#",
-    "description": "POST letter notification schema",
-    "type": "object",
-    "title": "POST v2/notifications/letter",
-    "properties": {"reference": {"type": "string"}, "template_id": uuid, "personalisation": personalisation},
-    "required": ["letter_address", "template_id"],
-}
-
 letter_content = {
     "$schema": "http://json-schema.org/draft-04/schema#",
     "description": "Letter content for POST letter notification",
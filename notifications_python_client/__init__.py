@@ -7,11 +7,44 @@
 #
 # -- http://semver.org/
 
-__version__ = "12.1.0"
-
-from notifications_python_client.errors import (  # noqa
-    REQUEST_ERROR_MESSAGE,
-    REQUEST_ERROR_STATUS_CODE,
-)
-from notifications_python_client.notifications import NotificationsAPIClient  # noqa
-from notifications_python_client.utils import prepare_upload  # noqa
+__version__ = "12.23.0"
+
+import importlib
+from typing import TYPE_CHECKING
+
+# imported from their modules when first used, so that using only part of the package, such as authentication,
+# doesn't import requests and everything else the client needs (PEP 562)
+_LAZY_ATTRIBUTES = {
+    "REQUEST_ERROR_MESSAGE": "notifications_python_client.errors",
+    "REQUEST_ERROR_STATUS_CODE": "notifications_python_client.errors",
+    "NotificationsAPIClient": "notifications_python_client.notifications",
+    "prepare_upload": "notifications_python_client.utils",
+}
+
+__all__ = [
+    "__version__",
+    "REQUEST_ERROR_MESSAGE",
+    "REQUEST_ERROR_STATUS_CODE",
+    "NotificationsAPIClient",
+    "prepare_upload",
+]
+
+if TYPE_CHECKING:
+    from notifications_python_client.errors import REQUEST_ERROR_MESSAGE, REQUEST_ERROR_STATUS_CODE
+    from notifications_python_client.notifications import NotificationsAPIClient
+    from notifications_python_client.utils import prepare_upload
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    # cache it, so that __getattr__ isn't called for it again
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
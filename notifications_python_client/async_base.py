@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+
+import httpx
+
+from notifications_python_client.base import BaseAPIClient
+from notifications_python_client.errors import HTTPError
+from notifications_python_client.hooks import RequestEvent, call_hooks
+from notifications_python_client.streaming import StreamingJSONBody
+
+logger = logging.getLogger(__name__)
+
+# BaseAPIClient's arguments sizing its pool of requests connections. httpx's pool is sized with max_connections and
+# max_keepalive_connections instead
+_REQUESTS_POOL_ARGUMENTS = ("pool_connections", "pool_maxsize", "pool_block")
+
+
+class AsyncBaseAPIClient(BaseAPIClient):
+    """
+    Base class for asyncio GOV.UK Notify API clients.
+
+    Requests are sent through a single pooled httpx.AsyncClient, so one instance can be shared by many
+    concurrent tasks on the same event loop. Use it as an async context manager, or call `aclose`, to
+    release the pooled connections.
+    """
+
+    def __init__(self, *args, max_concurrency=100, max_connections=100, max_keepalive_connections=20, **kwargs):
+        """
+        Initialise the client, taking the same arguments as BaseAPIClient, other than pool_connections, pool_maxsize
+        and pool_block, plus
+        :param max_concurrency - maximum number of requests in flight at once, extra requests wait their turn:
+        :param max_connections - maximum number of connections in the pool:
+        :param max_keepalive_connections - maximum number of idle connections kept open for reuse. None are kept if
+            keep_alive is False:
+        """
+        unsupported = [argument for argument in _REQUESTS_POOL_ARGUMENTS if argument in kwargs]
+        if unsupported:
+            raise TypeError(
+                f"{type(self).__name__} does not take {', '.join(unsupported)}: "
+                "size its pool with max_connections and max_keepalive_connections"
+            )
+        assert max_concurrency > 0, "max_concurrency must be at least 1"
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        super().__init__(*args, **kwargs)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _create_session(self):
+        self.limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections if self.keep_alive else 0,
+        )
+        headers = None if self.keep_alive else {"Connection": "close"}
+        return httpx.AsyncClient(limits=self.limits, timeout=self.timeout, headers=headers)
+
+    async def aclose(self):
+        await self.request_session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def put(self, url, data):
+        return await self.request("PUT", url, data=data)
+
+    async def get(self, url, params=None):
+        return await self.request("GET", url, params=params)
+
+    async def post(self, url, data):
+        return await self.request("POST", url, data=data)
+
+    async def delete(self, url, data=None):
+        return await self.request("DELETE", url, data=data)
+
+    async def request(self, method, url, data=None, params=None):
+        logger.debug("API request %s %s", method, url)
+        url, kwargs = self._create_request_objects(url, data, params)
+
+        response = await self._perform_request(method, url, kwargs, data)
+
+        return self._process_json_response(response)
+
+    async def _perform_request(self, method, url, kwargs, data=None):
+        if "data" in kwargs:
+            # httpx expects a pre-serialised body as `content`
+            kwargs["content"] = kwargs.pop("data")
+
+        attempt = 1
+        while True:
+            event = self._create_event(method, url, kwargs, data, attempt) if self.hooks else None
+            try:
+                return await self._send_request(method, url, kwargs, event)
+            except HTTPError as e:
+                delay = self._get_retry_delay(method, url, e, attempt, event)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            kwargs["headers"] = {**kwargs["headers"], **self.generate_headers(self._get_api_token())}
+
+    async def _send_request(self, method, url, kwargs, event=None):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+
+        if event is not None:
+            call_hooks(self.hooks, "before_request", event)
+
+        if isinstance(kwargs.get("content"), StreamingJSONBody):
+            # httpx only streams async iterables, and only sends a Content-Length for them if it is given one
+            body = kwargs["content"]
+            kwargs = {
+                **kwargs,
+                "content": body.__aiter__(),
+                "headers": {**kwargs["headers"], "Content-Length": str(len(body))},
+            }
+
+        start_time = time.monotonic()
+        try:
+            async with self._semaphore:
+                response = await self.request_session.request(method, url, **kwargs)
+            if response.is_error:
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            api_error = HTTPError.create(e)
+            logger.warning(
+                "API %s request on %s failed with %s '%s'", method, url, api_error.status_code, api_error.message
+            )
+            if event is not None:
+                self._finish_event(event, api_error.response, time.monotonic() - start_time, api_error)
+            raise api_error from e
+        finally:
+            elapsed_time = time.monotonic() - start_time
+            logger.debug("API %s request on %s finished in %s", method, url, elapsed_time)
+
+        if event is not None:
+            self._finish_event(event, response, elapsed_time)
+        return response
+
+    def _observe_pages(self, name, pages):
+        for hook in self.hooks:
+            pages = hook.paginate_async(name, pages)
+        return pages
+
+    def _create_event(self, method, url, kwargs, data, attempt):
+        return RequestEvent(method, url, kwargs["headers"], data, kwargs.get("content"), attempt)
+
+    @staticmethod
+    def _time_to_first_byte(response):
+        # httpx only records the time until the whole response was read
+        return None
@@ -0,0 +1,159 @@
+import logging
+import random
+from functools import partial
+from io import BytesIO
+
+from notifications_python_client import rendering
+from notifications_python_client.async_base import AsyncBaseAPIClient
+from notifications_python_client.models import Notification, ReceivedText
+from notifications_python_client.notifications import (
+    all_notifications_params,
+    all_templates_url,
+    email_notification_data,
+    letter_notification_data,
+    precompiled_letter_notification_data,
+    received_texts_url,
+    sms_notification_data,
+)
+from notifications_python_client.pagination import paginate_async, select_fields
+from notifications_python_client.template_cache import revalidation_headers, template_key, templates_key, version_key
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNotificationsAPIClient(AsyncBaseAPIClient):
+    """
+    asyncio counterpart of NotificationsAPIClient. Every method is a coroutine (the iterators are async
+    generators) taking the same arguments and returning the same data as its synchronous equivalent.
+    """
+
+    async def send_sms_notification(
+        self, phone_number, template_id, personalisation=None, reference=None, sms_sender_id=None
+    ):
+        notification = sms_notification_data(phone_number, template_id, personalisation, reference, sms_sender_id)
+        self._validate_notification("sms", notification)
+        return await self.post("/v2/notifications/sms", data=notification)
+
+    async def send_email_notification(
+        self,
+        email_address,
+        template_id,
+        personalisation=None,
+        reference=None,
+        email_reply_to_id=None,
+        one_click_unsubscribe_url=None,
+        sanitise_content_for=None,
+    ):
+        notification = email_notification_data(
+            email_address,
+            template_id,
+            personalisation,
+            reference,
+            email_reply_to_id,
+            one_click_unsubscribe_url,
+            sanitise_content_for,
+        )
+        self._validate_notification("email", notification)
+        return await self.post("/v2/notifications/email", data=notification)
+
+    async def send_letter_notification(self, template_id, personalisation, reference=None):
+        notification = letter_notification_data(template_id, personalisation, reference)
+        self._validate_notification("letter", notification)
+        return await self.post("/v2/notifications/letter", data=notification)
+
+    async def send_precompiled_letter_notification(self, reference, pdf_file, postage=None):
+        notification = precompiled_letter_notification_data(reference, pdf_file, postage)
+        self._validate_notification("precompiled_letter", notification)
+        return await self.post("/v2/notifications/letter", data=notification)
+
+    async def get_received_texts(self, older_than=None):
+        return await self.get(received_texts_url(older_than))
+
+    async def get_received_texts_iterator(self, older_than=None, models=False, fields=None):
+        fields = None if fields is None else tuple(fields)
+        pages = paginate_async(self.get_received_texts, "received_text_messages", older_than)
+        async for received_texts in self._observe_pages("get_received_texts_iterator", pages):
+            if fields is not None:
+                received_texts = select_fields(received_texts, fields)
+            for received_text in received_texts:
+                yield ReceivedText(received_text) if models else received_text
+
+    async def get_notification_by_id(self, id):
+        return await self.get(f"/v2/notifications/{id}")
+
+    async def get_pdf_for_letter(self, id):
+        url = f"/v2/notifications/{id}/pdf"
+        logger.debug("API request %s %s", "GET", url)
+        url, kwargs = self._create_request_objects(url, data=None, params=None)
+
+        response = await self._perform_request("GET", url, kwargs)
+
+        return BytesIO(response.content)
+
+    async def get_all_notifications(
+        self, status=None, template_type=None, reference=None, older_than=None, include_jobs=None
+    ):
+        data = all_notifications_params(status, template_type, reference, older_than, include_jobs)
+        return await self.get("/v2/notifications", params=data)
+
+    async def get_all_notifications_iterator(
+        self, status=None, template_type=None, reference=None, older_than=None, models=False, fields=None
+    ):
+        fields = None if fields is None else tuple(fields)
+        fetch_page = partial(self.get_all_notifications, status, template_type, reference)
+        pages = paginate_async(fetch_page, "notifications", older_than)
+        async for notifications in self._observe_pages("get_all_notifications_iterator", pages):
+            if fields is not None:
+                notifications = select_fields(notifications, fields)
+            for notification in notifications:
+                yield Notification(notification) if models else notification
+
+    async def post_template_preview(self, template_id, personalisation):
+        template = {"personalisation": personalisation}
+        return await self.post(f"/v2/template/{template_id}/preview", data=template)
+
+    async def preview_template(self, template_id, personalisation, version=None, verify_rate=0):
+        if version is None:
+            template = await self.get_template(template_id)
+        else:
+            template = await self.get_template_version(template_id, version)
+        preview = rendering.preview_template(template, personalisation)
+
+        if verify_rate and random.random() < verify_rate:
+            api_preview = await self.post_template_preview(template_id, personalisation)
+            preview = rendering.verified_preview(preview, api_preview)
+        return preview
+
+    async def get_template(self, template_id):
+        url = f"/v2/template/{template_id}"
+        if self.template_cache is None:
+            return await self.get(url)
+        return await self._get_cached_template(template_key(template_id), url)
+
+    async def get_template_version(self, template_id, version):
+        url = f"/v2/template/{template_id}/version/{version}"
+        if self.template_cache is None:
+            return await self.get(url)
+        return await self._get_cached_template(version_key(template_id, version), url)
+
+    async def get_all_template_versions(self, template_id):
+        return await self.get(f"service/{self.service_id}/template/{template_id}/versions")
+
+    async def get_all_templates(self, template_type=None):
+        url = all_templates_url(template_type)
+        if self.template_cache is None:
+            return await self.get(url)
+        return await self._get_cached_template(templates_key(template_type), url)
+
+    async def _get_cached_template(self, key, url):
+        cached = self.template_cache.lookup(key)
+        if cached is not None and cached.fresh:
+            return cached.value
+
+        logger.debug("API request %s %s", "GET", url)
+        url, kwargs = self._create_request_objects(url, data=None, params=None)
+        kwargs["headers"].update(revalidation_headers(cached))
+
+        response = await self._perform_request("GET", url, kwargs)
+
+        return self.template_cache.update(key, cached, response, partial(self._process_json_response, response))
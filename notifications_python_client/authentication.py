@@ -1,8 +1,11 @@
+import base64
 import calendar
+import hashlib
+import hmac
+import json
+import threading
 import time
 
-import jwt
-
 from notifications_python_client.errors import (
     TokenAlgorithmError,
     TokenDecodeError,
@@ -10,6 +13,7 @@ from notifications_python_client.errors import (
     TokenExpiredError,
     TokenIssuedAtError,
     TokenIssuerError,
+    TokenReplayError,
 )
 
 __algorithm__ = "HS256"
@@ -19,6 +23,15 @@ __bound__ = 30
 INVALID_FUTURE_TOKEN_ERROR_MESSAGE = "Token can not be in the future"
 
 
+# PyJWT is imported by the functions which use it, so that TokenVerifier can be used without importing it
+def __getattr__(name):
+    if name == "jwt":
+        import jwt
+
+        return jwt
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def create_jwt_token(secret, client_id):
     """
     Create JWT token for GOV.UK Notify
@@ -37,6 +50,8 @@ def create_jwt_token(secret, client_id):
     :param client_id: Identifier for the client
     :return: JWT token for this request
     """
+    import jwt
+
     assert secret, "Missing secret key"
     assert client_id, "Missing client id"
 
@@ -59,7 +74,10 @@ def get_token_issuer(token):
     :return issuer: iss field of the JWT token
     :raises TokenIssuerError: if iss field not present
     :raises TokenDecodeError: if token does not conform to JWT spec
+    :raises TokenError: if the token's header is invalid in any other way
     """
+    import jwt
+
     try:
         unverified = decode_token(token)
 
@@ -69,31 +87,40 @@ def get_token_issuer(token):
         return unverified.get("iss")
     except jwt.DecodeError as e:
         raise TokenDecodeError from e
+    except jwt.InvalidTokenError as e:
+        # the header is invalid in some other way, such as having a kid which isn't a string
+        raise TokenError from e
 
 
-def decode_jwt_token(token, secret):
+def decode_jwt_token(token, secret, replay_cache=None):
     """
     Validates and decodes the JWT token
     Token checked for
         - signature of JWT token
         - token issued date is valid
+        - token has not been used before, if replay_cache is given
 
     :param token: jwt token
     :param secret: client specific secret
+    :param replay_cache: ReplayCache of the tokens already accepted. Only for tokens from clients which sign every
+        request (jwt_token_lifetime=0), as by default the clients reuse each token for 10 seconds
     :return boolean: True if valid token, False otherwise
     :raises TokenIssuerError: if iss field not present
     :raises TokenIssuedAtError: if iat field not present
     :raises TokenExpiredError: If the iat value expires this token
     :raises TokenDecodeError: If the token cannot be decoded because it failed validation
     :raises TokenAlgorithmError: If the algorithm is not recognised
+    :raises TokenReplayError: If replay_cache has already accepted the token
     :raises TokenError: If any other type of jwt exception is raised when trying jwt.decode
     """
+    import jwt
+
     try:
         # check signature of the token
         decoded_token = jwt.decode(
             token, key=secret, options={"verify_signature": True}, algorithms=[__algorithm__], leeway=__bound__
         )
-        return validate_jwt_token(decoded_token)
+        validate_jwt_token(decoded_token)
     except jwt.InvalidIssuedAtError as e:
         raise TokenExpiredError("Token has invalid iat field", decode_token(token)) from e
     except jwt.ImmatureSignatureError as e:
@@ -111,6 +138,12 @@ def decode_jwt_token(token, secret):
         # https://pyjwt.readthedocs.io/en/latest/api.html#exceptions
         raise TokenError from e
 
+    if replay_cache is not None:
+        # the signature segment decoded, as the same signature can be base64url encoded in more than one way
+        signature = _base64url_decode(_to_bytes(token).rsplit(b".", 1)[1])
+        replay_cache.check(signature, decoded_token)
+    return True
+
 
 def validate_jwt_token(decoded_token):
     # token has all the required fields
@@ -136,8 +169,235 @@ def decode_token(token):
     :param token:
     :return decoded token:
     """
+    import jwt
+
     return jwt.decode(token, options={"verify_signature": False}, algorithms=[__algorithm__])
 
 
+class TokenVerifier:
+    """
+    Verifies the tokens of a set of issuers, for servers checking many tokens a second, such as the tokens on the
+    callbacks Notify sends you.
+
+    It accepts the same tokens as get_token_issuer followed by decode_jwt_token, and raises the same errors. It
+    parses each token only once, rather than decoding it again to report an error, and keeps a keyed HMAC ready for
+    each secret rather than setting one up for every token. Signatures are compared in constant time.
+
+    A verifier can be shared by any number of threads.
+    """
+
+    def __init__(self, secrets=None, replay_cache=None):
+        """
+        :param secrets - dict of each issuer to its secret, or to a list of secrets which are all accepted, for
+            example while a secret is being rotated:
+        :param replay_cache - ReplayCache of the tokens already accepted, to reject them if they are used again.
+            Only for tokens from clients which sign every request (jwt_token_lifetime=0), as by default the clients
+            reuse each token for 10 seconds:
+        """
+        self.replay_cache = replay_cache
+        # issuer: tuple of HMAC objects keyed with each of its secrets, copied for each token
+        self._keys = {}
+        for issuer, issuer_secrets in (secrets or {}).items():
+            self.set_secrets(issuer, issuer_secrets)
+
+    def set_secrets(self, issuer, secrets):
+        """
+        :param issuer: iss claim of the issuer's tokens
+        :param secrets: secret, or list of secrets, to accept the issuer's tokens signed with. An empty list stops
+            accepting its tokens
+        """
+        if isinstance(secrets, (str, bytes)):
+            secrets = [secrets]
+        keys = tuple(hmac.new(_to_bytes(secret), digestmod=hashlib.sha256) for secret in secrets)
+        if keys:
+            self._keys[issuer] = keys
+        else:
+            self._keys.pop(issuer, None)
+
+    def verify(self, token):
+        """
+        Validates and decodes the JWT token
+
+        :param token: jwt token
+        :return dict: the token's claims
+        :raises TokenIssuerError: if iss field not present
+        :raises TokenIssuedAtError: if iat field not present
+        :raises TokenExpiredError: If the iat value expires this token, or the iat or nbf value is in the future
+        :raises TokenDecodeError: If the token cannot be decoded, its issuer has no secrets or its signature is wrong
+        :raises TokenAlgorithmError: If the algorithm is not recognised
+        :raises TokenReplayError: If replay_cache has already accepted the token
+        :raises TokenError: If the token is invalid for any other reason, such as an exp value in the past
+        """
+        header, claims, signing_input, signature = _parse_token(token)
+        _validate_header(header)
+        if header.get("alg") != __algorithm__:
+            raise TokenAlgorithmError
+        if "iss" not in claims:
+            raise TokenIssuerError
+
+        issuer = claims["iss"]
+        keys = self._keys.get(issuer, ()) if isinstance(issuer, str) else ()
+        if not any(_signature_matches(key, signing_input, signature) for key in keys):
+            raise TokenDecodeError
+
+        _validate_claims(claims)
+        if self.replay_cache is not None:
+            self.replay_cache.check(signature, claims)
+        return claims
+
+
+class ReplayCache:
+    """
+    Remembers the signatures of the tokens accepted in the last few seconds, so that a token which is sent again can
+    be rejected. A token is accepted for __bound__ seconds either side of its iat, so each signature is kept until
+    __bound__ seconds after the token's iat, when the token would be rejected as expired anyway.
+
+    Signatures are kept in buckets by iat second, and a token sent again has the same iat as the first time, so each
+    check looks in one bucket. Expired buckets are dropped whole. If the cache holds maxsize signatures, the ones with
+    the oldest iat are forgotten first.
+
+    Pass one as the replay_cache argument of decode_jwt_token or TokenVerifier. A cache can be shared by any number
+    of threads, but only protects against tokens being sent again to the same process.
+
+    Only use one for tokens from clients which sign every request. By default the API clients in this package reuse
+    each token for 10 seconds, so every request after the first in that time would be rejected. Create them with
+    jwt_token_lifetime=0 to sign every request.
+    """
+
+    def __init__(self, maxsize=1_000_000):
+        """
+        :param maxsize - most signatures to keep. Each takes roughly 100 bytes:
+        """
+        assert maxsize > 0, "maxsize must be at least 1"
+        self.maxsize = maxsize
+        self.evictions = 0
+        # iat: set of the signatures of tokens with that iat
+        self._buckets = {}
+        self._size = 0
+        self._purged_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def check(self, signature, claims):
+        """
+        Remember the signature of a valid token
+
+        :param signature: the token's signature
+        :param claims: the token's decoded claims
+        :raises TokenReplayError: if a token with the same signature has already been checked
+        """
+        iat = int(claims["iat"])
+        with self._lock:
+            self._purge(int(time.time()))
+            bucket = self._buckets.setdefault(iat, set())
+            if signature in bucket:
+                raise TokenReplayError(claims)
+            if self._size >= self.maxsize:
+                self._evict()
+            bucket.add(signature)
+            self._size += 1
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self._size = 0
+
+    def _purge(self, now):
+        # at most once a second. There are at most 2 * __bound__ + 1 buckets of tokens which could still be accepted
+        if now == self._purged_at:
+            return
+        self._purged_at = now
+        for iat in [iat for iat in self._buckets if iat + __bound__ < now]:
+            self._size -= len(self._buckets.pop(iat))
+
+    def _evict(self):
+        oldest = min(iat for iat, bucket in self._buckets.items() if bucket)
+        self._buckets[oldest].pop()
+        self._size -= 1
+        self.evictions += 1
+
+
+def _parse_token(token):
+    """
+    :return: tuple of the token's header, its claims, the bytes its signature is of and the signature
+    :raises TokenDecodeError: if token is not three base64url encoded parts, with JSON objects for the first two
+    """
+    try:
+        signing_input, signature = _to_bytes(token).rsplit(b".", 1)
+        header_segment, claims_segment = signing_input.split(b".", 1)
+        header = json.loads(_base64url_decode(header_segment))
+        claims = json.loads(_base64url_decode(claims_segment))
+        signature = _base64url_decode(signature)
+    except (ValueError, TypeError, AttributeError, RecursionError) as e:
+        raise TokenDecodeError from e
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        raise TokenDecodeError
+    return header, claims, signing_input, signature
+
+
+def _signature_matches(key, signing_input, signature):
+    mac = key.copy()
+    mac.update(signing_input)
+    return hmac.compare_digest(mac.digest(), signature)
+
+
+def _validate_header(header):
+    # the checks jwt.decode makes of the header before it checks the signature
+    if header.get("b64", True) is False:
+        raise TokenDecodeError
+    if not isinstance(header.get("kid", ""), str):
+        raise TokenError
+    if "crit" in header:
+        # the only critical extension jwt.decode understands is b64, and only if the header has it
+        crit = header["crit"]
+        if not isinstance(crit, list) or not crit or any(ext != "b64" for ext in crit) or "b64" not in header:
+            raise TokenError
+
+
+def _validate_claims(claims):
+    # the checks jwt.decode makes with a leeway of __bound__, and then those of validate_jwt_token
+    now = time.time()
+    if "iat" in claims:
+        try:
+            iat = int(claims["iat"])
+        except (ValueError, TypeError, OverflowError):
+            raise TokenExpiredError("Token has invalid iat field", claims) from None
+        if iat > now + __bound__:
+            raise TokenExpiredError(INVALID_FUTURE_TOKEN_ERROR_MESSAGE, claims)
+    nbf = _integer_claim(claims, "nbf")
+    if nbf is not None and nbf > now + __bound__:
+        raise TokenExpiredError(INVALID_FUTURE_TOKEN_ERROR_MESSAGE, claims)
+    exp = _integer_claim(claims, "exp")
+    if exp is not None and exp <= now - __bound__:
+        raise TokenError
+    # jwt.decode isn't given an audience, so rejects tokens for one
+    if claims.get("aud") or not isinstance(claims.get("sub", ""), str) or not isinstance(claims.get("jti", ""), str):
+        raise TokenError
+    validate_jwt_token(claims)
+
+
+def _integer_claim(claims, name):
+    """
+    :return: the value of an optional integer claim, or None if the token doesn't have it
+    :raises TokenDecodeError: if the value is not an integer
+    """
+    if name not in claims:
+        return None
+    try:
+        return int(claims[name])
+    except (ValueError, TypeError, OverflowError) as e:
+        raise TokenDecodeError from e
+
+
+def _base64url_decode(segment):
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _to_bytes(value):
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
 def epoch_seconds():
     return calendar.timegm(time.gmtime())
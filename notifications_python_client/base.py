@@ -1,13 +1,18 @@
-import json
+import http.cookiejar
 import logging
+import threading
 import time
 import urllib.parse
 
 import requests
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
 
-from notifications_python_client import __version__
-from notifications_python_client.authentication import create_jwt_token
+from notifications_python_client import __version__, validation
+from notifications_python_client.authentication import __bound__, create_jwt_token, epoch_seconds
 from notifications_python_client.errors import HTTPError, InvalidResponse
+from notifications_python_client.hooks import RequestEvent, call_hooks
+from notifications_python_client.serializers import get_json_serializer
+from notifications_python_client.streaming import encode_json_body
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +21,50 @@ class BaseAPIClient:
     """
     Base class for GOV.UK Notify API client.
 
-    This class is not thread-safe.
+    This class is thread-safe: one instance, and its pool of connections, can be shared by any number of threads.
+    Size the pool with pool_maxsize so that there is a connection for each thread sending requests at once.
     """
 
-    def __init__(self, api_key, base_url="https://api.notifications.service.gov.uk", timeout=30):
+    def __init__(
+        self,
+        api_key,
+        base_url="https://api.notifications.service.gov.uk",
+        timeout=30,
+        jwt_token_lifetime=10,
+        pool_connections=DEFAULT_POOLSIZE,
+        pool_maxsize=DEFAULT_POOLSIZE,
+        pool_block=DEFAULT_POOLBLOCK,
+        keep_alive=True,
+        retry_policy=None,
+        rate_limiter=None,
+        json_serializer="json",
+        hooks=None,
+        template_cache=None,
+        validate_notifications=False,
+    ):
         """
         Initialise the client
         Error if either of base_url or secret missing
         :param base_url - base URL of GOV.UK Notify API:
         :param secret - application secret - used to sign the request:
         :param timeout - request timeout on the client
+        :param jwt_token_lifetime - seconds a signed token is reused for before a new one is created, 0 to sign
+            every request. Must be well inside the 30 second window the API accepts tokens for:
+        :param pool_connections - number of hosts to keep connection pools for:
+        :param pool_maxsize - maximum number of connections kept open to the API:
+        :param pool_block - when all pool_maxsize connections are in use, wait for one to be free rather than
+            opening an extra connection which is closed after its request:
+        :param keep_alive - reuse connections between requests rather than closing them after each response:
+        :param retry_policy - RetryPolicy deciding which failed requests to retry. Requests are not retried if this
+            is None:
+        :param rate_limiter - RateLimiter pacing requests to stay under the service's rate limit. Share one limiter
+            between all the clients using the same API key:
+        :param json_serializer - serializer for request and response bodies: "json" for the standard library,
+            "orjson" or "ujson" if installed, "auto" for the fastest one installed, or a serializer object:
+        :param hooks - list of RequestHook objects to tell about each request:
+        :param template_cache - TemplateCache to keep templates in, rather than fetching them for every call:
+        :param validate_notifications - check notifications against the API's schemas before sending them, raising
+            ValidationError without making a request for those which don't match. Needs jsonschema installed:
         :return:
         """
         service_id = api_key[-73:-37]
@@ -34,11 +73,54 @@ class BaseAPIClient:
         assert base_url, "Missing base url"
         assert service_id, "Missing service ID"
         assert api_key, "Missing API key"
+        assert 0 <= jwt_token_lifetime < __bound__, f"jwt_token_lifetime must be between 0 and {__bound__ - 1}"
+        assert not validate_notifications or validation.jsonschema_installed(), (
+            "validate_notifications needs jsonschema: pip install notifications-python-client[validation]"
+        )
         self.base_url = base_url
         self.service_id = service_id
         self.api_key = api_key
         self.timeout = timeout
-        self.request_session = requests.Session()
+        self.jwt_token_lifetime = jwt_token_lifetime
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.json_serializer = get_json_serializer(json_serializer)
+        # replaced rather than appended to, so it can be read without a lock while another thread adds a hook
+        self.hooks = tuple(hooks or ())
+        self.template_cache = template_cache
+        self.validate_notifications = validate_notifications
+        # (issued at, token) - replaced as a whole so it can be read without holding the lock
+        self._jwt_token = (None, None)
+        self._jwt_token_lock = threading.Lock()
+        self.request_session = self._create_session()
+
+    def _create_session(self):
+        session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        # the API authenticates every request with a token, so it never needs cookies. Refusing them leaves the
+        # session with no state that changes between requests, which is what makes sharing it between threads safe
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def add_hook(self, hook):
+        """
+        :param hook: RequestHook to tell about each request from now on
+        """
+        self.hooks = (*self.hooks, hook)
 
     def put(self, url, data):
         return self.request("PUT", url, data=data)
@@ -63,12 +145,29 @@ class BaseAPIClient:
         logger.debug("API request %s %s", method, url)
         url, kwargs = self._create_request_objects(url, data, params)
 
-        response = self._perform_request(method, url, kwargs)
+        response = self._perform_request(method, url, kwargs, data)
 
         return self._process_json_response(response)
 
+    def _get_api_token(self):
+        """
+        Signing a token is a measurable cost under load, and tokens are accepted for __bound__ seconds either side of
+        their iat, so reuse the last one until it is jwt_token_lifetime seconds old.
+        """
+        now = epoch_seconds()
+        issued_at, token = self._jwt_token
+        if issued_at is not None and 0 <= now - issued_at < self.jwt_token_lifetime:
+            return token
+
+        with self._jwt_token_lock:
+            issued_at, token = self._jwt_token
+            if issued_at is None or not 0 <= now - issued_at < self.jwt_token_lifetime:
+                token = create_jwt_token(self.api_key, self.service_id)
+                self._jwt_token = (now, token)
+            return token
+
     def _create_request_objects(self, url, data, params):
-        api_token = create_jwt_token(self.api_key, self.service_id)
+        api_token = self._get_api_token()
 
         kwargs = {"headers": self.generate_headers(api_token), "timeout": self.timeout}
 
@@ -82,35 +181,107 @@ class BaseAPIClient:
 
         return url, kwargs
 
+    def _validate_notification(self, notification_type, notification):
+        if self.validate_notifications:
+            validation.validate_notification(notification_type, notification)
+
     def _serialize_data(self, data):
-        return json.dumps(data, default=self._extended_json_encoder)
+        return encode_json_body(data, self.json_serializer.dumps, self._extended_json_encoder)
 
     def _extended_json_encoder(self, obj):
-        if isinstance(obj, set):
+        if isinstance(obj, (set, frozenset)):
             return list(obj)
 
         raise TypeError
 
-    def _perform_request(self, method, url, kwargs):
+    def _perform_request(self, method, url, kwargs, data=None):
+        attempt = 1
+        while True:
+            # skip building events altogether when nothing is listening for them
+            event = self._create_event(method, url, kwargs, data, attempt) if self.hooks else None
+            try:
+                return self._send_request(method, url, kwargs, event)
+            except HTTPError as e:
+                delay = self._get_retry_delay(method, url, e, attempt, event)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+            # keep any other headers, such as If-None-Match, while replacing the token
+            kwargs["headers"] = {**kwargs["headers"], **self.generate_headers(self._get_api_token())}
+
+    def _get_retry_delay(self, method, url, api_error, attempt, event=None):
+        if self.retry_policy is None:
+            return None
+
+        delay = self.retry_policy.get_retry_delay(method, api_error, attempt)
+        if delay is not None:
+            logger.info("Retrying API %s request on %s in %.2fs after attempt %s failed", method, url, delay, attempt)
+            if event is not None:
+                event.retry_delay = delay
+                call_hooks(self.hooks, "on_retry", event)
+        return delay
+
+    def _send_request(self, method, url, kwargs, event=None):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        if event is not None:
+            call_hooks(self.hooks, "before_request", event)
+
         start_time = time.monotonic()
         try:
             response = self.request_session.request(method, url, **kwargs)
             response.raise_for_status()
-            return response
         except requests.RequestException as e:
             api_error = HTTPError.create(e)
             logger.warning(
                 "API %s request on %s failed with %s '%s'", method, url, api_error.status_code, api_error.message
             )
+            if event is not None:
+                self._finish_event(event, api_error.response, time.monotonic() - start_time, api_error)
             raise api_error from e
         finally:
             elapsed_time = time.monotonic() - start_time
             logger.debug("API %s request on %s finished in %s", method, url, elapsed_time)
 
+        if event is not None:
+            self._finish_event(event, response, elapsed_time)
+        return response
+
+    def _observe_pages(self, name, pages):
+        for hook in self.hooks:
+            pages = hook.paginate(name, pages)
+        return pages
+
+    def _create_event(self, method, url, kwargs, data, attempt):
+        return RequestEvent(method, url, kwargs["headers"], data, kwargs.get("data"), attempt)
+
+    def _finish_event(self, event, response, elapsed_time, error=None):
+        """
+        Fill in the outcome of the attempt and tell the hooks about it
+        """
+        event.elapsed = elapsed_time
+        if response is not None:
+            event.status_code = response.status_code
+            event.bytes_received = len(response.content)
+            event.time_to_first_byte = self._time_to_first_byte(response)
+
+        if error is None:
+            call_hooks(self.hooks, "after_response", event)
+        else:
+            event.error = error
+            call_hooks(self.hooks, "on_error", event)
+
+    @staticmethod
+    def _time_to_first_byte(response):
+        # requests records the time until the response headers were parsed
+        return response.elapsed.total_seconds()
+
     def _process_json_response(self, response):
         try:
             if response.status_code == 204:
                 return
-            return response.json()
+            return self.json_serializer.loads(response.content)
         except ValueError as e:
             raise InvalidResponse(response, message="No JSON response object could be decoded") from e
@@ -0,0 +1,61 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+from notifications_python_client.errors import APIError
+
+
+def bounded_map(func, items, max_workers, ordered=True):
+    """
+    Call func on each of items over a pool of worker threads.
+
+    Unlike Executor.map, items is read lazily and at most 2 * max_workers calls are queued at once, so memory
+    use does not grow with the number of items.
+
+    :param func: function called with each item
+    :param items: iterable of items, read as workers become free
+    :param max_workers: number of threads calling func at once
+    :param ordered: yield results in the same order as items, rather than as soon as each call finishes
+    :return: generator of (index, result) pairs, where result is what func returned or the APIError it raised
+    """
+    assert max_workers > 0, "max_workers must be at least 1"
+    max_pending = 2 * max_workers
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if ordered:
+            yield from _ordered_results(executor, func, items, max_pending)
+        else:
+            yield from _unordered_results(executor, func, items, max_pending)
+    finally:
+        # if the caller stops early, don't start any more calls
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _ordered_results(executor, func, items, max_pending):
+    pending = deque()
+    for index, item in enumerate(items):
+        pending.append((index, executor.submit(_call, func, item)))
+        if len(pending) >= max_pending:
+            index, future = pending.popleft()
+            yield index, future.result()
+    while pending:
+        index, future = pending.popleft()
+        yield index, future.result()
+
+
+def _unordered_results(executor, func, items, max_pending):
+    pending = {}
+    for index, item in enumerate(items):
+        pending[executor.submit(_call, func, item)] = index
+        if len(pending) >= max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    for future in as_completed(list(pending)):
+        yield pending.pop(future), future.result()
+
+
+def _call(func, item):
+    try:
+        return func(item)
+    except APIError as e:
+        return e
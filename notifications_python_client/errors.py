@@ -1,6 +1,8 @@
-from typing import List, Union  # noqa: UP035 – Python <3.10 compatibility
+from typing import TYPE_CHECKING, List, Union  # noqa: UP035 – Python <3.10 compatibility
 
-from requests import RequestException, Response
+if TYPE_CHECKING:
+    # only for type hints, so that importing the errors, as authentication does, doesn't import requests
+    from requests import RequestException, Response
 
 REQUEST_ERROR_STATUS_CODE = 503
 REQUEST_ERROR_MESSAGE = "Request failed"
@@ -39,8 +41,13 @@ class TokenIssuedAtError(TokenDecodeError):
         super().__init__("Invalid token: iat field not provided")
 
 
+class TokenReplayError(TokenError):
+    def __init__(self, token=None):
+        super().__init__("Invalid token: it has already been used", token)
+
+
 class APIError(Exception):
-    def __init__(self, response: Response = None, message: str = None):
+    def __init__(self, response: "Response" = None, message: str = None):
         self.response = response
         self._message = message
 
@@ -65,10 +72,12 @@ class APIError(Exception):
 
 class HTTPError(APIError):
     @staticmethod
-    def create(e: RequestException) -> "HTTPError":
-        error = HTTPError(e.response)
+    def create(e: "RequestException") -> "HTTPError":
+        # transport errors (from requests or httpx) may not carry a response
+        response = getattr(e, "response", None)
+        error = HTTPError(response)
         if error.status_code == 503:
-            error = HTTP503Error(e.response)
+            error = HTTP503Error(response)
         return error
 
 
@@ -79,5 +88,20 @@ class HTTP503Error(HTTPError):
     """
 
 
+class ValidationError(HTTPError):
+    """A notification which does not match the API's schema, found before it was sent
+
+    Its message is a list of errors in the same form as the API's 400 responses, so it can be handled in the same
+    way as the HTTPError the API would have returned.
+    """
+
+    def __init__(self, errors: List[dict]):  # noqa: UP006 – Python <3.10 compatibility
+        super().__init__(message=errors)
+
+    @property
+    def status_code(self) -> int:
+        return 400
+
+
 class InvalidResponse(APIError):
     pass
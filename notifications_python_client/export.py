@@ -0,0 +1,258 @@
+"""
+Export every notification matching a set of filters to a file, in a way which can be resumed if it is interrupted.
+
+    from notifications_python_client.export import export_notifications
+
+    export_notifications(client, "notifications.jsonl", status="failed")
+
+Notifications are written a page at a time, so memory use does not grow with the size of the export. Every few
+pages the file is synced to disk and the `older_than` cursor of the next page is saved to a checkpoint file next to
+it. If the export stops part way through, calling export_notifications again with the same arguments carries on
+from the last checkpoint rather than from the newest notification.
+
+With pyarrow installed (`pip install notifications-python-client[parquet]`), `format="parquet"` writes a directory
+of Parquet files instead, one for each checkpoint.
+
+Pass `fields` to export only some of each notification's fields, such as `fields=["id", "reference", "status"]`.
+"""
+
+import glob
+import json
+import os
+from functools import partial
+
+from notifications_python_client.pagination import paginate, prefetch, select_fields
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ("jsonl", "parquet")
+
+# the fields of a notification with their own Parquet column, and the type of those which aren't strings. Any
+# other field is kept in the JSON of the "other" column, so that new fields in the API's responses aren't lost
+PARQUET_COLUMNS = {
+    "id": "string",
+    "reference": "string",
+    "email_address": "string",
+    "phone_number": "string",
+    "line_1": "string",
+    "line_2": "string",
+    "line_3": "string",
+    "line_4": "string",
+    "line_5": "string",
+    "line_6": "string",
+    "line_7": "string",
+    "postcode": "string",
+    "postage": "string",
+    "type": "string",
+    "status": "string",
+    "template_id": "string",
+    "template_version": "int64",
+    "template_uri": "string",
+    "body": "string",
+    "subject": "string",
+    "created_at": "string",
+    "created_by_name": "string",
+    "sent_at": "string",
+    "completed_at": "string",
+    "scheduled_for": "string",
+    "estimated_delivery": "string",
+    "one_click_unsubscribe_url": "string",
+    "is_cost_data_ready": "bool",
+    "cost_in_pounds": "float64",
+    "cost_details": "string",
+    "other": "string",
+}
+
+
+def export_notifications(
+    client,
+    path,
+    status=None,
+    template_type=None,
+    reference=None,
+    include_jobs=None,
+    format="jsonl",
+    checkpoint_pages=10,
+    prefetch_pages=1,
+    fields=None,
+):
+    """
+    :param client: NotificationsAPIClient to fetch the notifications with. Give it a retry_policy so that a
+        temporary error from the API doesn't stop the export
+    :param path: file to write, with one notification on each line, or for Parquet, directory to write files to
+    :param status: only export notifications with this status, as for get_all_notifications
+    :param template_type: only export notifications of this type
+    :param reference: only export notifications with this reference
+    :param include_jobs: also export notifications sent from spreadsheets uploaded to Notify
+    :param format: "jsonl" or "parquet"
+    :param checkpoint_pages: number of pages to write between checkpoints
+    :param prefetch_pages: number of pages to fetch in the background while earlier ones are being written
+    :param fields: names of the only fields to export from each notification. For Parquet, the columns of the other
+        fields are left empty
+    :return: dict of the number of notifications exported, whether the export carried on from a checkpoint, and
+        the path of the checkpoint file. Once an export is complete, calling this again returns straight away
+    :raises ValueError: if the checkpoint file is for an export with different filters, format or fields
+    """
+    assert format in FORMATS, f"format must be one of {', '.join(FORMATS)}"
+    assert checkpoint_pages > 0, "checkpoint_pages must be at least 1"
+    if format == "parquet" and pyarrow is None:
+        raise ImportError("Exporting to Parquet needs pyarrow: pip install notifications-python-client[parquet]")
+
+    checkpoint_path = f"{path.rstrip(os.sep)}.checkpoint.json"
+    filters = {"status": status, "template_type": template_type, "reference": reference, "include_jobs": include_jobs}
+    fields = None if fields is None else list(fields)
+    checkpoint = _read_checkpoint(checkpoint_path, filters, format, fields)
+    resumed = checkpoint is not None
+    if checkpoint is None:
+        checkpoint = {
+            "filters": filters,
+            "format": format,
+            "fields": fields,
+            "older_than": None,
+            "count": 0,
+            "complete": False,
+        }
+
+    if not checkpoint["complete"]:
+        writer_class = _ParquetWriter if format == "parquet" else _JSONLWriter
+        with writer_class(path, checkpoint.get("writer"), client.json_serializer) as writer:
+            _export_pages(client, writer, checkpoint, checkpoint_path, checkpoint_pages, prefetch_pages)
+
+    return {"exported": checkpoint["count"], "resumed": resumed, "checkpoint": checkpoint_path}
+
+
+def _export_pages(client, writer, checkpoint, checkpoint_path, checkpoint_pages, prefetch_pages):
+    filters = checkpoint["filters"]
+    fetch_page = partial(
+        client.get_all_notifications,
+        filters["status"],
+        filters["template_type"],
+        filters["reference"],
+        include_jobs=filters["include_jobs"],
+    )
+    pages = paginate(fetch_page, "notifications", checkpoint["older_than"])
+    pages = client._observe_pages("export_notifications", pages)
+    if prefetch_pages:
+        pages = prefetch(pages, prefetch_pages)
+
+    fields = checkpoint.get("fields")
+    uncommitted_pages = 0
+    for notifications in pages:
+        writer.write(notifications if fields is None else select_fields(notifications, fields))
+        # the API's next link uses the id of the last notification on a page as the cursor for the page after it
+        checkpoint["older_than"] = notifications[-1]["id"]
+        checkpoint["count"] += len(notifications)
+        uncommitted_pages += 1
+        if uncommitted_pages >= checkpoint_pages:
+            _write_checkpoint(checkpoint_path, checkpoint, writer.commit())
+            uncommitted_pages = 0
+
+    checkpoint["complete"] = True
+    _write_checkpoint(checkpoint_path, checkpoint, writer.commit())
+
+
+def _read_checkpoint(checkpoint_path, filters, format, fields):
+    try:
+        with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except FileNotFoundError:
+        return None
+    # checkpoints from before fields could be chosen have no "fields", and are of exports of every field
+    if checkpoint["filters"] != filters or checkpoint["format"] != format or checkpoint.get("fields") != fields:
+        raise ValueError(f"{checkpoint_path} is the checkpoint of a different export. Delete it to start again")
+    return checkpoint
+
+
+def _write_checkpoint(checkpoint_path, checkpoint, writer_state):
+    checkpoint["writer"] = writer_state
+    # replace the checkpoint in one step, so an interruption leaves either the old checkpoint or the new one
+    temporary_path = f"{checkpoint_path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(temporary_path, checkpoint_path)
+
+
+class _JSONLWriter:
+    def __init__(self, path, state, json_serializer):
+        self.dumps = json_serializer.dumps
+        if state is None:
+            self.file = open(path, "wb")
+        else:
+            # throw away anything written after the checkpoint, because it will be fetched and written again
+            self.file = open(path, "r+b")
+            self.file.truncate(state["offset"])
+            self.file.seek(state["offset"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.file.close()
+
+    def write(self, notifications):
+        lines = []
+        for notification in notifications:
+            line = self.dumps(notification)
+            lines.append(line if isinstance(line, bytes) else line.encode("utf-8"))
+        lines.append(b"")
+        self.file.write(b"\n".join(lines))
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return {"offset": self.file.tell()}
+
+
+class _ParquetWriter:
+    def __init__(self, path, state, json_serializer):
+        self.path = path
+        self.parts = 0 if state is None else state["parts"]
+        self.rows = []
+        os.makedirs(path, exist_ok=True)
+        # remove files from after the checkpoint, or from an earlier export to the same directory
+        for part_path in glob.glob(os.path.join(glob.escape(path), "part-*.parquet")):
+            if self._part_number(part_path) >= self.parts:
+                os.remove(part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def write(self, notifications):
+        self.rows.extend(_parquet_row(notification) for notification in notifications)
+
+    def commit(self):
+        if self.rows:
+            schema = pyarrow.schema(list(PARQUET_COLUMNS.items()))
+            table = pyarrow.Table.from_pylist(self.rows, schema=schema)
+            part_path = os.path.join(self.path, f"part-{self.parts:05d}.parquet")
+            pyarrow.parquet.write_table(table, f"{part_path}.tmp")
+            os.replace(f"{part_path}.tmp", part_path)
+            self.parts += 1
+            self.rows = []
+        return {"parts": self.parts}
+
+    @staticmethod
+    def _part_number(part_path):
+        return int(os.path.basename(part_path)[len("part-") : -len(".parquet")])
+
+
+def _parquet_row(notification):
+    row = dict(notification)
+    template = row.pop("template", None) or {}
+    row["template_id"] = template.get("id")
+    row["template_version"] = template.get("version")
+    row["template_uri"] = template.get("uri")
+    if row.get("cost_details") is not None:
+        row["cost_details"] = json.dumps(row["cost_details"])
+    other = {key: row.pop(key) for key in list(row) if key not in PARQUET_COLUMNS}
+    row["other"] = json.dumps(other) if other else None
+    return row
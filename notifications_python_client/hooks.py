@@ -0,0 +1,150 @@
+import functools
+import logging
+import re
+import urllib.parse
+
+logger = logging.getLogger(__name__)
+
+_ID_SEGMENT = re.compile(r"/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)")
+_NUMBER_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class RequestHook:
+    """
+    Observes the requests a client sends, for example to export metrics.
+
+    Subclass this and override the methods for the events you need, then pass an instance in the client's `hooks`
+    argument or to `add_hook`. Each method is called with a RequestEvent for one attempt at a request, so a request
+    which is retried gives a before_request for each attempt.
+
+    Hooks are called in the thread sending the request, and in the event loop for the asyncio client, so they
+    should be quick. An exception raised by a hook is logged and does not stop the request.
+    """
+
+    def before_request(self, event):
+        """
+        Called just before each attempt is sent. Headers added to event.headers are sent with the request.
+        """
+
+    def after_response(self, event):
+        """
+        Called when an attempt gets a successful response
+        """
+
+    def on_error(self, event):
+        """
+        Called when an attempt fails, with the APIError it raised as event.error
+        """
+
+    def on_retry(self, event):
+        """
+        Called after on_error when the retry policy decides to try again, with the wait as event.retry_delay
+        """
+
+    def paginate(self, name, pages):
+        """
+        Called when one of the client's iterators starts, to observe all the page fetches it makes.
+
+        :param name: name of the iterator method, such as get_all_notifications_iterator
+        :param pages: iterator fetching and returning each page's list of items
+        :return: pages, or an iterator wrapping it
+        """
+        return pages
+
+    def paginate_async(self, name, pages):
+        """
+        The same as paginate, for the asyncio client's iterators
+
+        :param pages: async iterator fetching and returning each page's list of items
+        :return: pages, or an async iterator wrapping it
+        """
+        return pages
+
+
+class RequestEvent:
+    """
+    What is known about one attempt at a request. Attributes which aren't known yet, or aren't available for this
+    attempt, are None.
+
+    :ivar method: HTTP method
+    :ivar url: full URL, without the query string
+    :ivar endpoint: path with ids and numbers replaced by {id} and {number}, such as /v2/notifications/{id}, for
+        grouping metrics
+    :ivar attempt: number of this attempt, starting at 1
+    :ivar headers: dict of the request headers
+    :ivar data: the request's data before it was serialised, or None for requests without a body
+    :ivar status_code: status code of the response, or None if there wasn't one
+    :ivar bytes_sent: size of the request body
+    :ivar bytes_received: size of the response body
+    :ivar elapsed: seconds from sending the request to reading the whole response
+    :ivar time_to_first_byte: seconds from sending the request to parsing the response headers, if the HTTP library
+        records it
+    :ivar error: APIError the attempt failed with
+    :ivar retry_delay: seconds before the next attempt
+    :ivar context: dict for hooks to keep their own state between the calls for this attempt
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "endpoint",
+        "attempt",
+        "headers",
+        "data",
+        "status_code",
+        "bytes_sent",
+        "bytes_received",
+        "elapsed",
+        "time_to_first_byte",
+        "error",
+        "retry_delay",
+        "context",
+    )
+
+    def __init__(self, method, url, headers, data=None, body=None, attempt=1):
+        url = url.split("?", 1)[0]
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(urllib.parse.urlsplit(url).path)
+        self.attempt = attempt
+        self.headers = headers
+        self.data = data
+        self.status_code = None
+        self.bytes_sent = _size(body)
+        self.bytes_received = None
+        self.elapsed = None
+        self.time_to_first_byte = None
+        self.error = None
+        self.retry_delay = None
+        self.context = {}
+
+    def __repr__(self):
+        return f"<RequestEvent {self.method} {self.endpoint} attempt {self.attempt} status {self.status_code}>"
+
+
+@functools.lru_cache(maxsize=256)
+def endpoint_template(path):
+    """
+    :param path: path of a request URL
+    :return: the path with each segment that is a UUID replaced by {id}, and each that is a number by {number}
+    """
+    return _NUMBER_SEGMENT.sub("/{number}", _ID_SEGMENT.sub("/{id}", path))
+
+
+def call_hooks(hooks, name, event):
+    """
+    Call the method called name on each of hooks, logging rather than raising any exceptions
+    """
+    for hook in hooks:
+        try:
+            getattr(hook, name)(event)
+        except Exception:
+            logger.exception("Request hook %r failed in %s", hook, name)
+
+
+def _size(body):
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return len(body)
@@ -0,0 +1,286 @@
+"""
+Compact, read-only objects for the notifications, received text messages and templates the API returns, for
+programs which keep many of them in memory.
+
+    from notifications_python_client.models import Notification
+
+    for notification in client.get_all_notifications_iterator(models=True):
+        print(notification.id, notification.status, notification.created_at.date())
+
+Each field of the JSON is an attribute. A field the response didn't include reads as None. A model keeps its fields
+in a tuple rather than a dict, and fields which are often the same for many notifications, such as the template and
+the status, share one copy of each value between all the models. Those which are dicts, such as `cost_details`, read
+as read-only mappings. A Notification takes about half the memory of the dict it was made from (see
+`python -m benchmarks.model_memory_benchmark`).
+
+Fields which need decoding, such as timestamps and the template a notification was sent from, are decoded the first
+time they are read, so a program which never reads them doesn't pay for them. `raw` gives back the JSON, with any
+fields the API has added since this version of the client.
+"""
+
+import collections
+import itertools
+from datetime import datetime
+from types import MappingProxyType
+
+# template a notification was sent from
+TemplateVersion = collections.namedtuple("TemplateVersion", ["id", "version", "uri"])
+
+# most values kept in the table of values shared between models. Once it is full, new values aren't shared
+MAX_SHARED_VALUES = 10_000
+
+# value: the copy of it which models share
+_shared_values = {}
+
+# value of a field the response didn't include, told apart from one which is null
+_MISSING = object()
+
+
+def parse_timestamp(value):
+    """
+    :param value: timestamp from the API, such as "2024-01-31T12:00:00.000000Z"
+    :return: timezone aware datetime, or None if value is None
+    """
+    if value is None:
+        return None
+    # datetime.fromisoformat only understands the Z suffix from Python 3.11
+    if value.endswith("Z"):
+        return datetime.fromisoformat(f"{value[:-1]}+00:00")
+    return datetime.fromisoformat(value)
+
+
+def _shared(value):
+    """
+    :return: the copy of value shared between models, or value itself if it can't be shared. Dicts are returned as
+        read-only copies, so that no model can change a value other models share
+    """
+    if not isinstance(value, dict):
+        key = value
+    else:
+        # with the type of each item, so that a dict holding 1.0 isn't shared with one holding 1
+        key = (*value.items(), *map(type, value.values()))
+        # a copy, so that changing the dict the model was made from doesn't change it either
+        value = MappingProxyType(dict(value))
+    try:
+        return _shared_values[key]
+    except KeyError:
+        pass
+    except TypeError:
+        return value
+    if len(_shared_values) >= MAX_SHARED_VALUES:
+        return value
+    return _shared_values.setdefault(key, value)
+
+
+def _template_version(value):
+    return None if value is None else TemplateVersion(value.get("id"), value.get("version"), value.get("uri"))
+
+
+class _Field:
+    """
+    Attribute reading a field from the tuple of a model's fields
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance._values[self.index]
+        return None if value is _MISSING else value
+
+
+class _DecodedField(_Field):
+    """
+    Attribute decoding a field the first time it is read, and keeping the decoded value for later reads
+    """
+
+    __slots__ = ("decode",)
+
+    def __init__(self, index, decode):
+        super().__init__(index)
+        self.decode = decode
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        decoded = instance._decoded
+        if decoded is None:
+            decoded = {}
+            object.__setattr__(instance, "_decoded", decoded)
+        try:
+            return decoded[self.index]
+        except KeyError:
+            value = decoded[self.index] = self.decode(super().__get__(instance, owner))
+            return value
+
+
+class _Model:
+    __slots__ = ("_values", "_other", "_decoded")
+
+    # names of the fields of the JSON with their own attribute
+    FIELDS = ()
+    # field name: function decoding the field's JSON the first time it is read
+    DECODERS = {}
+    # names of the fields whose values are shared between models
+    SHARED_FIELDS = ()
+
+    def __init_subclass__(cls):
+        super().__init_subclass__()
+        for index, field in enumerate(cls.FIELDS):
+            decode = cls.DECODERS.get(field)
+            setattr(cls, field, _Field(index) if decode is None else _DecodedField(index, decode))
+        cls._field_set = frozenset(cls.FIELDS)
+        cls._shared_indexes = tuple(cls.FIELDS.index(field) for field in cls.SHARED_FIELDS)
+
+    def __init__(self, raw):
+        """
+        :param raw - dict of the JSON from the API:
+        """
+        values = list(map(raw.get, self.FIELDS, itertools.repeat(_MISSING)))
+        for index in self._shared_indexes:
+            if values[index] is not None:
+                values[index] = _shared(values[index])
+        other_keys = raw.keys() - self._field_set
+        object.__setattr__(self, "_values", tuple(values))
+        other = {key: value for key, value in raw.items() if key in other_keys} if other_keys else None
+        object.__setattr__(self, "_other", other)
+        object.__setattr__(self, "_decoded", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are read-only")
+
+    def __getitem__(self, key):
+        """
+        :return: the JSON of the field named key, for code written for the dicts the client returns
+        :raises KeyError: if the response didn't include key
+        """
+        if key in self._field_set:
+            index = self.FIELDS.index(key)
+            if self._values[index] is _MISSING:
+                raise KeyError(key)
+            return self._copy_shared(index, self._values[index])
+        if self._other is not None and key in self._other:
+            return self._other[key]
+        raise KeyError(key)
+
+    @property
+    def raw(self):
+        """
+        :return: dict of the JSON the model was made from, made afresh each time it is read
+        """
+        raw = {
+            self.FIELDS[index]: self._copy_shared(index, value)
+            for index, value in enumerate(self._values)
+            if value is not _MISSING
+        }
+        if self._other is not None:
+            raw.update(self._other)
+        return raw
+
+    def _copy_shared(self, index, value):
+        # the JSON has dicts, where the model keeps read-only copies
+        return dict(value) if index in self._shared_indexes and isinstance(value, MappingProxyType) else value
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.raw == other.raw
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.id}>"
+
+    def __reduce__(self):
+        return type(self), (self.raw,)
+
+
+class Notification(_Model):
+    """
+    A notification from get_notification_by_id or get_all_notifications. `template` is a TemplateVersion, and
+    `created_at`, `sent_at` and `completed_at` are datetimes.
+    """
+
+    __slots__ = ()
+
+    FIELDS = (
+        "id",
+        "reference",
+        "email_address",
+        "phone_number",
+        "line_1",
+        "line_2",
+        "line_3",
+        "line_4",
+        "line_5",
+        "line_6",
+        "line_7",
+        "postcode",
+        "postage",
+        "type",
+        "status",
+        "template",
+        "body",
+        "subject",
+        "created_at",
+        "created_by_name",
+        "sent_at",
+        "completed_at",
+        "scheduled_for",
+        "estimated_delivery",
+        "one_click_unsubscribe_url",
+        "is_cost_data_ready",
+        "cost_in_pounds",
+        "cost_details",
+    )
+    DECODERS = {
+        "template": _template_version,
+        "created_at": parse_timestamp,
+        "sent_at": parse_timestamp,
+        "completed_at": parse_timestamp,
+    }
+    SHARED_FIELDS = ("type", "status", "template", "postage", "created_by_name", "cost_details")
+
+
+class ReceivedText(_Model):
+    """
+    A text message from get_received_texts. `created_at` is a datetime.
+    """
+
+    __slots__ = ()
+
+    FIELDS = ("id", "user_number", "notify_number", "created_at", "service_id", "content")
+    DECODERS = {"created_at": parse_timestamp}
+    SHARED_FIELDS = ("notify_number", "service_id")
+
+
+class Template(_Model):
+    """
+    A template from get_template, get_template_version or get_all_templates. `created_at` and `updated_at` are
+    datetimes.
+    """
+
+    __slots__ = ()
+
+    FIELDS = (
+        "id",
+        "name",
+        "type",
+        "created_at",
+        "updated_at",
+        "version",
+        "created_by",
+        "body",
+        "subject",
+        "letter_contact_block",
+        "postage",
+    )
+    DECODERS = {"created_at": parse_timestamp, "updated_at": parse_timestamp}
+    SHARED_FIELDS = ("type", "created_by", "postage")
@@ -1,24 +1,131 @@
-import base64
+import functools
+import inspect
 import logging
-import re
+import random
+from functools import partial
 from io import BytesIO
 
+from notifications_python_client import rendering
 from notifications_python_client.base import BaseAPIClient
+from notifications_python_client.bulk import bounded_map
+from notifications_python_client.errors import ValidationError
+from notifications_python_client.models import Notification, ReceivedText
+from notifications_python_client.pagination import paginate, prefetch, select_fields
+from notifications_python_client.streaming import base64_file
+from notifications_python_client.template_cache import revalidation_headers, template_key, templates_key, version_key
 
 logger = logging.getLogger(__name__)
 
+# "type" of a notification for send_notifications_bulk: name of the method sending it
+BULK_SEND_METHODS = {
+    "sms": "send_sms_notification",
+    "email": "send_email_notification",
+    "letter": "send_letter_notification",
+}
+
+
+def sms_notification_data(phone_number, template_id, personalisation=None, reference=None, sms_sender_id=None):
+    notification = {"phone_number": phone_number, "template_id": template_id}
+    if personalisation:
+        notification.update({"personalisation": personalisation})
+    if reference:
+        notification.update({"reference": reference})
+    if sms_sender_id:
+        notification.update({"sms_sender_id": sms_sender_id})
+    return notification
+
+
+def email_notification_data(
+    email_address,
+    template_id,
+    personalisation=None,
+    reference=None,
+    email_reply_to_id=None,
+    one_click_unsubscribe_url=None,
+    sanitise_content_for=None,
+):
+    notification = {"email_address": email_address, "template_id": template_id}
+    if personalisation:
+        notification.update({"personalisation": personalisation})
+    if reference:
+        notification.update({"reference": reference})
+    if email_reply_to_id:
+        notification.update({"email_reply_to_id": email_reply_to_id})
+    if one_click_unsubscribe_url:
+        notification.update({"one_click_unsubscribe_url": one_click_unsubscribe_url})
+    if sanitise_content_for:
+        notification.update({"sanitise_content_for": sanitise_content_for})
+    return notification
+
+
+def letter_notification_data(template_id, personalisation, reference=None):
+    notification = {"template_id": template_id, "personalisation": personalisation}
+    if reference:
+        notification.update({"reference": reference})
+    return notification
+
+
+def precompiled_letter_notification_data(reference, pdf_file, postage=None):
+    notification = {"reference": reference, "content": base64_file(pdf_file)}
+
+    if postage:
+        notification["postage"] = postage
+
+    return notification
+
+
+@functools.cache
+def _arguments(method):
+    """
+    :return: tuple of the sets of the names of the keyword arguments method takes, and of those it needs
+    """
+    parameters = list(inspect.signature(method).parameters.values())[1:]
+    return (
+        {parameter.name for parameter in parameters},
+        [parameter.name for parameter in parameters if parameter.default is inspect.Parameter.empty],
+    )
+
+
+def _validation_error(messages):
+    return ValidationError([{"error": "ValidationError", "message": message} for message in messages])
+
+
+def received_texts_url(older_than=None):
+    if older_than:
+        query_string = f"?older_than={older_than}"
+    else:
+        query_string = ""
+
+    return f"/v2/received-text-messages{query_string}"
+
+
+def all_notifications_params(status=None, template_type=None, reference=None, older_than=None, include_jobs=None):
+    data = {}
+    if status:
+        data.update({"status": status})
+    if template_type:
+        data.update({"template_type": template_type})
+    if reference:
+        data.update({"reference": reference})
+    if older_than:
+        data.update({"older_than": older_than})
+    if include_jobs:
+        data.update({"include_jobs": include_jobs})
+    return data
+
+
+def all_templates_url(template_type=None):
+    _template_type = f"?type={template_type}" if template_type else ""
+
+    return f"/v2/templates{_template_type}"
+
 
 class NotificationsAPIClient(BaseAPIClient):
     def send_sms_notification(
         self, phone_number, template_id, personalisation=None, reference=None, sms_sender_id=None
     ):
-        notification = {"phone_number": phone_number, "template_id": template_id}
-        if personalisation:
-            notification.update({"personalisation": personalisation})
-        if reference:
-            notification.update({"reference": reference})
-        if sms_sender_id:
-            notification.update({"sms_sender_id": sms_sender_id})
+        notification = sms_notification_data(phone_number, template_id, personalisation, reference, sms_sender_id)
+        self._validate_notification("sms", notification)
         return self.post("/v2/notifications/sms", data=notification)
 
     def send_email_notification(
@@ -31,52 +138,81 @@ class NotificationsAPIClient(BaseAPIClient):
         one_click_unsubscribe_url=None,
         sanitise_content_for=None,
     ):
-        notification = {"email_address": email_address, "template_id": template_id}
-        if personalisation:
-            notification.update({"personalisation": personalisation})
-        if reference:
-            notification.update({"reference": reference})
-        if email_reply_to_id:
-            notification.update({"email_reply_to_id": email_reply_to_id})
-        if one_click_unsubscribe_url:
-            notification.update({"one_click_unsubscribe_url": one_click_unsubscribe_url})
-        if sanitise_content_for:
-            notification.update({"sanitise_content_for": sanitise_content_for})
-
+        notification = email_notification_data(
+            email_address,
+            template_id,
+            personalisation,
+            reference,
+            email_reply_to_id,
+            one_click_unsubscribe_url,
+            sanitise_content_for,
+        )
+        self._validate_notification("email", notification)
         return self.post("/v2/notifications/email", data=notification)
 
     def send_letter_notification(self, template_id, personalisation, reference=None):
-        notification = {"template_id": template_id, "personalisation": personalisation}
-        if reference:
-            notification.update({"reference": reference})
+        notification = letter_notification_data(template_id, personalisation, reference)
+        self._validate_notification("letter", notification)
         return self.post("/v2/notifications/letter", data=notification)
 
     def send_precompiled_letter_notification(self, reference, pdf_file, postage=None):
-        content = base64.b64encode(pdf_file.read()).decode("utf-8")
-        notification = {"reference": reference, "content": content}
+        notification = precompiled_letter_notification_data(reference, pdf_file, postage)
+        self._validate_notification("precompiled_letter", notification)
+        return self.post("/v2/notifications/letter", data=notification)
 
-        if postage:
-            notification["postage"] = postage
+    def send_notifications_bulk(self, notifications, max_workers=10, ordered=True):
+        """
+        Send many notifications concurrently from a pool of worker threads sharing this client. Create the client
+        with a pool_maxsize of at least max_workers so that each thread has a connection to reuse.
 
-        return self.post("/v2/notifications/letter", data=notification)
+        :param notifications: iterable of dicts, each with a "type" of "sms", "email" or "letter" and the keyword
+            arguments for the matching send_*_notification method. It is read lazily, so it can be a generator
+            over a file of any size
+        :param max_workers: number of requests in flight at once
+        :param ordered: yield results in the same order as notifications, rather than as soon as each completes
+        :return: generator of (index, result) pairs, where index is the position in notifications and result is
+            the API response or the APIError the request failed with. A notification which isn't a dict, or has an
+            unknown type or arguments its send_*_notification method doesn't take, fails with a ValidationError
+            without a request
+        """
+        return bounded_map(self._send_notification, notifications, max_workers=max_workers, ordered=ordered)
 
-    def get_received_texts(self, older_than=None):
-        if older_than:
-            query_string = f"?older_than={older_than}"
-        else:
-            query_string = ""
+    def _send_notification(self, notification):
+        if not isinstance(notification, dict):
+            raise _validation_error(["notification is not a JSON object"])
+        notification = dict(notification)
+        notification_type = notification.pop("type", None)
+        if notification_type not in BULK_SEND_METHODS:
+            types = ", ".join(BULK_SEND_METHODS)
+            raise _validation_error([f"type {notification_type} is not one of [{types}]"])
 
-        return self.get(f"/v2/received-text-messages{query_string}")
+        send = getattr(self, BULK_SEND_METHODS[notification_type])
+        allowed, required = _arguments(send.__func__)
+        unknown = [argument for argument in notification if argument not in allowed]
+        messages = [f"{argument} is not allowed for {notification_type} notifications" for argument in unknown]
+        messages += [f"{argument} is a required property" for argument in required if argument not in notification]
+        if messages:
+            raise _validation_error(messages)
+        return send(**notification)
 
-    def get_received_texts_iterator(self, older_than=None):
-        result = self.get_received_texts(older_than=older_than)
-        received_texts = result.get("received_text_messages")
-        while received_texts:
-            yield from received_texts
-            next_link = result["links"].get("next")
-            received_text_id = re.search("[0-F]{8}-[0-F]{4}-[0-F]{4}-[0-F]{4}-[0-F]{12}", next_link, re.I).group(0)
-            result = self.get_received_texts(older_than=received_text_id)
-            received_texts = result.get("received_text_messages")
+    def get_received_texts(self, older_than=None):
+        return self.get(received_texts_url(older_than))
+
+    def get_received_texts_iterator(self, older_than=None, prefetch_pages=0, models=False, fields=None):
+        """
+        :param prefetch_pages: number of pages to fetch in the background while earlier ones are being iterated over
+        :param models: yield ReceivedText objects, which take much less memory than dicts, rather than dicts
+        :param fields: names of the only fields to keep from each text message, such as ["id", "content"]. Each page
+            is cut down as soon as it is parsed, so the rest of every message isn't kept in memory
+        """
+        pages = paginate(self.get_received_texts, "received_text_messages", older_than)
+        pages = self._observe_pages("get_received_texts_iterator", pages)
+        if fields is not None:
+            pages = map(partial(select_fields, fields=tuple(fields)), pages)
+        if prefetch_pages:
+            pages = prefetch(pages, prefetch_pages)
+        for received_texts in pages:
+            yield from map(ReceivedText, received_texts) if models else received_texts
 
     def get_notification_by_id(self, id):
         return self.get(f"/v2/notifications/{id}")
@@ -93,43 +229,91 @@ class NotificationsAPIClient(BaseAPIClient):
     def get_all_notifications(
         self, status=None, template_type=None, reference=None, older_than=None, include_jobs=None
     ):
-        data = {}
-        if status:
-            data.update({"status": status})
-        if template_type:
-            data.update({"template_type": template_type})
-        if reference:
-            data.update({"reference": reference})
-        if older_than:
-            data.update({"older_than": older_than})
-        if include_jobs:
-            data.update({"include_jobs": include_jobs})
+        data = all_notifications_params(status, template_type, reference, older_than, include_jobs)
         return self.get("/v2/notifications", params=data)
 
-    def get_all_notifications_iterator(self, status=None, template_type=None, reference=None, older_than=None):
-        result = self.get_all_notifications(status, template_type, reference, older_than)
-        notifications = result.get("notifications")
-        while notifications:
-            yield from notifications
-            next_link = result["links"].get("next")
-            notification_id = re.search("[0-F]{8}-[0-F]{4}-[0-F]{4}-[0-F]{4}-[0-F]{12}", next_link, re.I).group(0)
-            result = self.get_all_notifications(status, template_type, reference, notification_id)
-            notifications = result.get("notifications")
+    def get_all_notifications_iterator(
+        self,
+        status=None,
+        template_type=None,
+        reference=None,
+        older_than=None,
+        prefetch_pages=0,
+        models=False,
+        fields=None,
+    ):
+        """
+        :param prefetch_pages: number of pages to fetch in the background while earlier ones are being iterated over
+        :param models: yield Notification objects, which take much less memory than dicts, rather than dicts
+        :param fields: names of the only fields to keep from each notification, such as ["id", "status"]. Each page
+            is cut down as soon as it is parsed, so the rest of every notification isn't kept in memory
+        """
+        fetch_page = partial(self.get_all_notifications, status, template_type, reference)
+        pages = paginate(fetch_page, "notifications", older_than)
+        pages = self._observe_pages("get_all_notifications_iterator", pages)
+        if fields is not None:
+            pages = map(partial(select_fields, fields=tuple(fields)), pages)
+        if prefetch_pages:
+            pages = prefetch(pages, prefetch_pages)
+        for notifications in pages:
+            yield from map(Notification, notifications) if models else notifications
 
     def post_template_preview(self, template_id, personalisation):
         template = {"personalisation": personalisation}
         return self.post(f"/v2/template/{template_id}/preview", data=template)
 
+    def preview_template(self, template_id, personalisation, version=None, verify_rate=0):
+        """
+        Render a template in this process, rather than with a request to post_template_preview. Create the client
+        with a template_cache so that the template is not fetched for every preview.
+
+        :param version: version of the template to render, or None for the latest
+        :param verify_rate: fraction of previews, from 0 to 1, to also request from the API and check against. If
+            the API's preview differs, its body and subject are returned and a warning is logged
+        :return: dict like post_template_preview's response, with a fragment_count for text messages
+        :raises ValueError: if personalisation has no value for a placeholder in the template
+        """
+        if version is None:
+            template = self.get_template(template_id)
+        else:
+            template = self.get_template_version(template_id, version)
+        preview = rendering.preview_template(template, personalisation)
+
+        if verify_rate and random.random() < verify_rate:
+            api_preview = self.post_template_preview(template_id, personalisation)
+            preview = rendering.verified_preview(preview, api_preview)
+        return preview
+
     def get_template(self, template_id):
-        return self.get(f"/v2/template/{template_id}")
+        url = f"/v2/template/{template_id}"
+        if self.template_cache is None:
+            return self.get(url)
+        return self._get_cached_template(template_key(template_id), url)
 
     def get_template_version(self, template_id, version):
-        return self.get(f"/v2/template/{template_id}/version/{version}")
+        url = f"/v2/template/{template_id}/version/{version}"
+        if self.template_cache is None:
+            return self.get(url)
+        return self._get_cached_template(version_key(template_id, version), url)
 
     def get_all_template_versions(self, template_id):
         return self.get(f"service/{self.service_id}/template/{template_id}/versions")
 
     def get_all_templates(self, template_type=None):
-        _template_type = f"?type={template_type}" if template_type else ""
+        url = all_templates_url(template_type)
+        if self.template_cache is None:
+            return self.get(url)
+        return self._get_cached_template(templates_key(template_type), url)
+
+    def _get_cached_template(self, key, url):
+        cached = self.template_cache.lookup(key)
+        if cached is not None and cached.fresh:
+            return cached.value
+
+        logger.debug("API request %s %s", "GET", url)
+        url, kwargs = self._create_request_objects(url, data=None, params=None)
+        kwargs["headers"].update(revalidation_headers(cached))
+
+        response = self._perform_request("GET", url, kwargs)
 
-        return self.get(f"/v2/templates{_template_type}")
+        return self.template_cache.update(key, cached, response, partial(self._process_json_response, response))
@@ -0,0 +1,132 @@
+import contextvars
+import queue
+import threading
+import urllib.parse
+
+_DONE = object()
+
+
+def paginate(fetch_page, items_key, older_than=None):
+    """
+    Generator of the pages of a cursor paginated endpoint, such as /v2/notifications.
+
+    Each page's links.next URL carries an older_than cursor pointing at the page after it. Iteration stops at the
+    first page with no items or no next link.
+
+    :param fetch_page: function taking an older_than keyword argument and returning the JSON response for that page
+    :param items_key: key of the list of items in each response
+    :param older_than: cursor to start from, or None to start with the newest items
+    :return: generator of the lists of items on each page
+    """
+    while True:
+        result = fetch_page(older_than=older_than)
+        items = result.get(items_key)
+        if not items:
+            return
+        yield items
+        older_than = next_older_than(result)
+        if older_than is None:
+            return
+
+
+async def paginate_async(fetch_page, items_key, older_than=None):
+    """
+    Asynchronous version of paginate, for a fetch_page coroutine function
+    """
+    while True:
+        result = await fetch_page(older_than=older_than)
+        items = result.get(items_key)
+        if not items:
+            return
+        yield items
+        older_than = next_older_than(result)
+        if older_than is None:
+            return
+
+
+def next_older_than(result):
+    """
+    :param result: JSON response for a page
+    :return: the older_than cursor of the next page, or None if there is no next page
+    """
+    next_link = (result.get("links") or {}).get("next")
+    if not next_link:
+        return None
+    older_than = urllib.parse.parse_qs(urllib.parse.urlsplit(next_link).query).get("older_than")
+    return older_than[0] if older_than else None
+
+
+def select_fields(items, fields):
+    """
+    :param items: list of dicts, such as the notifications on a page
+    :param fields: keys to keep
+    :return: list of dicts of only the keys in fields which each item has
+    """
+    return [{field: item[field] for field in fields if field in item} for item in items]
+
+
+def prefetch(iterable, depth):
+    """
+    Iterate over iterable in a background thread, staying up to depth items ahead of the caller.
+
+    Used to fetch the next pages of a paginated endpoint while the caller is still working through the current one.
+    Exceptions raised by iterable are raised to the caller when it reaches them. If the caller stops early the
+    background thread stops too, after finishing any request it has already started.
+
+    :param iterable: iterable to read in the background, typically a generator making a request for each page
+    :param depth: maximum number of items fetched but not yet yielded
+    """
+    assert depth > 0, "depth must be at least 1"
+    producer = _Producer(iterable, depth)
+    producer.start()
+    try:
+        while True:
+            item, error = producer.results.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        producer.stop()
+
+
+class _Producer:
+    def __init__(self, iterable, depth):
+        self.iterable = iterable
+        self.results = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+
+    def start(self):
+        # run in a copy of the caller's context so that context variables, such as the current trace, carry over
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(self._produce,), daemon=True)
+        thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        # unblock the producer if it is waiting for space to put another item
+        while not self.results.empty():
+            self.results.get_nowait()
+
+    def _produce(self):
+        iterator = iter(self.iterable)
+        try:
+            # checked before each item as well as when putting it, as stop() can unblock a put for an item which was
+            # fetched before the caller stopped, and the next item must not be fetched after that
+            while not self.stopped.is_set():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    self._put(_DONE)
+                    return
+                if not self._put(item):
+                    return
+        except Exception as e:
+            self._put(_DONE, e)
+
+    def _put(self, item, error=None):
+        # once the caller has stopped nothing will take from the queue, so only put while it is still reading
+        if self.stopped.is_set():
+            return False
+        self.results.put((item, error))
+        return True
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket that paces requests to a steady rate, allowing short bursts.
+
+    Each request takes a token. Tokens are added at `rate` per `period` seconds, up to `burst`. When the bucket is
+    empty a request reserves the next token and waits until it is due, so callers queue in the order they arrive
+    rather than all retrying at once.
+
+    One limiter can be shared by clients in any number of threads, and by tasks using the asyncio client. Waiting
+    in `acquire` blocks the calling thread, while waiting in `acquire_async` only suspends the calling task.
+    """
+
+    def __init__(self, rate, period=1, burst=None):
+        """
+        :param rate - number of requests allowed each period:
+        :param period - length of the period in seconds, for example 60 to match a per-minute limit:
+        :param burst - number of requests which can be sent at once after a quiet spell. Defaults to one second's
+            worth of requests, and at least 1:
+        """
+        assert rate > 0, "rate must be greater than 0"
+        assert period > 0, "period must be greater than 0"
+        self.rate = rate / period
+        self.burst = burst if burst is not None else max(1, self.rate)
+        assert self.burst >= 1, "burst must be at least 1"
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reserve(self):
+        """
+        Take a token, which may leave the bucket in debt, and return how many seconds until that token is due
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
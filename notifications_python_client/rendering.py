@@ -0,0 +1,145 @@
+import functools
+import logging
+import math
+import re
+
+logger = logging.getLogger(__name__)
+
+# a placeholder is ((name)), or ((name??text)) for text which is only shown when the name's value is yes or true
+PLACEHOLDER = re.compile(r"\(\(([^()]+)\)\)")
+
+_SHOW_CONDITIONAL_TEXT = frozenset({"yes", "y", "true", "t", "1", "include", "show"})
+
+# GSM 03.38 basic character set, and the extension characters which take two characters' space
+GSM_CHARACTERS = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿"
+    "abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM_EXTENSION_CHARACTERS = frozenset("^{}\\[~]|€\f")
+_ALL_GSM_CHARACTERS = GSM_CHARACTERS | GSM_EXTENSION_CHARACTERS
+
+_IGNORED_IN_NAMES = str.maketrans("", "", " _-")
+
+
+def placeholder_names(content):
+    """
+    :param content: template body or subject
+    :return: list of the names of the placeholders in content, in the order they first appear
+    """
+    return [name for _, name in _placeholders(content or "")]
+
+
+def render(content, personalisation):
+    """
+    Replace the placeholders in a template body or subject with personalisation.
+
+    Names are matched ignoring case, spaces, hyphens and underscores, as the API matches them. Lists are joined
+    into one line separated by semicolons.
+
+    :param content: template body or subject
+    :param personalisation: dict of placeholder names to values
+    :return: str of the rendered content
+    :raises ValueError: if personalisation has no value for a placeholder in content
+    """
+    if not content:
+        return content
+    values = {_key(name): value for name, value in (personalisation or {}).items()}
+
+    missing = [name for key, name in _placeholders(content) if key not in values]
+    if missing:
+        raise ValueError(f"Missing personalisation: {', '.join(missing)}")
+
+    return PLACEHOLDER.sub(lambda match: _replacement(match.group(1), values), content)
+
+
+def preview_template(template, personalisation):
+    """
+    Render a template as post_template_preview does, without a request to the API.
+
+    :param template: template from get_template or get_template_version
+    :param personalisation: dict of placeholder names to values
+    :return: dict of the template's id, type and version, its rendered body and subject, and for text messages
+        the number of fragments it will be sent as
+    :raises ValueError: if personalisation has no value for a placeholder in the template
+    """
+    preview = {
+        "id": template["id"],
+        "type": template["type"],
+        "version": template["version"],
+        "body": render(template["body"], personalisation),
+        "subject": render(template.get("subject"), personalisation),
+    }
+    if template["type"] == "sms":
+        preview["fragment_count"] = sms_fragment_count(preview["body"])
+    return preview
+
+
+def verified_preview(preview, api_preview):
+    """
+    Check a local preview against the API's preview of the same template.
+
+    :param preview: preview from preview_template
+    :param api_preview: response from post_template_preview
+    :return: preview, or if the API rendered a different body or subject, preview with the API's body and subject
+    """
+    if api_preview.get("version") != preview["version"]:
+        # the API only previews the latest version
+        return preview
+    if (api_preview["body"], api_preview.get("subject")) == (preview["body"], preview["subject"]):
+        return preview
+
+    logger.warning(
+        "Local preview of template %s version %s differs from the API's preview", preview["id"], preview["version"]
+    )
+    preview = {**preview, "body": api_preview["body"], "subject": api_preview.get("subject")}
+    if "fragment_count" in preview:
+        preview["fragment_count"] = sms_fragment_count(preview["body"])
+    return preview
+
+
+def sms_fragment_count(content):
+    """
+    :param content: rendered text message
+    :return: number of fragments the message is sent as. A message using only GSM characters fits 160 characters
+        in one fragment, or 153 in each of several. Any other character means every character is sent as UCS-2,
+        which fits 70 characters in one fragment, or 67 in each of several.
+    """
+    if not content:
+        return 0
+
+    characters = set(content)
+    if characters <= _ALL_GSM_CHARACTERS:
+        extension_characters = characters & GSM_EXTENSION_CHARACTERS
+        length = len(content) + sum(content.count(character) for character in extension_characters)
+        single, multiple = 160, 153
+    else:
+        # characters outside the basic multilingual plane take two UTF-16 code units
+        length = len(content.encode("utf-16-le")) // 2
+        single, multiple = 70, 67
+
+    return 1 if length <= single else math.ceil(length / multiple)
+
+
+def _replacement(placeholder, values):
+    name, separator, conditional_text = placeholder.partition("??")
+    value = values[_key(name)]
+    if separator:
+        return conditional_text if str(value).strip().lower() in _SHOW_CONDITIONAL_TEXT else ""
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+
+# templates and their placeholder names are the same for every row of a batch, so parse each only once
+@functools.lru_cache(maxsize=256)
+def _placeholders(content):
+    names = {}
+    for match in PLACEHOLDER.finditer(content):
+        name = match.group(1).split("??", 1)[0]
+        names.setdefault(_key(name), name)
+    return tuple(names.items())
+
+
+@functools.lru_cache(maxsize=1024)
+def _key(name):
+    return name.translate(_IGNORED_IN_NAMES).lower()
@@ -0,0 +1,92 @@
+import email.utils
+import random
+import threading
+import time
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request should be tried again, and how long to wait first.
+
+    Requests using an idempotent method are retried when they fail with one of retry_status_codes, which includes
+    the 503 that connection errors are reported as. Requests using any other method, such as the POST that sends
+    a notification, are only retried for safe_status_codes: responses which mean the API did not act on the
+    request, so sending it again cannot create a duplicate notification.
+
+    Waits use exponential backoff with full jitter, unless the API sends a Retry-After header. A policy can be
+    shared by several clients, and counts the retries and give ups of all of them.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_base=0.5,
+        backoff_cap=30,
+        retry_status_codes=frozenset({429, 502, 503, 504}),
+        safe_status_codes=frozenset({429}),
+        idempotent_methods=IDEMPOTENT_METHODS,
+    ):
+        """
+        :param max_attempts - total number of times a request is tried, including the first:
+        :param backoff_base - upper bound in seconds of the wait before the first retry, doubling for each retry:
+        :param backoff_cap - longest wait in seconds between attempts. A Retry-After longer than this is not waited
+            for and the request fails:
+        :param retry_status_codes - status codes which are retried for idempotent methods:
+        :param safe_status_codes - status codes which are retried for any method:
+        :param idempotent_methods - methods safe to send more than once. Add "POST" to retry sends when a
+            duplicate notification is acceptable:
+        """
+        assert max_attempts > 0, "max_attempts must be at least 1"
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.safe_status_codes = frozenset(safe_status_codes)
+        self.idempotent_methods = frozenset(method.upper() for method in idempotent_methods)
+        self.retries = 0
+        self.give_ups = 0
+        self._lock = threading.Lock()
+
+    def get_retry_delay(self, method, error, attempt):
+        """
+        :param method: HTTP method of the failed request
+        :param error: the APIError the attempt failed with
+        :param attempt: number of the attempt which failed, starting at 1
+        :return: seconds to wait before trying again, or None if the request should not be retried
+        """
+        if not self._is_retryable(method, error):
+            return None
+
+        delay = self._retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+        with self._lock:
+            if attempt >= self.max_attempts or delay > self.backoff_cap:
+                self.give_ups += 1
+                return None
+            self.retries += 1
+        return delay
+
+    def _is_retryable(self, method, error):
+        if error.status_code in self.safe_status_codes:
+            return True
+        return method.upper() in self.idempotent_methods and error.status_code in self.retry_status_codes
+
+    @staticmethod
+    def _retry_after(error):
+        try:
+            retry_after = error.response.headers["Retry-After"]
+        except (AttributeError, KeyError):
+            return None
+
+        if retry_after.strip().isdigit():
+            return float(retry_after)
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,68 @@
+"""
+JSON schemas for the bodies of the requests which send notifications, used to check them before they are sent
+"""
+
+uuid = {
+    "type": "string",
+    "pattern": "^[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}$",
+    "validationMessage": "is not a valid UUID",
+}
+
+https_url = {"type": "string", "format": "uri", "pattern": "^https.*", "validationMessage": "is not a valid https url"}
+
+personalisation = {"type": "object", "validationMessage": "should contain key value pairs"}
+
+post_sms_request = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "description": "POST sms notification schema",
+    "type": "object",
+    "title": "POST v2/notifications/sms",
+    "properties": {
+        "reference": {"type": "string"},
+        "phone_number": {"type": "string", "format": "phone_number"},
+        "template_id": uuid,
+        "sms_sender_id": uuid,
+        "personalisation": personalisation,
+    },
+    "required": ["phone_number", "template_id"],
+}
+
+post_email_request = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "description": "POST email notification schema",
+    "type": "object",
+    "title": "POST v2/notifications/email",
+    "properties": {
+        "reference": {"type": "string"},
+        "email_address": {"type": "string", "format": "email_address"},
+        "template_id": uuid,
+        "email_reply_to_id": uuid,
+        "personalisation": personalisation,
+        "one_click_unsubscribe_url": https_url,
+        "sanitise_content_for": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["email_address", "template_id"],
+}
+
+post_letter_request = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "description": "POST letter notification schema",
+    "type": "object",
+    "title": "POST v2/notifications/letter",
+    "properties": {"reference": {"type": "string"}, "template_id": uuid, "personalisation": personalisation},
+    "required": ["template_id", "personalisation"],
+}
+
+post_precompiled_letter_request = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "description": "POST precompiled letter notification schema",
+    "type": "object",
+    "title": "POST v2/notifications/letter",
+    "properties": {
+        "reference": {"type": "string"},
+        # the base64 encoded PDF, which may be streamed rather than a string
+        "content": {},
+        "postage": {"enum": ["first", "second", "economy", "europe", "rest-of-world"]},
+    },
+    "required": ["reference", "content"],
+}
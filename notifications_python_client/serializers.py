@@ -0,0 +1,106 @@
+import json
+
+
+class JSONSerializer:
+    """
+    Serialises request bodies and parses responses with the standard library's json module.
+
+    A serializer is any object with the `dumps` and `loads` methods below. Pass one as the `json_serializer`
+    argument of the client, or the name of one of the serializers in this module.
+    """
+
+    name = "json"
+
+    def dumps(self, data, default=None):
+        """
+        :param data: data to serialise
+        :param default: function returning a serialisable version of an object that can't be serialised, or
+            raising TypeError
+        :return: str or bytes of the JSON
+        """
+        return json.dumps(data, default=default)
+
+    def loads(self, content):
+        """
+        :param content: bytes of a JSON document
+        :return: the parsed document
+        :raises ValueError: if content is not valid JSON
+        """
+        return json.loads(content)
+
+
+class OrjsonSerializer(JSONSerializer):
+    """
+    Uses orjson, which is several times faster than the json module. Install it with
+    `pip install notifications-python-client[orjson]`.
+
+    orjson also serialises dataclasses, datetimes and UUIDs itself rather than passing them to `default`.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        # the json module turns int, float, bool and None keys into strings, and orjson only does so when asked
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data, default=None):
+        return self._orjson.dumps(data, default=default, option=self._options)
+
+    def loads(self, content):
+        return self._orjson.loads(content)
+
+
+class UjsonSerializer(JSONSerializer):
+    """
+    Uses ujson, which is faster than the json module. Install it with
+    `pip install notifications-python-client[ujson]`.
+    """
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def dumps(self, data, default=None):
+        # ujson writes / as \/ unless told not to, which the json module doesn't
+        return self._ujson.dumps(data, default=default, escape_forward_slashes=False)
+
+    def loads(self, content):
+        return self._ujson.loads(content)
+
+
+SERIALIZERS = {serializer.name: serializer for serializer in (JSONSerializer, OrjsonSerializer, UjsonSerializer)}
+
+# fastest first
+_AUTO_PREFERENCE = (OrjsonSerializer, UjsonSerializer, JSONSerializer)
+
+
+def get_json_serializer(json_serializer):
+    """
+    :param json_serializer: a serializer, one of the names in SERIALIZERS, or "auto" for the fastest one installed
+    :return: a serializer
+    :raises ImportError: if the named serializer's library is not installed
+    :raises ValueError: if there is no serializer with that name
+    """
+    if not isinstance(json_serializer, str):
+        return json_serializer
+
+    if json_serializer == "auto":
+        for serializer in _AUTO_PREFERENCE:
+            try:
+                return serializer()
+            except ImportError:
+                continue
+
+    try:
+        serializer = SERIALIZERS[json_serializer]
+    except KeyError:
+        raise ValueError(
+            f"Unknown JSON serializer: {json_serializer}. Use one of {', '.join(SERIALIZERS)} or auto"
+        ) from None
+    return serializer()
@@ -0,0 +1,206 @@
+import collections
+import logging
+import math
+import time
+from functools import partial
+
+from notifications_python_client.bulk import bounded_map
+from notifications_python_client.errors import HTTPError
+from notifications_python_client.pagination import paginate
+
+logger = logging.getLogger(__name__)
+
+# statuses a notification never changes from
+FINAL_STATUSES = frozenset(
+    {
+        "delivered",
+        "sent",
+        "received",
+        "permanent-failure",
+        "temporary-failure",
+        "technical-failure",
+        "validation-failed",
+        "virus-scan-failed",
+        "cancelled",
+    }
+)
+
+# seconds to wait before first checking again on a notification with each status. Letters are printed once a day
+DEFAULT_INTERVALS = {"created": 10, "sending": 30, "pending": 60, "pending-virus-check": 60, "accepted": 3600}
+
+# most notifications the API returns on each page of get_all_notifications
+PAGE_SIZE = 250
+
+StatusChange = collections.namedtuple("StatusChange", ["id", "previous_status", "status", "notification"])
+
+
+class _Tracked:
+    __slots__ = ("reference", "status", "next_poll", "interval")
+
+    def __init__(self, reference, next_poll):
+        self.reference = reference
+        self.status = None
+        self.next_poll = next_poll
+        self.interval = 0
+
+
+class StatusTracker:
+    """
+    Follows the statuses of many notifications until each has a final status, with far fewer requests than calling
+    get_notification_by_id for each of them in turn.
+
+    Each notification is checked again after a wait which depends on its status, and which doubles (up to
+    max_interval) every time it is found unchanged. Notifications due to be checked are grouped by reference. If
+    walking the pages of get_all_notifications for a reference is expected to take fewer requests than looking up
+    each notification due, the pages are walked, stopping as soon as every notification due has been seen. Every
+    tracked notification on those pages is updated, not only those which were due. How many pages each reference
+    took is remembered, so a reference shared with many other notifications soon goes back to lookups by id.
+
+        tracker = StatusTracker(client)
+        for response in responses:
+            tracker.track(response["id"], response["reference"])
+        for change in tracker.changes():
+            print(change.id, change.status)
+
+    A notification the API can't find (a 404 response) is no longer tracked, and is logged as a warning. Other
+    errors from the API are raised from changes(), once the results of the rest of the lookups made at the same time
+    have been applied. The notifications which failed are checked again the next time changes() or poll() is called.
+    Give the client a retry_policy to ride out temporary errors.
+    """
+
+    def __init__(self, client, intervals=None, default_interval=60, backoff=2, max_interval=900, max_workers=1):
+        """
+        :param client - NotificationsAPIClient to make requests with:
+        :param intervals - dict of seconds to wait before checking again on a notification with each status, in
+            place of DEFAULT_INTERVALS:
+        :param default_interval - seconds to wait for other statuses which aren't final:
+        :param backoff - factor the wait grows by each time a notification is found unchanged:
+        :param max_interval - longest wait in seconds between checks on a notification:
+        :param max_workers - number of lookups by id to make at once. Create the client with a pool_maxsize of at
+            least this:
+        """
+        assert backoff >= 1, "backoff must be at least 1"
+        assert max_workers > 0, "max_workers must be at least 1"
+        self.client = client
+        self.intervals = DEFAULT_INTERVALS if intervals is None else intervals
+        self.default_interval = default_interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.max_workers = max_workers
+        self.lookups = 0
+        self.pages = 0
+        # notifications which haven't reached a final status, by id
+        self._tracked = {}
+        # reference: number of requests it took to find the notifications due the last time its pages were walked
+        self._walk_costs = {}
+
+    def __len__(self):
+        return len(self._tracked)
+
+    @property
+    def stats(self):
+        """
+        :return: dict of the numbers of lookups by id and pages fetched so far, and of notifications being tracked
+        """
+        return {"lookups": self.lookups, "pages": self.pages, "tracking": len(self._tracked)}
+
+    def track(self, notification_id, reference=None):
+        """
+        :param notification_id: id of a notification to follow, such as the "id" of a send_*_notification response
+        :param reference: the reference it was sent with. Notifications sharing a reference can be checked a page
+            at a time
+        """
+        self._tracked[str(notification_id)] = _Tracked(reference, time.monotonic())
+
+    def changes(self, timeout=None):
+        """
+        Check on the tracked notifications as each becomes due, until all of them have a final status.
+
+        :param timeout: seconds after which to stop even if some notifications don't have a final status yet
+        :return: generator of StatusChange tuples of a notification's id, its previous status (None the first time
+            it is checked), its new status and the notification's JSON, in the order the changes are found
+        """
+        stop_at = None if timeout is None else time.monotonic() + timeout
+        while self._tracked:
+            now = time.monotonic()
+            if stop_at is not None and now >= stop_at:
+                return
+            next_poll = min(tracked.next_poll for tracked in self._tracked.values())
+            if next_poll > now:
+                time.sleep(next_poll - now if stop_at is None else min(next_poll, stop_at) - now)
+                continue
+            yield from self.poll()
+
+    def poll(self):
+        """
+        Check once on the tracked notifications which are due
+
+        :return: generator of StatusChange tuples
+        """
+        now = time.monotonic()
+        due_by_reference = collections.defaultdict(list)
+        for notification_id, tracked in self._tracked.items():
+            if tracked.next_poll <= now:
+                due_by_reference[tracked.reference].append(notification_id)
+
+        lookups = []
+        for reference, due in due_by_reference.items():
+            if reference is not None and self._walk_cost(reference, due) < len(due):
+                due = yield from self._walk_pages(reference, due)
+            lookups.extend(due)
+
+        error = None
+        for index, notification in bounded_map(self.client.get_notification_by_id, lookups, self.max_workers):
+            self.lookups += 1
+            if isinstance(notification, HTTPError) and notification.status_code == 404:
+                logger.warning("Notification %s was not found, so is no longer tracked", lookups[index])
+                self._tracked.pop(lookups[index], None)
+            elif isinstance(notification, Exception):
+                error = error or notification
+            else:
+                yield from self._update(notification)
+        if error is not None:
+            raise error
+
+    def _walk_cost(self, reference, due):
+        # until a reference has been walked, assume its pages only hold tracked notifications
+        return self._walk_costs.get(reference, math.ceil(len(due) / PAGE_SIZE))
+
+    def _walk_pages(self, reference, due):
+        """
+        Fetch pages of notifications with reference until all of due have been seen, or until it would have been
+        cheaper to look them up by id
+
+        :return: generator of the StatusChange tuples found, returning the list of the ids in due which weren't seen
+        """
+        unseen = set(due)
+        pages = 0
+        fetch_page = partial(self.client.get_all_notifications, reference=reference)
+        for notifications in paginate(fetch_page, "notifications"):
+            pages += 1
+            self.pages += 1
+            for notification in notifications:
+                unseen.discard(notification["id"])
+                yield from self._update(notification)
+            if not unseen or pages + len(unseen) >= len(due):
+                break
+        self._walk_costs[reference] = pages + len(unseen)
+        return [notification_id for notification_id in due if notification_id in unseen]
+
+    def _update(self, notification):
+        tracked = self._tracked.get(notification["id"])
+        if tracked is None:
+            return
+        previous_status, status = tracked.status, notification["status"]
+        if status == previous_status:
+            tracked.interval = min(tracked.interval * self.backoff, self.max_interval)
+        else:
+            tracked.status = status
+            tracked.interval = min(self.intervals.get(status, self.default_interval), self.max_interval)
+
+        if status in FINAL_STATUSES:
+            del self._tracked[notification["id"]]
+        else:
+            tracked.next_poll = time.monotonic() + tracked.interval
+        if status != previous_status:
+            yield StatusChange(notification["id"], previous_status, status, notification)
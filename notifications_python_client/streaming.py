@@ -0,0 +1,142 @@
+import base64
+import io
+import re
+import secrets
+import threading
+
+# read a multiple of 3 bytes at a time so that each chunk encodes without padding
+CHUNK_SIZE = 3 * 16 * 1024
+
+# stands in for a stream while the rest of the body is serialised. The random token means it can't clash with a
+# string in the data, and the NUL characters are always escaped to \u0000 in the JSON
+_PLACEHOLDER_TOKEN = secrets.token_hex(8)
+_PLACEHOLDER = "\x00" + _PLACEHOLDER_TOKEN + ":{}\x00"
+_SERIALISED_PLACEHOLDER = re.compile(r"\\u0000" + _PLACEHOLDER_TOKEN + r":(\d+)\\u0000")
+
+
+def base64_file(f):
+    """
+    Base64 encode the rest of a file for sending in a JSON request body.
+
+    If the file's size can be found by seeking, it is encoded a chunk at a time while the request is sent. Otherwise
+    it is read and encoded straight away.
+
+    :param f: file-like object opened in binary mode
+    :return: Base64Stream, or str of the encoded file
+    """
+    size = remaining_size(f)
+    if size is None:
+        return base64.b64encode(f.read()).decode("ascii")
+    return Base64Stream(f, size)
+
+
+def remaining_size(f):
+    """
+    :param f: file-like object
+    :return: number of bytes from the current position to the end of the file, or None if that can't be found
+        without reading it
+    """
+    try:
+        start = f.tell()
+        end = f.seek(0, io.SEEK_END)
+        f.seek(start)
+    except (AttributeError, OSError, ValueError):
+        # io.UnsupportedOperation is both an OSError and a ValueError
+        return None
+    if not isinstance(start, int) or not isinstance(end, int):
+        return None
+    return end - start
+
+
+class Base64Stream:
+    """
+    Part of a file, base64 encoded a chunk at a time each time it is iterated over.
+
+    Each iteration keeps its own position in the file, and holds a lock while it seeks to it and reads a chunk, so
+    the same stream can be sent in any number of requests at once, such as one attachment sent to many recipients
+    with send_notifications_bulk. Nothing else should read the file while it is being sent.
+    """
+
+    def __init__(self, f, size):
+        self.file = f
+        self.start = f.tell()
+        self.size = size
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return 4 * -(-self.size // 3)
+
+    def __iter__(self):
+        position = self.start
+        end = self.start + self.size
+        while position < end:
+            chunk = self._read_at(position, min(CHUNK_SIZE, end - position))
+            if not chunk:
+                raise ValueError("File was shorter than expected when it was sent")
+            position += len(chunk)
+            yield base64.b64encode(chunk)
+
+    def _read_at(self, position, size):
+        with self._lock:
+            self.file.seek(position)
+            return self._read(size)
+
+    def _read(self, size):
+        # raw files may return less than asked for, which would put padding in the middle of the encoded file
+        chunk = self.file.read(size)
+        while chunk and len(chunk) < size:
+            more = self.file.read(size - len(chunk))
+            if not more:
+                break
+            chunk += more
+        return chunk
+
+
+def encode_json_body(data, dumps, default):
+    """
+    Serialise data to JSON, streaming any Base64Stream values it contains.
+
+    :param data: data to serialise
+    :param dumps: function like json.dumps taking the data and a default function
+    :param default: function converting objects dumps can't serialise
+    :return: str of the JSON, or a StreamingJSONBody if data contains a Base64Stream
+    """
+    streams = []
+
+    def default_with_streams(obj):
+        if isinstance(obj, Base64Stream):
+            streams.append(obj)
+            return _PLACEHOLDER.format(len(streams) - 1)
+        return default(obj)
+
+    body = dumps(data, default=default_with_streams)
+    if not streams:
+        return body
+    return StreamingJSONBody(body, streams)
+
+
+class StreamingJSONBody:
+    """
+    A JSON request body with base64 encoded files inside it, which can be sent without ever holding a whole file in
+    memory. It has a length so it is sent with a Content-Length header, and can be iterated over again if the
+    request is retried.
+    """
+
+    def __init__(self, serialised, streams):
+        parts = _SERIALISED_PLACEHOLDER.split(serialised.decode() if isinstance(serialised, bytes) else serialised)
+        # split alternates between the JSON around the streams and the index of each stream
+        self.parts = [streams[int(part)] if i % 2 else part.encode() for i, part in enumerate(parts)]
+
+    def __len__(self):
+        return sum(len(part) for part in self.parts)
+
+    def __iter__(self):
+        for part in self.parts:
+            if isinstance(part, Base64Stream):
+                yield from part
+            elif part:
+                yield part
+
+    async def __aiter__(self):
+        for chunk in self:
+            yield chunk
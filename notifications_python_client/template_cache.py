@@ -0,0 +1,157 @@
+import collections
+import copy
+import threading
+import time
+
+CachedTemplate = collections.namedtuple("CachedTemplate", ["value", "etag", "fresh"])
+
+
+class TemplateCache:
+    """
+    In-process cache of templates, for clients which look up the same templates many times.
+
+    Pass one as the `template_cache` argument when you create the client, and `get_template`, `get_template_version`
+    and `get_all_templates` will use it. A template's latest version, and lists of templates, are kept for `ttl`
+    seconds. A specific version of a template never changes, so it is kept until it is the least recently used entry
+    in a full cache. Versions are also kept from every template fetched, so `get_template_version` for the latest
+    version is usually a hit.
+
+    Once an entry has expired, the client asks the API for it again. If the API sent an ETag with the first
+    response, it is sent in an If-None-Match header, and a 304 Not Modified response renews the cached entry
+    without downloading it again.
+
+    Each lookup returns a copy, so changing a returned template does not change the cache. A cache can be shared
+    by clients in any number of threads, as long as they use the same API key's service.
+    """
+
+    def __init__(self, maxsize=1000, ttl=60):
+        """
+        :param maxsize - maximum number of entries. Each list of templates counts as one entry:
+        :param ttl - seconds to keep a template's latest version, and lists of templates, before asking the API for
+            them again:
+        """
+        assert maxsize > 0, "maxsize must be at least 1"
+        assert ttl >= 0, "ttl must not be negative"
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        # key: (value, etag, expires at, or None if it never expires), least recently used first
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """
+        :return: dict of the numbers of hits, misses, revalidations and evictions, and the current size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+    def lookup(self, key):
+        """
+        :param key: key from template_key, version_key or templates_key
+        :return: CachedTemplate, with fresh False if it has expired and must be revalidated, or None if the key
+            isn't cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            value, etag, expires_at = entry
+            fresh = expires_at is None or time.monotonic() < expires_at
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return CachedTemplate(copy.deepcopy(value), etag, fresh)
+
+    def update(self, key, cached, response, parse_response):
+        """
+        Cache the response to a request for key, which was made because lookup returned cached
+
+        :param key: key the request was for
+        :param cached: the CachedTemplate returned by lookup, or None
+        :param response: the successful response, which may be a 304 if the request revalidated cached
+        :param parse_response: function returning the JSON data of response
+        :return: the data for key
+        """
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self.revalidations += 1
+            self._store(key, cached.value, cached.etag)
+            return cached.value
+
+        value = parse_response()
+        self._store(key, value, response.headers.get("ETag"))
+        if key[0] == "template":
+            self._store_versions([value])
+        elif key[0] == "templates":
+            self._store_versions(value.get("templates", []))
+        return value
+
+    def invalidate(self, template_id=None):
+        """
+        Forget the cached latest versions of templates and lists of templates, so they are fetched again. Specific
+        versions are kept, because they never change.
+
+        :param template_id: id of the template to forget, or None to forget all of them
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == "templates" or (key[0] == "template" and template_id in (None, key[1])):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _store_versions(self, templates):
+        for template in templates:
+            if isinstance(template, dict) and "id" in template and "version" in template:
+                self._store(version_key(template["id"], template["version"]), template, None, expires=False)
+
+    def _store(self, key, value, etag, expires=None):
+        if expires is None:
+            expires = key[0] != "version"
+        entry = (copy.deepcopy(value), etag, time.monotonic() + self.ttl if expires else None)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+def template_key(template_id):
+    return ("template", str(template_id))
+
+
+def version_key(template_id, version):
+    return ("version", str(template_id), int(version))
+
+
+def templates_key(template_type):
+    return ("templates", template_type)
+
+
+def revalidation_headers(cached):
+    """
+    :return: dict of the headers asking the API for a template only if it has changed since cached
+    """
+    if cached is None or not cached.etag:
+        return {}
+    return {"If-None-Match": cached.etag}
@@ -0,0 +1,128 @@
+"""
+OpenTelemetry tracing for the client. Install it with `pip install notifications-python-client[tracing]`.
+
+    client = NotificationsAPIClient(api_key, hooks=[TracingHook()])
+
+Without opentelemetry-api installed TracingHook does nothing, so it can be left in place in environments which
+don't trace.
+"""
+
+from notifications_python_client import __version__
+from notifications_python_client.hooks import RequestHook
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:
+    propagate = trace = None
+
+_NOTIFICATION_TYPES = {
+    "/v2/notifications/sms": "sms",
+    "/v2/notifications/email": "email",
+    "/v2/notifications/letter": "letter",
+}
+
+
+class TracingHook(RequestHook):
+    """
+    Records a client span for each attempt at a request, and a span around all the page fetches of each iterator.
+
+    Request spans are children of whichever span is current when the request is made, and the trace context is
+    sent in the request headers, using the globally configured propagator.
+    """
+
+    def __init__(self, tracer_provider=None):
+        """
+        :param tracer_provider - TracerProvider to get a tracer from. Defaults to the global one:
+        """
+        self.tracer = trace.get_tracer(__name__, __version__, tracer_provider=tracer_provider) if trace else None
+
+    def before_request(self, event):
+        if self.tracer is None:
+            return
+
+        span = self.tracer.start_span(
+            f"{event.method} {event.endpoint}", kind=trace.SpanKind.CLIENT, attributes=_request_attributes(event)
+        )
+        event.context["span"] = span
+        propagate.inject(event.headers, context=trace.set_span_in_context(span))
+
+    def after_response(self, event):
+        span = event.context.get("span")
+        if span is None:
+            return
+
+        span.set_attribute("http.response.status_code", event.status_code)
+        span.end()
+
+    def on_error(self, event):
+        span = event.context.get("span")
+        if span is None:
+            return
+
+        if event.status_code is not None:
+            span.set_attribute("http.response.status_code", event.status_code)
+        span.set_attribute("error.type", type(event.error).__name__)
+        span.record_exception(event.error)
+        span.set_status(trace.Status(trace.StatusCode.ERROR, str(event.error)))
+        span.end()
+
+    def paginate(self, name, pages):
+        if self.tracer is None:
+            return pages
+        return self._traced_pages(name, pages)
+
+    def paginate_async(self, name, pages):
+        if self.tracer is None:
+            return pages
+        return self._traced_pages_async(name, pages)
+
+    def _traced_pages(self, name, pages):
+        # each page is fetched with the span current, rather than keeping it current across yields, so that it is
+        # the parent of the requests even when pages are prefetched in another thread
+        span = self.tracer.start_span(name)
+        page_count = 0
+        try:
+            while True:
+                with trace.use_span(span):
+                    try:
+                        items = next(pages)
+                    except StopIteration:
+                        return
+                page_count += 1
+                yield items
+        finally:
+            span.set_attribute("notify.pages", page_count)
+            span.end()
+
+    async def _traced_pages_async(self, name, pages):
+        span = self.tracer.start_span(name)
+        page_count = 0
+        try:
+            while True:
+                with trace.use_span(span):
+                    try:
+                        items = await pages.__anext__()
+                    except StopAsyncIteration:
+                        return
+                page_count += 1
+                yield items
+        finally:
+            span.set_attribute("notify.pages", page_count)
+            span.end()
+
+
+def _request_attributes(event):
+    attributes = {
+        "http.request.method": event.method,
+        "url.full": event.url,
+        "notify.endpoint": event.endpoint,
+    }
+    if event.attempt > 1:
+        attributes["http.request.resend_count"] = event.attempt - 1
+
+    notification_type = _NOTIFICATION_TYPES.get(event.endpoint)
+    if notification_type is not None:
+        attributes["notify.notification_type"] = notification_type
+    if isinstance(event.data, dict) and event.data.get("template_id"):
+        attributes["notify.template_id"] = str(event.data["template_id"])
+    return attributes
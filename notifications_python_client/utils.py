@@ -1,19 +1,51 @@
-import base64
+import io
+
+from notifications_python_client.streaming import Base64Stream, remaining_size
 
 DOCUMENT_UPLOAD_SIZE_LIMIT = 2 * 1024 * 1024
 
 
-def prepare_upload(f, filename=None, confirm_email_before_download=None, retention_period=None):
-    contents = f.read()
+def prepare_upload(f, filename=None, confirm_email_before_download=None, retention_period=None, stream=False):
+    """
+    Prepare a file to send by email, as the value of a placeholder in the personalisation.
+
+    Files larger than DOCUMENT_UPLOAD_SIZE_LIMIT are rejected before they are read into memory.
+
+    :param f: file-like object opened in binary mode
+    :param stream: base64 encode the file a chunk at a time while the email is sent, rather than now, so that the
+        whole encoded file is never held in memory. The file must stay open until the email has been sent. The
+        result can be sent in many emails, including at once from several threads
+    """
+    size = remaining_size(f)
+    if size is None:
+        # the size can't be found without reading the file, but there's no need to read past the limit
+        f = io.BytesIO(_read_at_most(f, DOCUMENT_UPLOAD_SIZE_LIMIT + 1))
+        size = len(f.getvalue())
 
-    if len(contents) > DOCUMENT_UPLOAD_SIZE_LIMIT:
+    if size > DOCUMENT_UPLOAD_SIZE_LIMIT:
         raise ValueError("File is larger than 2MB")
 
+    contents = Base64Stream(f, size)
+    if not stream:
+        contents = "".join(chunk.decode("ascii") for chunk in contents)
+
     file_data = {
-        "file": base64.b64encode(contents).decode("ascii"),
+        "file": contents,
         "filename": filename,
         "confirm_email_before_download": confirm_email_before_download,
         "retention_period": retention_period,
     }
 
     return file_data
+
+
+def _read_at_most(f, size):
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = f.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
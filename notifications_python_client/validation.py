@@ -0,0 +1,78 @@
+"""
+Checks notifications against the API's request schemas before they are sent. Install it with
+`pip install notifications-python-client[validation]`, and turn it on when you create the client:
+
+    client = NotificationsAPIClient(api_key, validate_notifications=True)
+
+Each schema is compiled into a validator once per process, so checking a notification costs microseconds rather
+than a request and a share of the service's rate limit. Phone numbers and email addresses are only checked by the
+API, which knows which numbers and addresses it can send to.
+"""
+
+import functools
+import importlib.util
+
+from notifications_python_client.errors import ValidationError
+from notifications_python_client.schemas import (
+    post_email_request,
+    post_letter_request,
+    post_precompiled_letter_request,
+    post_sms_request,
+)
+
+SCHEMAS = {
+    "sms": post_sms_request,
+    "email": post_email_request,
+    "letter": post_letter_request,
+    "precompiled_letter": post_precompiled_letter_request,
+}
+
+
+def validate_notification(notification_type, notification):
+    """
+    :param notification_type: "sms", "email", "letter" or "precompiled_letter"
+    :param notification: request body to send
+    :raises ValidationError: with a message for each way notification does not match the schema, in the same form
+        as the API's 400 responses
+    """
+    errors = [
+        {"error": "ValidationError", "message": _message(error)}
+        for error in _validator(notification_type).iter_errors(notification)
+    ]
+    if errors:
+        raise ValidationError(errors)
+
+
+def jsonschema_installed():
+    return importlib.util.find_spec("jsonschema") is not None
+
+
+# types the client sends as JSON arrays: the json module writes tuples as arrays, and the client turns sets into lists
+ARRAY_TYPES = (list, tuple, set, frozenset)
+
+
+@functools.cache
+def _validator(notification_type):
+    return _validator_class()(SCHEMAS[notification_type])
+
+
+@functools.cache
+def _validator_class():
+    # imported when first needed, as it takes longer to import than the rest of the client
+    from jsonschema import Draft4Validator, validators
+
+    type_checker = Draft4Validator.TYPE_CHECKER.redefine(
+        "array", lambda checker, instance: isinstance(instance, ARRAY_TYPES)
+    )
+    return validators.extend(Draft4Validator, type_checker=type_checker)
+
+
+def _message(error):
+    # worded as the API words its validation errors, for example "template_id is not a valid UUID"
+    if error.validator == "required":
+        message = error.message
+    else:
+        message = error.schema.get("validationMessage", error.message)
+    message = message.replace("'", "")
+    path = ".".join(str(part) for part in error.path)
+    return f"{path} {message}" if path else message
@@ -64,6 +64,14 @@ setup(
         "PyJWT>=1.5.1",
         "docopt>=0.3.0",
     ],
+    extras_require={
+        "async": ["httpx>=0.23.0"],
+        "orjson": ["orjson>=3.6.0"],
+        "ujson": ["ujson>=5.8.0"],
+        "tracing": ["opentelemetry-api>=1.0.0"],
+        "validation": ["jsonschema>=2.5.1"],
+        "parquet": ["pyarrow>=8.0.0"],
+    },
     # for running pytest as `python setup.py test`, see
     # http://doc.pytest.org/en/latest/goodpractices.html#integrating-with-setuptools-python-setup-py-test-pytest-runner
     setup_requires=["pytest-runner"],
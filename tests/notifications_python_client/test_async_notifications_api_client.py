@@ -0,0 +1,275 @@
+import asyncio
+import io
+import json
+from unittest import mock
+
+import httpx
+import pytest
+
+from notifications_python_client.async_notifications import AsyncNotificationsAPIClient
+from notifications_python_client.errors import HTTP503Error, HTTPError, InvalidResponse
+from notifications_python_client.rate_limit import RateLimiter
+from notifications_python_client.retry import RetryPolicy
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+
+def _client(handler, **kwargs):
+    client = AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, **kwargs)
+    client.request_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _run(client, coroutine_function):
+    async def run():
+        async with client:
+            return await coroutine_function(client)
+
+    return asyncio.run(run())
+
+
+def test_send_sms_notification():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(201, json={"id": "1"})
+
+    client = _client(handler)
+    response = _run(client, lambda c: c.send_sms_notification(phone_number="07700 900000", template_id="456"))
+
+    assert response == {"id": "1"}
+    assert requests[0].method == "POST"
+    assert str(requests[0].url) == f"{TEST_HOST}/v2/notifications/sms"
+    assert json.loads(requests[0].content) == {"template_id": "456", "phone_number": "07700 900000"}
+    assert requests[0].headers["Authorization"].startswith("Bearer ")
+    assert requests[0].headers["Content-type"] == "application/json"
+
+
+def test_send_email_notification_shares_payload_building_with_sync_client():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(201, json={})
+
+    client = _client(handler)
+    _run(
+        client,
+        lambda c: c.send_email_notification(
+            email_address="to@example.com", template_id="456", personalisation={"names": {"chris"}}, reference="ref"
+        ),
+    )
+
+    assert json.loads(requests[0].content) == {
+        "template_id": "456",
+        "email_address": "to@example.com",
+        "personalisation": {"names": ["chris"]},
+        "reference": "ref",
+    }
+
+
+def test_get_all_notifications_sends_query_params():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"notifications": []})
+
+    client = _client(handler)
+    _run(client, lambda c: c.get_all_notifications(status="delivered", template_type="sms"))
+
+    assert str(requests[0].url) == f"{TEST_HOST}/v2/notifications?status=delivered&template_type=sms"
+    assert requests[0].content == b""
+
+
+def test_get_all_notifications_iterator_follows_next_links():
+    pages = [
+        {
+            "notifications": [1, 2],
+            "links": {"next": f"{TEST_HOST}/v2/notifications?older_than=79f9c6ce-cd6a-4b47-a3e7-41e155f112b0"},
+        },
+        {
+            "notifications": [3],
+            "links": {"next": f"{TEST_HOST}/v2/notifications?older_than=3e8f2f0a-0f2b-4d1b-8a01-761f14a281bb"},
+        },
+        {"notifications": [], "links": {}},
+    ]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=pages[len(requests) - 1])
+
+    async def collect(client):
+        return [notification async for notification in client.get_all_notifications_iterator()]
+
+    assert _run(_client(handler), collect) == [1, 2, 3]
+    assert requests[1].url.params["older_than"] == "79f9c6ce-cd6a-4b47-a3e7-41e155f112b0"
+
+
+def test_iterators_keep_only_the_fields_asked_for():
+    def handler(request):
+        if request.url.path == "/v2/notifications":
+            notifications = [{"id": "1", "status": "delivered", "body": "Hello"}, {"id": "2", "body": "Hi"}]
+            return httpx.Response(200, json={"notifications": notifications, "links": {}})
+        return httpx.Response(200, json={"received_text_messages": [{"id": "3", "content": "Hi"}], "links": {}})
+
+    async def collect(client):
+        fields = iter(["id", "status"])
+        notifications = [n async for n in client.get_all_notifications_iterator(fields=fields)]
+        received_texts = [r async for r in client.get_received_texts_iterator(fields=["id"])]
+        return notifications, received_texts
+
+    assert _run(_client(handler), collect) == ([{"id": "1", "status": "delivered"}, {"id": "2"}], [{"id": "3"}])
+
+
+def test_get_pdf_for_letter():
+    client = _client(lambda request: httpx.Response(200, content=b"foo"))
+
+    response = _run(client, lambda c: c.get_pdf_for_letter("123"))
+
+    assert isinstance(response, io.BytesIO)
+    assert response.read() == b"foo"
+
+
+def test_no_content_response_returns_none():
+    client = _client(lambda request: httpx.Response(204))
+
+    assert _run(client, lambda c: c.get_notification_by_id("123")) is None
+
+
+@pytest.mark.parametrize(
+    "status_code, error_class",
+    [
+        (400, HTTPError),
+        (503, HTTP503Error),
+    ],
+)
+def test_http_errors_are_mapped_to_api_errors(status_code, error_class):
+    client = _client(lambda request: httpx.Response(status_code, json={"errors": "Bad thing"}))
+
+    with pytest.raises(error_class) as e:
+        _run(client, lambda c: c.get_notification_by_id("123"))
+
+    assert e.value.status_code == status_code
+    assert e.value.message == "Bad thing"
+    assert isinstance(e.value.__cause__, httpx.HTTPStatusError)
+
+
+def test_connection_error_raises_api_error():
+    def handler(request):
+        raise httpx.ConnectError("connection refused")
+
+    with pytest.raises(HTTP503Error) as e:
+        _run(_client(handler), lambda c: c.get_notification_by_id("123"))
+
+    assert str(e.value) == "503 - Request failed"
+
+
+def test_invalid_json_raises_invalid_response():
+    client = _client(lambda request: httpx.Response(200, text="Internal Error"))
+
+    with pytest.raises(InvalidResponse) as e:
+        _run(client, lambda c: c.get_notification_by_id("123"))
+
+    assert str(e.value) == "200 - No JSON response object could be decoded"
+
+
+def test_max_concurrency_limits_requests_in_flight():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(201, json={})
+
+    async def send_many(client):
+        return await asyncio.gather(
+            *(client.send_sms_notification(phone_number="07700 900000", template_id="456") for _ in range(10))
+        )
+
+    responses = _run(_client(handler, max_concurrency=3), send_many)
+
+    assert len(responses) == 10
+    assert max_in_flight == 3
+
+
+def test_pool_limits_are_configurable():
+    client = AsyncNotificationsAPIClient(
+        base_url=TEST_HOST, api_key=COMBINED_API_KEY, max_connections=5, max_keepalive_connections=2
+    )
+
+    assert client.limits.max_connections == 5
+    assert client.limits.max_keepalive_connections == 2
+    asyncio.run(client.aclose())
+
+
+def test_keep_alive_can_be_disabled():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={})
+
+    client = AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, keep_alive=False)
+    # keep the session's headers, only replacing how requests are sent
+    client.request_session._transport = httpx.MockTransport(handler)
+
+    _run(client, lambda c: c.get_notification_by_id("1"))
+
+    assert requests[0].headers["Connection"] == "close"
+    assert client.limits.max_keepalive_connections == 0
+
+
+@pytest.mark.parametrize("argument", ["pool_connections", "pool_maxsize", "pool_block"])
+def test_requests_pool_arguments_are_rejected(argument):
+    with pytest.raises(TypeError) as e:
+        AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, **{argument: 5})
+
+    assert str(e.value) == (
+        f"AsyncNotificationsAPIClient does not take {argument}: "
+        "size its pool with max_connections and max_keepalive_connections"
+    )
+
+
+def test_failed_requests_are_retried_by_retry_policy(mocker):
+    mock_sleep = mocker.patch("notifications_python_client.async_base.asyncio.sleep")
+    responses = [httpx.Response(503), httpx.Response(200, json={"id": "1"})]
+    policy = RetryPolicy()
+
+    client = _client(lambda request: responses.pop(0), retry_policy=policy)
+
+    assert _run(client, lambda c: c.get_notification_by_id("1")) == {"id": "1"}
+    assert mock_sleep.call_count == 1
+    assert policy.retries == 1
+
+
+def test_requests_wait_for_rate_limiter():
+    rate_limiter = RateLimiter(rate=1000)
+    rate_limiter.acquire_async = mock.AsyncMock()
+    client = _client(lambda request: httpx.Response(201, json={}), rate_limiter=rate_limiter)
+
+    _run(client, lambda c: c.send_sms_notification(phone_number="07700 900000", template_id="456"))
+
+    rate_limiter.acquire_async.assert_awaited_once_with()
+
+
+def test_send_precompiled_letter_notification_streams_file():
+    requests = []
+
+    async def handler(request):
+        requests.append((request, await request.aread()))
+        return httpx.Response(201, json={})
+
+    client = _client(handler)
+    with open("tests/test_files/test.pdf", "rb") as f:
+        _run(client, lambda c: c.send_precompiled_letter_notification(reference="Baz", pdf_file=f))
+
+    request, body = requests[0]
+    assert json.loads(body) == {"reference": "Baz", "content": "JVBERi0xLjUgdGVzdAo="}
+    assert request.headers["Content-Length"] == str(len(body))
+    assert "Transfer-Encoding" not in request.headers
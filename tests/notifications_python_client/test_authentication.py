@@ -1,4 +1,7 @@
 import calendar
+import hashlib
+import hmac
+import json
 import time
 from unittest import mock
 
@@ -7,6 +10,8 @@ import pytest
 from freezegun import freeze_time
 
 from notifications_python_client.authentication import (
+    ReplayCache,
+    TokenVerifier,
     create_jwt_token,
     decode_jwt_token,
     get_token_issuer,
@@ -19,6 +24,7 @@ from notifications_python_client.errors import (
     TokenExpiredError,
     TokenIssuedAtError,
     TokenIssuerError,
+    TokenReplayError,
 )
 
 
@@ -195,3 +201,172 @@ def test_should_return_issuer_from_token():
     issuer = get_token_issuer(token)
 
     assert issuer == "client_id"
+
+
+def _token(payload, key="key", alg="HS256", **headers):
+    return jwt.encode(payload=payload, key=key, headers={"typ": "JWT", "alg": alg, **headers})
+
+
+def _token_with_header(header, payload, key="key"):
+    # for headers jwt.encode refuses to write
+    signing_input = b".".join(jwt.utils.base64url_encode(json.dumps(part).encode()) for part in (header, payload))
+    signature = hmac.new(key.encode(), signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + jwt.utils.base64url_encode(signature)).decode()
+
+
+def _decode_with_issuer_lookup(token, secrets):
+    return decode_jwt_token(token, secrets[get_token_issuer(token)])
+
+
+@freeze_time("2001-01-01T12:00:00")
+@pytest.mark.parametrize(
+    "token, expected_error",
+    [
+        (lambda: create_jwt_token("key", "client_id"), None),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "nbf": 978350430, "exp": 978350371}), None),
+        (lambda: create_jwt_token("wrong key", "client_id"), TokenDecodeError),
+        (lambda: _token({"iat": 978350400}), TokenIssuerError),
+        (lambda: _token({"iss": "client_id"}), TokenIssuedAtError),
+        (lambda: _token({"iss": "client_id", "iat": 978350369}), TokenExpiredError),
+        (lambda: _token({"iss": "client_id", "iat": 978350431}), TokenExpiredError),
+        (lambda: _token({"iss": "client_id", "iat": "not a time"}), TokenExpiredError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "nbf": 978350431}), TokenExpiredError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "nbf": "soon"}), TokenDecodeError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "exp": 978350370}), TokenError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "exp": "never"}), TokenDecodeError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "sub": 1}), TokenError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400}, alg="HS512"), TokenAlgorithmError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "aud": "someone else"}), TokenError),
+        (lambda: _token({"iss": "client_id", "iat": 978350400, "aud": ""}), None),
+        (lambda: _token({"iss": "client_id", "iat": 978350400}, crit=["exp"]), TokenError),
+        (
+            lambda: _token_with_header(
+                {"alg": "HS256", "b64": True, "crit": ["b64"]}, {"iss": "client_id", "iat": 978350400}
+            ),
+            None,
+        ),
+        (lambda: _token_with_header({"alg": "HS256", "kid": 1}, {"iss": "client_id", "iat": 978350400}), TokenError),
+        (lambda: "token", TokenDecodeError),
+        (lambda: "a.b.c", TokenDecodeError),
+        (lambda: create_jwt_token("key", "client_id")[:-2], TokenDecodeError),
+    ],
+)
+def test_token_verifier_accepts_and_rejects_the_same_tokens_as_decode_jwt_token(token, expected_error):
+    token = token()
+    secrets = {"client_id": "key"}
+    verifier = TokenVerifier(secrets)
+
+    if expected_error is None:
+        assert _decode_with_issuer_lookup(token, secrets)
+        assert verifier.verify(token)["iss"] == "client_id"
+    else:
+        with pytest.raises(TokenError) as decode_error:
+            _decode_with_issuer_lookup(token, secrets)
+        with pytest.raises(TokenError) as verify_error:
+            verifier.verify(token)
+        assert type(decode_error.value) is type(verify_error.value) is expected_error
+        assert verify_error.value.message == decode_error.value.message
+
+
+@freeze_time("2001-01-01T12:00:00")
+def test_token_verifier_error_has_the_token_claims():
+    token = _token({"iss": "client_id", "iat": 978350300})
+
+    with pytest.raises(TokenExpiredError) as e:
+        TokenVerifier({"client_id": "key"}).verify(token)
+
+    assert e.value.token == {"iss": "client_id", "iat": 978350300}
+
+
+def test_token_verifier_accepts_any_of_an_issuers_secrets():
+    verifier = TokenVerifier({"client_id": ["old key", "new key"], "other_client": "other key"})
+
+    assert verifier.verify(create_jwt_token("old key", "client_id"))
+    assert verifier.verify(create_jwt_token("new key", "client_id"))
+    with pytest.raises(TokenDecodeError):
+        verifier.verify(create_jwt_token("other key", "client_id"))
+
+
+def test_token_verifier_rejects_unknown_issuers():
+    verifier = TokenVerifier({"client_id": "key"})
+    verifier.set_secrets("client_id", [])
+
+    with pytest.raises(TokenDecodeError):
+        verifier.verify(create_jwt_token("key", "client_id"))
+
+
+@freeze_time("2001-01-01T12:00:00")
+@pytest.mark.parametrize(
+    "verify",
+    [
+        lambda token, replay_cache: decode_jwt_token(token, "key", replay_cache=replay_cache),
+        lambda token, replay_cache: TokenVerifier({"client_id": "key"}, replay_cache=replay_cache).verify(token),
+    ],
+)
+def test_replay_cache_rejects_tokens_used_again(verify):
+    replay_cache = ReplayCache()
+    token = create_jwt_token("key", "client_id")
+    other_token = _token({"iss": "client_id", "iat": 978350400, "jti": "other"})
+
+    assert verify(token, replay_cache)
+    assert verify(other_token, replay_cache)
+    with pytest.raises(TokenReplayError) as e:
+        verify(token, replay_cache)
+
+    assert "Invalid token: it has already been used. See our requirements" in e.value.message
+    assert e.value.token["iss"] == "client_id"
+
+
+def test_replay_cache_rejects_other_encodings_of_the_same_signature():
+    replay_cache = ReplayCache()
+    token = create_jwt_token("key", "client_id")
+    # the last character of a 32 byte signature carries 2 bits which are ignored when it is decoded
+    last = token[-1]
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    reencoded = token[:-1] + alphabet[alphabet.index(last) ^ 1]
+
+    verifier = TokenVerifier({"client_id": "key"}, replay_cache=replay_cache)
+
+    verifier.verify(token)
+    with pytest.raises(TokenReplayError):
+        verifier.verify(reencoded)
+
+
+def test_replay_cache_does_not_remember_rejected_tokens():
+    replay_cache = ReplayCache()
+    token = create_jwt_token("key", "client_id")
+
+    with pytest.raises(TokenDecodeError):
+        decode_jwt_token(token, "wrong key", replay_cache=replay_cache)
+
+    assert len(replay_cache) == 0
+
+
+def test_replay_cache_forgets_signatures_once_their_tokens_have_expired():
+    replay_cache = ReplayCache()
+    with freeze_time("2001-01-01T12:00:00"):
+        replay_cache.check(b"first", {"iat": 978350400})
+        replay_cache.check(b"future", {"iat": 978350430})
+    with freeze_time("2001-01-01T12:00:30"):
+        replay_cache.check(b"second", {"iat": 978350430})
+        assert len(replay_cache) == 3
+    with freeze_time("2001-01-01T12:00:31"):
+        replay_cache.check(b"third", {"iat": 978350431})
+        assert len(replay_cache) == 3
+        with pytest.raises(TokenReplayError):
+            replay_cache.check(b"future", {"iat": 978350430})
+
+
+@freeze_time("2001-01-01T12:00:00")
+def test_replay_cache_evicts_signatures_with_the_oldest_iat_when_full():
+    replay_cache = ReplayCache(maxsize=2)
+
+    replay_cache.check(b"new", {"iat": 978350410})
+    replay_cache.check(b"old", {"iat": 978350390})
+    replay_cache.check(b"newer", {"iat": 978350420})
+
+    assert len(replay_cache) == 2
+    assert replay_cache.evictions == 1
+    replay_cache.check(b"old", {"iat": 978350390})
+    with pytest.raises(TokenReplayError):
+        replay_cache.check(b"newer", {"iat": 978350420})
@@ -1,12 +1,17 @@
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import pytest
 import requests
+from freezegun import freeze_time
 
 from notifications_python_client.base import BaseAPIClient
-from notifications_python_client.errors import HTTPError, InvalidResponse
-from tests.conftest import API_KEY_ID, COMBINED_API_KEY, SERVICE_ID
+from notifications_python_client.errors import HTTP503Error, HTTPError, InvalidResponse
+from notifications_python_client.rate_limit import RateLimiter
+from notifications_python_client.retry import RetryPolicy
+from tests.conftest import API_KEY_ID, COMBINED_API_KEY, SERVICE_ID, TEST_HOST
 
 
 @pytest.mark.parametrize(
@@ -116,3 +121,197 @@ def test_converts_extended_types_to_json(base_client, rmock, data, expected_json
     )
 
     base_client.request("GET", "/", data=data)
+
+
+def test_jwt_token_is_reused_within_lifetime(base_client, rmock):
+    rmock.request("GET", "http://test-host/", json={}, status_code=200)
+
+    with mock.patch("notifications_python_client.base.create_jwt_token", return_value="token") as mock_create_token:
+        with freeze_time("2001-01-01T12:00:00"):
+            base_client.request("GET", "/")
+        with freeze_time("2001-01-01T12:00:09"):
+            base_client.request("GET", "/")
+
+    mock_create_token.assert_called_once_with(API_KEY_ID, SERVICE_ID)
+    assert rmock.last_request.headers["Authorization"] == "Bearer token"
+
+
+def test_jwt_token_is_recreated_once_lifetime_has_passed(base_client, rmock):
+    rmock.request("GET", "http://test-host/", json={}, status_code=200)
+
+    with mock.patch("notifications_python_client.base.create_jwt_token", side_effect=["first", "second"]):
+        with freeze_time("2001-01-01T12:00:00"):
+            base_client.request("GET", "/")
+        with freeze_time("2001-01-01T12:00:10"):
+            base_client.request("GET", "/")
+
+    assert rmock.last_request.headers["Authorization"] == "Bearer second"
+
+
+def test_jwt_token_is_recreated_if_clock_goes_backwards(base_client):
+    with mock.patch("notifications_python_client.base.create_jwt_token", side_effect=["first", "second"]):
+        with freeze_time("2001-01-01T12:00:05"):
+            assert base_client._get_api_token() == "first"
+        with freeze_time("2001-01-01T12:00:00"):
+            assert base_client._get_api_token() == "second"
+
+
+def test_jwt_token_cache_can_be_disabled(rmock):
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, jwt_token_lifetime=0)
+    rmock.request("GET", "http://test-host/", json={}, status_code=200)
+
+    with mock.patch("notifications_python_client.base.create_jwt_token") as mock_create_token:
+        client.request("GET", "/")
+        client.request("GET", "/")
+
+    assert mock_create_token.call_count == 2
+
+
+@pytest.mark.parametrize("lifetime", [-1, 30])
+def test_jwt_token_lifetime_must_be_inside_accepted_bound(lifetime):
+    with pytest.raises(AssertionError) as err:
+        BaseAPIClient(api_key=COMBINED_API_KEY, jwt_token_lifetime=lifetime)
+    assert str(err.value) == "jwt_token_lifetime must be between 0 and 29"
+
+
+def test_jwt_token_is_created_once_when_shared_between_threads(base_client):
+    barrier = threading.Barrier(8)
+
+    def get_token():
+        barrier.wait()
+        return base_client._get_api_token()
+
+    with mock.patch("notifications_python_client.base.create_jwt_token", return_value="token") as mock_create_token:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda _: get_token(), range(8)))
+
+    assert tokens == ["token"] * 8
+    mock_create_token.assert_called_once_with(API_KEY_ID, SERVICE_ID)
+
+
+def test_default_connection_pool(base_client):
+    adapter = base_client.request_session.get_adapter("https://api.notifications.service.gov.uk")
+
+    assert adapter._pool_connections == 10
+    assert adapter._pool_maxsize == 10
+    assert adapter._pool_block is False
+
+
+@pytest.mark.parametrize("url", ["https://api.notifications.service.gov.uk", "http://test-host"])
+def test_connection_pool_is_configurable(url):
+    client = BaseAPIClient(api_key=COMBINED_API_KEY, pool_connections=2, pool_maxsize=50, pool_block=True)
+
+    adapter = client.request_session.get_adapter(url)
+
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 50
+    assert adapter._pool_block is True
+
+
+@pytest.mark.parametrize("keep_alive, expected_header", [(True, "keep-alive"), (False, "close")])
+def test_keep_alive_can_be_disabled(rmock, keep_alive, expected_header):
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, keep_alive=keep_alive)
+    rmock.request("GET", "http://test-host/", json={}, status_code=200)
+
+    client.request("GET", "/")
+
+    assert rmock.last_request.headers["Connection"] == expected_header
+
+
+def test_cookies_are_not_stored_between_requests(base_client, rmock):
+    rmock.request("GET", "http://test-host/", json={}, status_code=200, headers={"Set-Cookie": "AWSALB=abc; Path=/"})
+
+    base_client.request("GET", "/")
+    base_client.request("GET", "/")
+
+    assert len(base_client.request_session.cookies) == 0
+    assert "Cookie" not in rmock.last_request.headers
+
+
+def test_client_can_be_shared_between_threads(base_client, rmock):
+    rmock.request(
+        "GET", re.compile("http://test-host/"), json=lambda request, context: {"path": request.path}, status_code=200
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda i: base_client.request("GET", f"/{i}"), range(100)))
+
+    assert responses == [{"path": f"/{i}"} for i in range(100)]
+
+
+def test_requests_are_not_retried_by_default(base_client, rmock):
+    rmock.request("GET", "http://test-host/", [{"status_code": 503}, {"json": {}, "status_code": 200}])
+
+    with pytest.raises(HTTP503Error):
+        base_client.request("GET", "/")
+
+    assert rmock.call_count == 1
+
+
+def test_failed_requests_are_retried_by_retry_policy(rmock):
+    policy = RetryPolicy(max_attempts=3)
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, retry_policy=policy)
+    rmock.request(
+        "GET", "http://test-host/", [{"status_code": 503}, {"status_code": 429}, {"json": {"a": 1}, "status_code": 200}]
+    )
+
+    with mock.patch("notifications_python_client.base.time.sleep") as mock_sleep:
+        assert client.request("GET", "/") == {"a": 1}
+
+    assert rmock.call_count == 3
+    assert mock_sleep.call_count == 2
+    assert policy.retries == 2
+
+
+def test_retry_policy_gives_up_and_raises_last_error(rmock):
+    policy = RetryPolicy(max_attempts=2)
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, retry_policy=policy)
+    rmock.request("GET", "http://test-host/", json={"errors": "Down"}, status_code=503)
+
+    with mock.patch("notifications_python_client.base.time.sleep"), pytest.raises(HTTP503Error) as e:
+        client.request("GET", "/")
+
+    assert e.value.message == "Down"
+    assert rmock.call_count == 2
+    assert policy.give_ups == 1
+
+
+def test_retried_requests_are_sent_with_a_fresh_token(rmock):
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, retry_policy=RetryPolicy())
+    rmock.request("GET", "http://test-host/", [{"status_code": 503}, {"json": {}, "status_code": 200}])
+
+    with (
+        mock.patch("notifications_python_client.base.create_jwt_token", side_effect=["first", "second"]),
+        mock.patch("notifications_python_client.base.time.sleep", side_effect=lambda delay: None),
+        mock.patch("notifications_python_client.base.epoch_seconds", side_effect=[1000, 1020]),
+    ):
+        client.request("GET", "/")
+
+    assert [request.headers["Authorization"] for request in rmock.request_history] == [
+        "Bearer first",
+        "Bearer second",
+    ]
+
+
+def test_requests_wait_for_rate_limiter(rmock):
+    rate_limiter = mock.Mock(spec=RateLimiter)
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, rate_limiter=rate_limiter)
+    rmock.request("GET", "http://test-host/", json={}, status_code=200)
+
+    client.request("GET", "/")
+    client.request("GET", "/")
+
+    assert rate_limiter.acquire.call_count == 2
+
+
+def test_each_retry_waits_for_rate_limiter(rmock):
+    rate_limiter = mock.Mock(spec=RateLimiter)
+    client = BaseAPIClient(
+        base_url=TEST_HOST, api_key=COMBINED_API_KEY, rate_limiter=rate_limiter, retry_policy=RetryPolicy()
+    )
+    rmock.request("GET", "http://test-host/", [{"status_code": 429}, {"json": {}, "status_code": 200}])
+
+    with mock.patch("notifications_python_client.base.time.sleep"):
+        client.request("GET", "/")
+
+    assert rate_limiter.acquire.call_count == 2
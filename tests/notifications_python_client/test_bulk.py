@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from notifications_python_client.bulk import bounded_map
+from notifications_python_client.errors import APIError, HTTPError
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_bounded_map_yields_results_in_order(max_workers):
+    def slow_for_small_numbers(item):
+        time.sleep((10 - item) / 1000)
+        return item * 2
+
+    results = list(bounded_map(slow_for_small_numbers, range(10), max_workers=max_workers))
+
+    assert results == [(i, i * 2) for i in range(10)]
+
+
+def test_bounded_map_yields_all_results_unordered():
+    results = list(bounded_map(lambda item: item * 2, range(10), max_workers=4, ordered=False))
+
+    assert sorted(results) == [(i, i * 2) for i in range(10)]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_bounded_map_yields_api_errors_as_results(ordered):
+    error = HTTPError(message="oh no")
+
+    def fail_on_odd_numbers(item):
+        if item % 2:
+            raise error
+        return item
+
+    results = dict(bounded_map(fail_on_odd_numbers, range(4), max_workers=2, ordered=ordered))
+
+    assert results == {0: 0, 1: error, 2: 2, 3: error}
+    assert isinstance(results[1], APIError)
+
+
+def test_bounded_map_raises_other_exceptions():
+    def fail(item):
+        raise KeyError(item)
+
+    with pytest.raises(KeyError):
+        list(bounded_map(fail, range(4), max_workers=2))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_bounded_map_reads_items_lazily(ordered):
+    consumed = 0
+
+    def items():
+        nonlocal consumed
+        for i in range(1000):
+            consumed += 1
+            yield i
+
+    results = bounded_map(lambda item: item, items(), max_workers=2, ordered=ordered)
+    next(results)
+
+    assert consumed <= 5
+    results.close()
+
+
+def test_bounded_map_stops_calling_func_when_closed():
+    calls = []
+    started = threading.Event()
+
+    def func(item):
+        calls.append(item)
+        started.set()
+        time.sleep(0.01)
+        return item
+
+    results = bounded_map(func, range(1000), max_workers=1)
+    next(results)
+    started.wait()
+    results.close()
+
+    assert len(calls) <= 3
@@ -0,0 +1,177 @@
+import json
+
+import pytest
+
+from notifications_python_client.errors import HTTPError
+from notifications_python_client.export import export_notifications
+from tests.conftest import TEST_HOST
+
+NOTIFICATIONS_URL = f"{TEST_HOST}/v2/notifications"
+
+
+def _page(ids, next_older_than=None):
+    links = {"current": "/v2/notifications"}
+    if next_older_than:
+        links["next"] = f"/v2/notifications?older_than={next_older_than}"
+    return {
+        "notifications": [
+            {"id": id, "status": "delivered", "template": {"id": "t", "version": 1, "uri": "u"}} for id in ids
+        ],
+        "links": links,
+    }
+
+
+@pytest.fixture
+def pages(rmock):
+    responses = {
+        None: _page(["1", "2"], "2"),
+        "2": _page(["3", "4"], "4"),
+        "4": _page(["5"]),
+    }
+
+    def respond(request, context):
+        return responses[request.qs.get("older_than", [None])[0]]
+
+    rmock.request("GET", NOTIFICATIONS_URL, json=respond)
+    return responses
+
+
+def _exported_ids(path):
+    with open(path) as exported:
+        return [json.loads(line)["id"] for line in exported]
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 1])
+def test_export_writes_every_notification(notifications_client, pages, rmock, tmp_path, prefetch_pages):
+    path = str(tmp_path / "notifications.jsonl")
+
+    result = export_notifications(notifications_client, path, status="delivered", prefetch_pages=prefetch_pages)
+
+    assert result == {"exported": 5, "resumed": False, "checkpoint": f"{path}.checkpoint.json"}
+    assert _exported_ids(path) == ["1", "2", "3", "4", "5"]
+    assert rmock.request_history[0].qs == {"status": ["delivered"]}
+
+
+def test_export_resumes_from_last_checkpoint(notifications_client, pages, rmock, tmp_path):
+    path = str(tmp_path / "notifications.jsonl")
+    rmock.request(
+        "GET", NOTIFICATIONS_URL, [{"json": pages[None]}, {"json": pages["2"]}, {"status_code": 500, "json": {}}]
+    )
+
+    with pytest.raises(HTTPError):
+        export_notifications(notifications_client, path, checkpoint_pages=1)
+    with open(f"{path}.checkpoint.json") as checkpoint_file:
+        assert json.load(checkpoint_file)["older_than"] == "4"
+
+    rmock.request("GET", NOTIFICATIONS_URL, json=pages["4"])
+    result = export_notifications(notifications_client, path, checkpoint_pages=1)
+
+    assert result["exported"] == 5
+    assert result["resumed"] is True
+    assert rmock.last_request.qs == {"older_than": ["4"]}
+    assert _exported_ids(path) == ["1", "2", "3", "4", "5"]
+
+
+def test_export_discards_notifications_written_after_the_checkpoint(notifications_client, pages, rmock, tmp_path):
+    path = str(tmp_path / "notifications.jsonl")
+    rmock.request(
+        "GET", NOTIFICATIONS_URL, [{"json": pages[None]}, {"json": pages["2"]}, {"status_code": 500, "json": {}}]
+    )
+
+    with pytest.raises(HTTPError):
+        export_notifications(notifications_client, path, checkpoint_pages=3)
+    assert _exported_ids(path) == ["1", "2", "3", "4"]
+
+    rmock.request("GET", NOTIFICATIONS_URL, [{"json": pages[None]}, {"json": pages["2"]}, {"json": pages["4"]}])
+    export_notifications(notifications_client, path, checkpoint_pages=3)
+
+    assert _exported_ids(path) == ["1", "2", "3", "4", "5"]
+
+
+def test_completed_export_is_not_repeated(notifications_client, pages, rmock, tmp_path):
+    path = str(tmp_path / "notifications.jsonl")
+    export_notifications(notifications_client, path)
+
+    assert export_notifications(notifications_client, path)["exported"] == 5
+    assert rmock.call_count == 3
+
+
+def test_export_refuses_checkpoint_of_a_different_export(notifications_client, pages, tmp_path):
+    path = str(tmp_path / "notifications.jsonl")
+    export_notifications(notifications_client, path, status="delivered")
+
+    with pytest.raises(ValueError) as e:
+        export_notifications(notifications_client, path, status="failed")
+
+    assert "checkpoint of a different export" in str(e.value)
+
+
+def test_export_of_some_fields(notifications_client, pages, rmock, tmp_path):
+    path = str(tmp_path / "notifications.jsonl")
+    rmock.request(
+        "GET", NOTIFICATIONS_URL, [{"json": pages[None]}, {"json": pages["2"]}, {"status_code": 500, "json": {}}]
+    )
+
+    with pytest.raises(HTTPError):
+        export_notifications(notifications_client, path, checkpoint_pages=1, fields=["id", "status"])
+    rmock.request("GET", NOTIFICATIONS_URL, json=pages["4"])
+    export_notifications(notifications_client, path, checkpoint_pages=1, fields=("id", "status"))
+
+    with open(path) as exported:
+        assert [json.loads(line) for line in exported] == [{"id": id, "status": "delivered"} for id in "12345"]
+
+
+def test_export_refuses_checkpoint_with_different_fields(notifications_client, pages, tmp_path):
+    path = str(tmp_path / "notifications.jsonl")
+    export_notifications(notifications_client, path, fields=["id"])
+
+    with pytest.raises(ValueError):
+        export_notifications(notifications_client, path)
+
+
+def test_export_resumes_from_checkpoint_without_fields(notifications_client, pages, tmp_path):
+    path = str(tmp_path / "notifications.jsonl")
+    export_notifications(notifications_client, path)
+    checkpoint_path = f"{path}.checkpoint.json"
+    with open(checkpoint_path) as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    del checkpoint["fields"]
+    with open(checkpoint_path, "w") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+
+    assert export_notifications(notifications_client, path)["resumed"] is True
+
+
+def test_export_to_parquet_of_some_fields(notifications_client, pages, tmp_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "notifications")
+
+    export_notifications(notifications_client, path, format="parquet", fields=["id", "template"])
+
+    rows = pyarrow_parquet.read_table(path).to_pylist()
+    assert (rows[0]["template_id"], rows[0]["status"], rows[0]["other"]) == ("t", None, None)
+
+
+def test_export_to_parquet(notifications_client, pages, tmp_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "notifications")
+    pages["4"]["notifications"][0]["new_field"] = [1, 2]
+
+    export_notifications(notifications_client, path, format="parquet", checkpoint_pages=2)
+
+    rows = pyarrow_parquet.read_table(path).to_pylist()
+    assert sorted(row["id"] for row in rows) == ["1", "2", "3", "4", "5"]
+    assert rows[0]["template_version"] == 1
+    assert rows[0]["other"] is None
+    assert [json.loads(row["other"]) for row in rows if row["other"]] == [{"new_field": [1, 2]}]
+    assert sorted(path.name for path in (tmp_path / "notifications").iterdir()) == [
+        "part-00000.parquet",
+        "part-00001.parquet",
+    ]
+
+
+def test_export_to_parquet_needs_pyarrow(notifications_client, tmp_path, mocker):
+    mocker.patch("notifications_python_client.export.pyarrow", None)
+
+    with pytest.raises(ImportError):
+        export_notifications(notifications_client, str(tmp_path / "notifications"), format="parquet")
@@ -0,0 +1,221 @@
+import asyncio
+import json
+from unittest import mock
+
+import httpx
+import pytest
+import requests
+
+from notifications_python_client.async_notifications import AsyncNotificationsAPIClient
+from notifications_python_client.base import BaseAPIClient
+from notifications_python_client.errors import HTTP503Error, HTTPError
+from notifications_python_client.hooks import RequestEvent, RequestHook, endpoint_template
+from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.retry import RetryPolicy
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+NOTIFICATION_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+
+
+class RecordingHook(RequestHook):
+    def __init__(self):
+        self.calls = []
+
+    def before_request(self, event):
+        self.calls.append(("before_request", event))
+
+    def after_response(self, event):
+        self.calls.append(("after_response", event))
+
+    def on_error(self, event):
+        self.calls.append(("on_error", event))
+
+    def on_retry(self, event):
+        self.calls.append(("on_retry", event))
+
+    @property
+    def names(self):
+        return [name for name, _ in self.calls]
+
+
+@pytest.fixture
+def hook():
+    return RecordingHook()
+
+
+@pytest.fixture
+def client(hook):
+    return NotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[hook])
+
+
+@pytest.mark.parametrize(
+    "path, expected_endpoint",
+    [
+        ("/v2/notifications", "/v2/notifications"),
+        (f"/v2/notifications/{NOTIFICATION_ID}", "/v2/notifications/{id}"),
+        (f"/v2/notifications/{NOTIFICATION_ID}/pdf", "/v2/notifications/{id}/pdf"),
+        (f"/v2/template/{NOTIFICATION_ID.upper()}/version/3", "/v2/template/{id}/version/{number}"),
+        ("/v2/notifications/sms", "/v2/notifications/sms"),
+        ("/v2/template/12ab", "/v2/template/12ab"),
+    ],
+)
+def test_endpoint_template(path, expected_endpoint):
+    assert endpoint_template(path) == expected_endpoint
+
+
+def test_successful_request_calls_before_request_and_after_response(client, hook, rmock):
+    rmock.request("POST", "http://test-host/v2/notifications/sms", json={"id": "1"}, status_code=201)
+
+    client.send_sms_notification(phone_number="07700 900000", template_id="456")
+
+    assert hook.names == ["before_request", "after_response"]
+    event = hook.calls[0][1]
+    assert hook.calls[1][1] is event
+    assert event.method == "POST"
+    assert event.url == "http://test-host/v2/notifications/sms"
+    assert event.endpoint == "/v2/notifications/sms"
+    assert event.attempt == 1
+    assert event.data == {"phone_number": "07700 900000", "template_id": "456"}
+    assert event.status_code == 201
+    assert event.bytes_sent == len(rmock.last_request.body)
+    assert event.bytes_received == len(b'{"id": "1"}')
+    assert event.elapsed >= 0
+    assert event.time_to_first_byte >= 0
+    assert event.error is None
+
+
+def test_event_endpoint_leaves_out_ids_and_query_string(client, hook, rmock):
+    rmock.request("GET", f"http://test-host/v2/notifications/{NOTIFICATION_ID}", json={})
+    rmock.request("GET", "http://test-host/v2/notifications", json={"notifications": []})
+
+    client.get_notification_by_id(NOTIFICATION_ID)
+    client.get_all_notifications(status="delivered")
+
+    assert [event.endpoint for name, event in hook.calls if name == "after_response"] == [
+        "/v2/notifications/{id}",
+        "/v2/notifications",
+    ]
+    assert hook.calls[-1][1].bytes_sent == 0
+
+
+def test_hooks_can_add_headers(rmock):
+    class HeaderHook(RequestHook):
+        def before_request(self, event):
+            event.headers["traceparent"] = "00-1-2-01"
+
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[HeaderHook()])
+    rmock.request("GET", "http://test-host/", json={})
+
+    client.get("/")
+
+    assert rmock.last_request.headers["traceparent"] == "00-1-2-01"
+
+
+def test_error_response_calls_on_error(client, hook, rmock):
+    rmock.request("GET", "http://test-host/v2/notifications", json={"errors": "Not found"}, status_code=404)
+
+    with pytest.raises(HTTPError) as e:
+        client.get_all_notifications()
+
+    assert hook.names == ["before_request", "on_error"]
+    event = hook.calls[1][1]
+    assert event.status_code == 404
+    assert event.error is e.value
+    assert event.bytes_received > 0
+
+
+def test_connection_error_calls_on_error_without_status_code(client, hook, rmock):
+    rmock.request("GET", "http://test-host/v2/notifications", exc=requests.exceptions.ConnectionError)
+
+    with pytest.raises(HTTP503Error):
+        client.get_all_notifications()
+
+    event = hook.calls[1][1]
+    assert event.status_code is None
+    assert event.bytes_received is None
+    assert event.error.status_code == 503
+
+
+def test_retries_call_on_retry_and_send_an_event_for_each_attempt(hook, rmock):
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[hook], retry_policy=RetryPolicy())
+    rmock.request("GET", "http://test-host/", [{"status_code": 503}, {"json": {}, "status_code": 200}])
+
+    with mock.patch("notifications_python_client.base.time.sleep"):
+        client.get("/")
+
+    assert hook.names == ["before_request", "on_error", "on_retry", "before_request", "after_response"]
+    first, second = hook.calls[0][1], hook.calls[3][1]
+    assert first is not second
+    assert (first.attempt, second.attempt) == (1, 2)
+    assert first.retry_delay is not None
+    assert first.headers["Authorization"] == rmock.request_history[0].headers["Authorization"]
+
+
+def test_get_pdf_for_letter_calls_hooks(client, hook, rmock):
+    rmock.request("GET", f"http://test-host/v2/notifications/{NOTIFICATION_ID}/pdf", content=b"%PDF")
+
+    client.get_pdf_for_letter(NOTIFICATION_ID)
+
+    assert hook.names == ["before_request", "after_response"]
+    assert hook.calls[1][1].endpoint == "/v2/notifications/{id}/pdf"
+    assert hook.calls[1][1].bytes_received == 4
+
+
+def test_hook_exceptions_are_logged_and_do_not_stop_the_request(hook, rmock, caplog):
+    class BrokenHook(RequestHook):
+        def before_request(self, event):
+            raise RuntimeError("exporter down")
+
+    client = BaseAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[BrokenHook(), hook])
+    rmock.request("GET", "http://test-host/", json={"a": 1})
+
+    assert client.get("/") == {"a": 1}
+    assert hook.names == ["before_request", "after_response"]
+    assert "failed in before_request" in caplog.text
+
+
+def test_events_are_not_created_without_hooks(base_client, rmock):
+    rmock.request("GET", "http://test-host/", json={})
+
+    with mock.patch("notifications_python_client.base.RequestEvent") as mock_event:
+        base_client.get("/")
+
+    mock_event.assert_not_called()
+
+
+def test_add_hook(base_client, hook, rmock):
+    rmock.request("GET", "http://test-host/", json={})
+
+    base_client.get("/")
+    base_client.add_hook(hook)
+    base_client.get("/")
+
+    assert hook.names == ["before_request", "after_response"]
+
+
+def test_request_event_uses_slots():
+    event = RequestEvent("GET", "http://test-host/", {})
+
+    with pytest.raises(AttributeError):
+        event.something_else = 1
+
+
+def test_async_client_calls_hooks(hook):
+    def handler(request):
+        return httpx.Response(201, json={"id": "1"})
+
+    client = AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[hook])
+    client.request_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def send():
+        async with client:
+            await client.send_sms_notification(phone_number="07700 900000", template_id="456")
+
+    asyncio.run(send())
+
+    assert hook.names == ["before_request", "after_response"]
+    event = hook.calls[1][1]
+    assert event.status_code == 201
+    assert event.bytes_sent == len(json.dumps({"template_id": "456", "phone_number": "07700 900000"}))
+    assert event.bytes_received == len(b'{"id":"1"}')
+    assert event.time_to_first_byte is None
@@ -0,0 +1,65 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import notifications_python_client
+
+HEAVY_DEPENDENCIES = ["requests", "jwt", "jsonschema"]
+
+
+def _modules_imported_by(code):
+    # a fresh interpreter, since the tests have already imported everything in this one
+    result = subprocess.run(
+        [sys.executable, "-c", f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import notifications_python_client",
+        "import notifications_python_client.authentication",
+        "from notifications_python_client.authentication import TokenVerifier, ReplayCache",
+        "from notifications_python_client.errors import TokenError, HTTPError",
+    ],
+)
+def test_importing_does_not_import_heavy_dependencies(code):
+    imported = _modules_imported_by(code)
+
+    assert [dependency for dependency in HEAVY_DEPENDENCIES if dependency in imported] == []
+
+
+def test_verifying_a_token_does_not_import_jwt():
+    code = (
+        "from notifications_python_client.authentication import TokenVerifier, create_jwt_token\n"
+        "token = create_jwt_token('secret', 'client')\n"
+        "del sys.modules['jwt']\n"
+        "assert TokenVerifier({'client': 'secret'}).verify(token)['iss'] == 'client'"
+    )
+
+    assert "jwt" not in _modules_imported_by(code)
+
+
+def test_package_attributes_are_imported_when_first_used():
+    from notifications_python_client.errors import REQUEST_ERROR_MESSAGE
+    from notifications_python_client.notifications import NotificationsAPIClient
+    from notifications_python_client.utils import prepare_upload
+
+    assert notifications_python_client.NotificationsAPIClient is NotificationsAPIClient
+    assert notifications_python_client.prepare_upload is prepare_upload
+    assert notifications_python_client.REQUEST_ERROR_MESSAGE is REQUEST_ERROR_MESSAGE
+    assert "NotificationsAPIClient" in dir(notifications_python_client)
+    assert "requests" in _modules_imported_by("from notifications_python_client import NotificationsAPIClient")
+
+
+def test_unknown_package_attributes_raise_attribute_error():
+    with pytest.raises(AttributeError) as e:
+        notifications_python_client.NoSuchThing  # noqa: B018
+
+    assert str(e.value) == "module 'notifications_python_client' has no attribute 'NoSuchThing'"
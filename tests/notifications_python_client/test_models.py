@@ -0,0 +1,217 @@
+import asyncio
+import pickle
+import sys
+from datetime import datetime
+
+import httpx
+import pytest
+
+from notifications_python_client import models
+from notifications_python_client.async_notifications import AsyncNotificationsAPIClient
+from notifications_python_client.models import Notification, ReceivedText, Template, TemplateVersion, parse_timestamp
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+TEMPLATE_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+NOON = datetime.fromisoformat("2024-01-31T12:00:00+00:00")
+
+
+def _notification(notification_id="4d23d4a5-8b4e-4c0d-9c6b-111111111111", **fields):
+    return {
+        "id": notification_id,
+        "reference": "ref",
+        "email_address": None,
+        "phone_number": "+447900900123",
+        "type": "sms",
+        "status": "delivered",
+        "template": {"id": TEMPLATE_ID, "version": 3, "uri": f"{TEST_HOST}/v2/template/{TEMPLATE_ID}"},
+        "body": "Hello",
+        "subject": None,
+        "created_at": "2024-01-31T12:00:00.000000Z",
+        "sent_at": None,
+        "completed_at": "2024-01-31T12:00:05.123456Z",
+        "cost_in_pounds": 0.0227,
+        "cost_details": {"billable_sms_fragments": 1, "international_rate_multiplier": 1.0},
+        **fields,
+    }
+
+
+def test_notification_fields_are_attributes():
+    notification = Notification(_notification())
+
+    assert notification.id == "4d23d4a5-8b4e-4c0d-9c6b-111111111111"
+    assert notification.status == "delivered"
+    assert notification.subject is None
+    assert notification.cost_details == {"billable_sms_fragments": 1, "international_rate_multiplier": 1.0}
+    assert repr(notification) == "<Notification 4d23d4a5-8b4e-4c0d-9c6b-111111111111>"
+
+
+def test_fields_the_response_did_not_include_are_none():
+    notification = Notification({"id": "1"})
+
+    assert notification.line_7 is None
+    assert notification.template is None
+    assert notification.created_at is None
+    with pytest.raises(KeyError):
+        notification["line_7"]
+
+
+def test_nested_fields_and_timestamps_are_decoded_when_first_read():
+    notification = Notification(_notification())
+
+    assert notification._decoded is None
+    assert notification.template == TemplateVersion(TEMPLATE_ID, 3, f"{TEST_HOST}/v2/template/{TEMPLATE_ID}")
+    assert notification.created_at == NOON
+    assert notification.completed_at == datetime.fromisoformat("2024-01-31T12:00:05.123456+00:00")
+    assert notification.sent_at is None
+    # decoded once, then kept
+    assert notification.created_at is notification.created_at
+    assert notification.template is notification.template
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-01-31T12:00:00.000000Z", NOON),
+        ("2024-01-31T12:00:00+00:00", NOON),
+        (None, None),
+    ],
+)
+def test_parse_timestamp(value, expected):
+    assert parse_timestamp(value) == expected
+
+
+def test_raw_and_item_access_give_the_json():
+    json = _notification(new_field={"added": "later"})
+    notification = Notification(json)
+
+    assert notification.raw == json
+    assert list(notification.raw) == list(json)
+    assert notification["template"] == json["template"]
+    assert notification["new_field"] == {"added": "later"}
+    assert not hasattr(notification, "new_field")
+    with pytest.raises(KeyError):
+        notification["not_a_field"]
+
+
+def test_values_are_shared_between_models_without_changes_leaking():
+    first, second = Notification(_notification("1")), Notification(_notification("2"))
+
+    assert first.cost_details is second.cost_details
+    first.raw["cost_details"]["billable_sms_fragments"] = 2
+    first["template"]["version"] = 4
+
+    assert second.raw == _notification("2")
+
+
+def test_shared_dicts_cannot_be_changed():
+    json = _notification("1")
+    first, second = Notification(json), Notification(_notification("2"))
+
+    with pytest.raises(TypeError):
+        first.cost_details["billable_sms_fragments"] = 99
+    json["cost_details"]["billable_sms_fragments"] = 99
+
+    third = Notification(_notification("3"))
+    for notification in (first, second, third):
+        assert notification.cost_details == {"billable_sms_fragments": 1, "international_rate_multiplier": 1.0}
+    assert third["cost_details"] == third.raw["cost_details"] == _notification()["cost_details"]
+    assert type(third.raw["cost_details"]) is dict
+
+
+def test_dicts_with_equal_values_of_different_types_are_not_shared():
+    one = Notification(_notification(cost_details={"international_rate_multiplier": 1}))
+    one_point_zero = Notification(_notification(cost_details={"international_rate_multiplier": 1.0}))
+
+    assert type(one.cost_details["international_rate_multiplier"]) is int
+    assert type(one_point_zero.cost_details["international_rate_multiplier"]) is float
+
+
+def test_values_stop_being_shared_once_the_table_is_full(mocker):
+    mocker.patch.object(models, "MAX_SHARED_VALUES", 0)
+    mocker.patch.object(models, "_shared_values", {})
+
+    first, second = Notification(_notification("1")), Notification(_notification("2"))
+
+    assert first.cost_details is not second.cost_details
+    assert first.cost_details == second.cost_details
+
+
+def test_models_are_read_only():
+    notification = Notification(_notification())
+
+    with pytest.raises(AttributeError):
+        notification.status = "failed"
+    with pytest.raises(AttributeError):
+        del notification.status
+
+
+def test_models_compare_equal_by_their_json_and_can_be_pickled():
+    notification = Notification(_notification())
+
+    assert pickle.loads(pickle.dumps(notification)) == notification
+    assert notification != Notification(_notification(status="failed"))
+    assert notification != _notification()
+
+
+def test_models_take_less_memory_than_dicts():
+    json = _notification()
+    notification = Notification(json)
+
+    assert sys.getsizeof(notification) + sys.getsizeof(notification._values) < sys.getsizeof(json)
+    assert not hasattr(notification, "__dict__")
+
+
+def test_received_text_and_template():
+    received_text = ReceivedText(
+        {"id": "1", "user_number": "447700900111", "content": "Hi", "created_at": "2024-01-31T12:00:00.000000Z"}
+    )
+    template = Template({"id": TEMPLATE_ID, "type": "email", "version": 2, "updated_at": None})
+
+    assert received_text.content == "Hi"
+    assert received_text.created_at == NOON
+    assert template.type == "email"
+    assert template.updated_at is None
+    assert template.raw == {"id": TEMPLATE_ID, "type": "email", "version": 2, "updated_at": None}
+
+
+def test_get_all_notifications_iterator_yields_models(notifications_client, rmock):
+    rmock.request("GET", f"{TEST_HOST}/v2/notifications", json={"notifications": [_notification()], "links": {}})
+
+    notifications = list(notifications_client.get_all_notifications_iterator(models=True))
+
+    assert notifications == [Notification(_notification())]
+
+
+def test_models_of_some_fields(notifications_client, rmock):
+    rmock.request("GET", f"{TEST_HOST}/v2/notifications", json={"notifications": [_notification()], "links": {}})
+
+    (notification,) = notifications_client.get_all_notifications_iterator(models=True, fields=["id", "status"])
+
+    assert notification.raw == {"id": "4d23d4a5-8b4e-4c0d-9c6b-111111111111", "status": "delivered"}
+    assert notification.body is None
+
+
+def test_get_received_texts_iterator_yields_models(notifications_client, rmock):
+    rmock.request(
+        "GET", f"{TEST_HOST}/v2/received-text-messages", json={"received_text_messages": [{"id": "1"}], "links": {}}
+    )
+
+    assert list(notifications_client.get_received_texts_iterator(models=True)) == [ReceivedText({"id": "1"})]
+
+
+def test_async_iterators_yield_models():
+    def handler(request):
+        if request.url.path == "/v2/notifications":
+            return httpx.Response(200, json={"notifications": [_notification()], "links": {}})
+        return httpx.Response(200, json={"received_text_messages": [{"id": "1"}], "links": {}})
+
+    client = AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY)
+    client.request_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def collect():
+        async with client:
+            notifications = [n async for n in client.get_all_notifications_iterator(models=True)]
+            received_texts = [r async for r in client.get_received_texts_iterator(models=True)]
+            return notifications, received_texts
+
+    assert asyncio.run(collect()) == ([Notification(_notification())], [ReceivedText({"id": "1"})])
@@ -1,8 +1,13 @@
 import base64
 import io
+import json
+import time
 from unittest.mock import Mock
 
+import pytest
+
 from notifications_python_client import prepare_upload
+from notifications_python_client.errors import HTTPError, ValidationError
 from tests.conftest import TEST_HOST
 
 
@@ -456,3 +461,234 @@ def _generate_response(next_link_uuid, notifications: list):
         },
         "status_code": 200,
     }
+
+
+def test_send_notifications_bulk_sends_each_type(notifications_client, rmock):
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/sms", json={"id": "sms"}, status_code=201)
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/email", json={"id": "email"}, status_code=201)
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/letter", json={"id": "letter"}, status_code=201)
+
+    results = list(
+        notifications_client.send_notifications_bulk(
+            [
+                {"type": "sms", "phone_number": "07700 900000", "template_id": "1"},
+                {"type": "email", "email_address": "to@example.com", "template_id": "2", "reference": "ref"},
+                {"type": "letter", "template_id": "3", "personalisation": {"address_line_1": "Foo"}},
+            ],
+            max_workers=2,
+        )
+    )
+
+    assert results == [(0, {"id": "sms"}), (1, {"id": "email"}), (2, {"id": "letter"})]
+    assert sorted(request.json()["template_id"] for request in rmock.request_history) == ["1", "2", "3"]
+
+
+def test_send_notifications_bulk_yields_api_errors(notifications_client, rmock):
+    def respond(request, context):
+        if request.json()["phone_number"] == "bad":
+            context.status_code = 400
+            return {"errors": [{"error": "ValidationError", "message": "phone_number Not enough digits"}]}
+        context.status_code = 201
+        return {"id": request.json()["phone_number"]}
+
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/sms", json=respond)
+
+    results = dict(
+        notifications_client.send_notifications_bulk(
+            ({"type": "sms", "phone_number": number, "template_id": "1"} for number in ["1", "bad", "3"]),
+            ordered=False,
+        )
+    )
+
+    assert results[0] == {"id": "1"}
+    assert isinstance(results[1], HTTPError)
+    assert results[1].status_code == 400
+    assert results[2] == {"id": "3"}
+
+
+def test_send_notifications_bulk_does_not_modify_notifications(notifications_client, rmock):
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/sms", json={}, status_code=201)
+    notification = {"type": "sms", "phone_number": "07700 900000", "template_id": "1"}
+
+    list(notifications_client.send_notifications_bulk([notification]))
+
+    assert notification["type"] == "sms"
+
+
+@pytest.mark.parametrize(
+    "notification, expected_messages",
+    [
+        ({"type": "pigeon", "template_id": "1"}, ["type pigeon is not one of [sms, email, letter]"]),
+        ({"template_id": "1"}, ["type None is not one of [sms, email, letter]"]),
+        (
+            {"type": "sms", "phone": "07700 900000", "template_id": "1"},
+            ["phone is not allowed for sms notifications", "phone_number is a required property"],
+        ),
+        ({"type": "letter", "template_id": "1"}, ["personalisation is a required property"]),
+        (None, ["notification is not a JSON object"]),
+        (["sms"], ["notification is not a JSON object"]),
+    ],
+)
+def test_send_notifications_bulk_yields_errors_for_bad_notifications(
+    notifications_client, rmock, notification, expected_messages
+):
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/sms", json={"id": "sent"}, status_code=201)
+    good = {"type": "sms", "phone_number": "07700 900000", "template_id": "1"}
+
+    results = list(notifications_client.send_notifications_bulk([good, good, notification, good], max_workers=1))
+
+    assert [index for index, _ in results] == [0, 1, 2, 3]
+    assert [results[i][1] for i in (0, 1, 3)] == [{"id": "sent"}] * 3
+    assert isinstance(results[2][1], ValidationError)
+    assert [error["message"] for error in results[2][1].message] == expected_messages
+    assert rmock.call_count == 3
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 1, 3])
+def test_get_all_notifications_iterator_with_prefetch_yields_all_pages(notifications_client, rmock, prefetch_pages):
+    responses = [
+        _generate_response("79f9c6ce-cd6a-4b47-a3e7-41e155f112b0", [1, 2]),
+        _generate_response("ea179232-3190-410d-b8ab-23dfecdd3157", [3, 4]),
+        _generate_response("3e8f2f0a-0f2b-4d1b-8a01-761f14a281bb", []),
+    ]
+    rmock.request("GET", f"{TEST_HOST}/v2/notifications", responses)
+
+    notifications = list(notifications_client.get_all_notifications_iterator(prefetch_pages=prefetch_pages))
+
+    assert notifications == [1, 2, 3, 4]
+    assert rmock.call_count == 3
+    assert rmock.request_history[1].qs == {"older_than": ["79f9c6ce-cd6a-4b47-a3e7-41e155f112b0"]}
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 1])
+def test_get_all_notifications_iterator_keeps_only_the_fields_asked_for(notifications_client, rmock, prefetch_pages):
+    notification = {"id": "1", "reference": "ref", "status": "delivered", "body": "Hello", "template": {"id": "t"}}
+    responses = [
+        _generate_response("79f9c6ce-cd6a-4b47-a3e7-41e155f112b0", [notification, {**notification, "id": "2"}]),
+        _generate_response("ea179232-3190-410d-b8ab-23dfecdd3157", []),
+    ]
+    rmock.request("GET", f"{TEST_HOST}/v2/notifications", responses)
+
+    fields = (field for field in ["id", "status", "completed_at"])
+    notifications = list(
+        notifications_client.get_all_notifications_iterator(fields=fields, prefetch_pages=prefetch_pages)
+    )
+
+    assert notifications == [{"id": "1", "status": "delivered"}, {"id": "2", "status": "delivered"}]
+
+
+def test_get_received_texts_iterator_keeps_only_the_fields_asked_for(notifications_client, rmock):
+    endpoint = f"{TEST_HOST}/v2/received-text-messages"
+    rmock.request("GET", endpoint, json={"received_text_messages": [{"id": "1", "content": "Hi"}], "links": {}})
+
+    assert list(notifications_client.get_received_texts_iterator(fields=["id"])) == [{"id": "1"}]
+
+
+def test_get_all_notifications_iterator_fetches_next_page_in_background(notifications_client, rmock):
+    responses = [
+        _generate_response("79f9c6ce-cd6a-4b47-a3e7-41e155f112b0", [1, 2]),
+        _generate_response("ea179232-3190-410d-b8ab-23dfecdd3157", [3, 4]),
+        _generate_response("3e8f2f0a-0f2b-4d1b-8a01-761f14a281bb", []),
+    ]
+    rmock.request("GET", f"{TEST_HOST}/v2/notifications", responses)
+
+    notifications = notifications_client.get_all_notifications_iterator(prefetch_pages=1)
+    assert next(notifications) == 1
+
+    for _ in range(100):
+        if rmock.call_count >= 2:
+            break
+        time.sleep(0.01)
+
+    assert rmock.call_count >= 2
+    assert list(notifications) == [2, 3, 4]
+
+
+def test_get_received_texts_iterator_with_prefetch(notifications_client, rmock):
+    responses = [
+        {
+            "json": {
+                "received_text_messages": [1, 2],
+                "links": {
+                    "next": f"{TEST_HOST}/v2/received-text-messages?older_than=79f9c6ce-cd6a-4b47-a3e7-41e155f112b0"
+                },
+            },
+            "status_code": 200,
+        },
+        {"json": {"received_text_messages": [], "links": {}}, "status_code": 200},
+    ]
+    rmock.request("GET", f"{TEST_HOST}/v2/received-text-messages", responses)
+
+    assert list(notifications_client.get_received_texts_iterator(prefetch_pages=2)) == [1, 2]
+
+
+def test_get_all_notifications_iterator_stops_if_no_next_link(notifications_client, rmock):
+    rmock.request(
+        "GET",
+        f"{TEST_HOST}/v2/notifications",
+        json={"notifications": [1, 2], "links": {"current": f"{TEST_HOST}/v2/notifications"}},
+        status_code=200,
+    )
+
+    assert list(notifications_client.get_all_notifications_iterator(status="delivered")) == [1, 2]
+    assert rmock.call_count == 1
+
+
+def test_get_all_notifications_iterator_keeps_filters_for_each_page(notifications_client, rmock):
+    responses = [
+        _generate_response("79f9c6ce-cd6a-4b47-a3e7-41e155f112b0", [1, 2]),
+        _generate_response("3e8f2f0a-0f2b-4d1b-8a01-761f14a281bb", []),
+    ]
+    rmock.request("GET", f"{TEST_HOST}/v2/notifications", responses)
+
+    list(notifications_client.get_all_notifications_iterator(status="delivered", reference="ref"))
+
+    assert rmock.request_history[1].qs == {
+        "status": ["delivered"],
+        "reference": ["ref"],
+        "older_than": ["79f9c6ce-cd6a-4b47-a3e7-41e155f112b0"],
+    }
+
+
+def test_send_precompiled_letter_notification_streams_file(notifications_client, rmock):
+    endpoint = f"{TEST_HOST}/v2/notifications/letter"
+    rmock.request("POST", endpoint, json={"status": "success"}, status_code=200)
+
+    with open("tests/test_files/test.pdf", "rb") as f:
+        notifications_client.send_precompiled_letter_notification(reference="Baz", pdf_file=f, postage="first")
+        body = b"".join(rmock.last_request.body)
+
+    assert json.loads(body) == {
+        "reference": "Baz",
+        "content": "JVBERi0xLjUgdGVzdAo=",
+        "postage": "first",
+    }
+    assert rmock.last_request.headers["Content-Length"] == str(len(body))
+    assert "Transfer-Encoding" not in rmock.last_request.headers
+
+
+def test_create_email_notification_with_streamed_document_upload(notifications_client, rmock):
+    endpoint = f"{TEST_HOST}/v2/notifications/email"
+    rmock.request("POST", endpoint, json={"status": "success"}, status_code=200)
+
+    with open("tests/test_files/test.pdf", "rb") as f:
+        notifications_client.send_email_notification(
+            email_address="to@example.com",
+            template_id="456",
+            personalisation={"name": "chris", "doc": prepare_upload(f, filename="file.pdf", stream=True)},
+        )
+        body = b"".join(rmock.last_request.body)
+
+    assert json.loads(body) == {
+        "template_id": "456",
+        "email_address": "to@example.com",
+        "personalisation": {
+            "name": "chris",
+            "doc": {
+                "file": "JVBERi0xLjUgdGVzdAo=",
+                "filename": "file.pdf",
+                "confirm_email_before_download": None,
+                "retention_period": None,
+            },
+        },
+    }
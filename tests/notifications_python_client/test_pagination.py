@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from notifications_python_client.pagination import (
+    next_older_than,
+    paginate,
+    paginate_async,
+    prefetch,
+    select_fields,
+)
+
+
+@pytest.mark.parametrize(
+    "result, expected_cursor",
+    [
+        ({"links": {"next": "https://api/v2/notifications?older_than=abc"}}, "abc"),
+        ({"links": {"next": "https://api/v2/notifications?status=sending&older_than=abc&template_type=sms"}}, "abc"),
+        (
+            {"links": {"next": "/v2/received-text-messages?older_than=3e8f2f0a-0f2b-4d1b-8a01-761f14a281bb"}},
+            ("3e8f2f0a-0f2b-4d1b-8a01-761f14a281bb"),
+        ),
+        ({"links": {"next": "https://api/v2/notifications"}}, None),
+        ({"links": {"next": None}}, None),
+        ({"links": {"current": "https://api/v2/notifications"}}, None),
+        ({"links": None}, None),
+        ({}, None),
+    ],
+)
+def test_next_older_than(result, expected_cursor):
+    assert next_older_than(result) == expected_cursor
+
+
+def _pages(*pages):
+    calls = []
+
+    def fetch_page(older_than):
+        calls.append(older_than)
+        return pages[len(calls) - 1]
+
+    return fetch_page, calls
+
+
+def test_paginate_follows_cursors_until_empty_page():
+    fetch_page, calls = _pages(
+        {"items": [1, 2], "links": {"next": "/items?older_than=2"}},
+        {"items": [3], "links": {"next": "/items?older_than=3"}},
+        {"items": [], "links": {}},
+    )
+
+    assert list(paginate(fetch_page, "items", older_than="0")) == [[1, 2], [3]]
+    assert calls == ["0", "2", "3"]
+
+
+def test_paginate_stops_when_there_is_no_next_link():
+    fetch_page, calls = _pages({"items": [1, 2], "links": {"current": "/items"}})
+
+    assert list(paginate(fetch_page, "items")) == [[1, 2]]
+    assert calls == [None]
+
+
+def test_paginate_stops_when_items_are_missing():
+    fetch_page, calls = _pages({"status": "success"})
+
+    assert list(paginate(fetch_page, "items")) == []
+
+
+def test_paginate_async():
+    fetch_page, calls = _pages(
+        {"items": [1, 2], "links": {"next": "/items?older_than=2"}},
+        {"items": [3]},
+    )
+
+    async def fetch_page_async(older_than):
+        return fetch_page(older_than)
+
+    async def collect():
+        return [page async for page in paginate_async(fetch_page_async, "items")]
+
+    assert asyncio.run(collect()) == [[1, 2], [3]]
+    assert calls == [None, "2"]
+
+
+def test_prefetch_yields_all_items_in_order():
+    assert list(prefetch(iter(range(100)), depth=3)) == list(range(100))
+
+
+def test_prefetch_of_empty_iterable():
+    assert list(prefetch(iter([]), depth=1)) == []
+
+
+def test_prefetch_raises_errors_when_reached():
+    def pages():
+        yield 1
+        yield 2
+        raise ValueError("page 3 failed")
+
+    results = prefetch(pages(), depth=2)
+
+    assert next(results) == 1
+    assert next(results) == 2
+    with pytest.raises(ValueError, match="page 3 failed"):
+        next(results)
+
+
+def _wait_for(condition):
+    for _ in range(100):
+        if condition():
+            return
+        time.sleep(0.01)
+
+
+def test_prefetch_reads_ahead_up_to_depth():
+    produced = []
+
+    def pages():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    results = prefetch(pages(), depth=2)
+    assert next(results) == 0
+
+    _wait_for(lambda: len(produced) >= 4)
+    time.sleep(0.05)
+
+    # 1 and 2 are queued, and 3 is waiting for space in the queue
+    assert produced == [0, 1, 2, 3]
+    results.close()
+
+
+def test_prefetch_stops_background_thread_when_closed():
+    produced = []
+    finished = threading.Event()
+
+    def pages():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            finished.set()
+
+    results = prefetch(pages(), depth=1)
+    next(results)
+    results.close()
+
+    assert finished.wait(timeout=1)
+    assert len(produced) <= 4
+
+
+def test_prefetch_does_not_fetch_another_item_after_it_is_closed():
+    produced = []
+    finished = threading.Event()
+
+    def pages():
+        try:
+            for i in range(10):
+                produced.append(i)
+                yield i
+        finally:
+            finished.set()
+
+    results = prefetch(pages(), depth=1)
+    assert next(results) == 0
+    # 1 is queued, and 2 is waiting for space in the queue
+    _wait_for(lambda: len(produced) >= 3)
+    time.sleep(0.05)
+
+    results.close()
+
+    assert finished.wait(timeout=1)
+    assert produced == [0, 1, 2]
+
+
+def test_prefetch_runs_in_callers_context():
+    variable = contextvars.ContextVar("variable", default=None)
+    variable.set("set by caller")
+
+    def pages():
+        yield variable.get()
+
+    assert list(prefetch(pages(), depth=1)) == ["set by caller"]
+
+
+def test_prefetch_depth_must_be_positive():
+    with pytest.raises(AssertionError):
+        list(prefetch(iter([]), depth=0))
+
+
+def test_select_fields_keeps_only_the_fields_each_item_has():
+    items = [{"id": "1", "status": "delivered", "body": "Hello"}, {"id": "2", "body": "Hi"}]
+
+    assert select_fields(items, ("id", "status")) == [{"id": "1", "status": "delivered"}, {"id": "2"}]
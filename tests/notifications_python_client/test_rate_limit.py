@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from notifications_python_client.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def clock():
+    with mock.patch("notifications_python_client.rate_limit.time.monotonic", return_value=1000.0) as monotonic:
+        yield monotonic
+
+
+def test_burst_is_sent_without_waiting(clock):
+    limiter = RateLimiter(rate=10, burst=5)
+
+    assert [limiter._reserve() for _ in range(5)] == [0] * 5
+
+
+def test_requests_after_burst_are_queued_at_rate(clock):
+    limiter = RateLimiter(rate=10, burst=2)
+
+    delays = [limiter._reserve() for _ in range(5)]
+
+    assert delays == pytest.approx([0, 0, 0.1, 0.2, 0.3])
+
+
+def test_tokens_refill_over_time_up_to_burst(clock):
+    limiter = RateLimiter(rate=10, burst=2)
+    [limiter._reserve() for _ in range(2)]
+
+    clock.return_value += 0.1
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == pytest.approx(0.1)
+
+    clock.return_value += 60
+    assert [limiter._reserve() for _ in range(3)] == pytest.approx([0, 0, 0.1])
+
+
+def test_rate_can_be_per_minute(clock):
+    limiter = RateLimiter(rate=3000, period=60)
+
+    assert limiter.rate == 50
+    assert limiter.burst == 50
+    assert [limiter._reserve() for _ in range(51)][-1] == pytest.approx(0.02)
+
+
+def test_default_burst_is_at_least_one(clock):
+    limiter = RateLimiter(rate=1, period=60)
+
+    assert limiter.burst == 1
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == pytest.approx(60)
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0}, {"rate": 1, "period": 0}, {"rate": 10, "burst": 0.5}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(AssertionError):
+        RateLimiter(**kwargs)
+
+
+def test_acquire_sleeps_until_token_is_due(clock):
+    limiter = RateLimiter(rate=10, burst=1)
+
+    with mock.patch("notifications_python_client.rate_limit.time.sleep") as mock_sleep:
+        limiter.acquire()
+        limiter.acquire()
+
+    mock_sleep.assert_called_once_with(pytest.approx(0.1))
+
+
+def test_acquire_async_suspends_until_token_is_due(clock):
+    limiter = RateLimiter(rate=10, burst=1)
+
+    async def acquire_twice():
+        await limiter.acquire_async()
+        await limiter.acquire_async()
+
+    with mock.patch("notifications_python_client.rate_limit.asyncio.sleep") as mock_sleep:
+        asyncio.run(acquire_twice())
+
+    mock_sleep.assert_awaited_once_with(pytest.approx(0.1))
+
+
+def test_tokens_are_reserved_once_each_when_shared_between_threads(clock):
+    limiter = RateLimiter(rate=100, burst=1)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        delays = list(executor.map(lambda _: limiter._reserve(), range(100)))
+
+    assert sorted(delays) == pytest.approx([i / 100 for i in range(100)])
@@ -0,0 +1,188 @@
+import asyncio
+from unittest import mock
+
+import httpx
+import pytest
+
+from notifications_python_client.async_notifications import AsyncNotificationsAPIClient
+from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.rendering import (
+    placeholder_names,
+    preview_template,
+    render,
+    sms_fragment_count,
+    verified_preview,
+)
+from notifications_python_client.template_cache import TemplateCache
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+TEMPLATE_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+TEMPLATE_URL = f"{TEST_HOST}/v2/template/{TEMPLATE_ID}"
+
+SMS_TEMPLATE = {"id": TEMPLATE_ID, "type": "sms", "version": 2, "body": "Hi ((name)), see you on ((date))"}
+EMAIL_TEMPLATE = {
+    "id": TEMPLATE_ID,
+    "type": "email",
+    "version": 3,
+    "subject": "Hello ((name))",
+    "body": "Dear ((Name)),\n\n((show_extra??Extra text.))",
+}
+
+
+@pytest.mark.parametrize(
+    "content, expected_names",
+    [
+        ("no placeholders", []),
+        ("((a)) and ((b)) and ((a))", ["a", "b"]),
+        ("((first name)) and ((First_Name))", ["first name"]),
+        ("((show??conditional text))", ["show"]),
+        ("(((a))) and ((not closed)", ["a"]),
+        (None, []),
+    ],
+)
+def test_placeholder_names(content, expected_names):
+    assert placeholder_names(content) == expected_names
+
+
+@pytest.mark.parametrize(
+    "content, personalisation, expected",
+    [
+        ("Hi ((name))", {"name": "Jo"}, "Hi Jo"),
+        ("Hi ((first name))", {"First_Name": "Jo"}, "Hi Jo"),
+        ("Hi ((FIRST-NAME))", {"first name": "Jo"}, "Hi Jo"),
+        ("((a))((a))", {"a": 1}, "11"),
+        ("Items: ((items))", {"items": ["one", "two"]}, "Items: one; two"),
+        ("Value: ((a))", {"a": None}, "Value: "),
+        ("A((show??, and more))", {"show": "yes"}, "A, and more"),
+        ("A((show??, and more))", {"show": "True"}, "A, and more"),
+        ("A((show??, and more))", {"show": "no"}, "A"),
+        ("Not a ((placeholder", {}, "Not a ((placeholder"),
+        ("", {}, ""),
+    ],
+)
+def test_render(content, personalisation, expected):
+    assert render(content, personalisation) == expected
+
+
+def test_render_raises_for_missing_personalisation():
+    with pytest.raises(ValueError) as e:
+        render("((name)) ((date)) ((name)) ((time))", {"time": "10am"})
+
+    assert str(e.value) == "Missing personalisation: name, date"
+
+
+@pytest.mark.parametrize(
+    "content, expected_fragments",
+    [
+        ("", 0),
+        ("a" * 160, 1),
+        ("a" * 161, 2),
+        ("a" * 306, 2),
+        ("a" * 307, 3),
+        ("€" * 80, 1),
+        ("€" * 81, 2),
+        ("ŵ" * 70, 1),
+        ("ŵ" * 71, 2),
+        ("a" * 134 + "ŵ", 3),
+        ("😀" * 35, 1),
+        ("😀" * 36, 2),
+    ],
+)
+def test_sms_fragment_count(content, expected_fragments):
+    assert sms_fragment_count(content) == expected_fragments
+
+
+def test_preview_template_for_sms():
+    assert preview_template(SMS_TEMPLATE, {"name": "Jo", "date": "Monday"}) == {
+        "id": TEMPLATE_ID,
+        "type": "sms",
+        "version": 2,
+        "body": "Hi Jo, see you on Monday",
+        "subject": None,
+        "fragment_count": 1,
+    }
+
+
+def test_preview_template_for_email():
+    assert preview_template(EMAIL_TEMPLATE, {"name": "Jo", "show_extra": "no"}) == {
+        "id": TEMPLATE_ID,
+        "type": "email",
+        "version": 3,
+        "body": "Dear Jo,\n\n",
+        "subject": "Hello Jo",
+    }
+
+
+def test_verified_preview_returns_local_preview_when_it_matches():
+    preview = preview_template(SMS_TEMPLATE, {"name": "Jo", "date": "Monday"})
+    api_preview = {"id": TEMPLATE_ID, "type": "sms", "version": 2, "body": "Hi Jo, see you on Monday", "subject": None}
+
+    assert verified_preview(preview, api_preview) is preview
+
+
+def test_verified_preview_uses_the_api_body_when_it_differs(caplog):
+    preview = preview_template(SMS_TEMPLATE, {"name": "Jo", "date": "Monday"})
+    api_preview = {"id": TEMPLATE_ID, "type": "sms", "version": 2, "body": "Service: " + "x" * 200, "subject": None}
+
+    assert verified_preview(preview, api_preview)["body"] == api_preview["body"]
+    assert verified_preview(preview, api_preview)["fragment_count"] == 2
+    assert "differs from the API's preview" in caplog.text
+
+
+def test_verified_preview_ignores_previews_of_other_versions():
+    preview = preview_template(SMS_TEMPLATE, {"name": "Jo", "date": "Monday"})
+
+    assert verified_preview(preview, {"version": 3, "body": "different"}) is preview
+
+
+def test_client_preview_template_uses_cached_template(rmock):
+    client = NotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, template_cache=TemplateCache())
+    rmock.request("GET", TEMPLATE_URL, json=SMS_TEMPLATE)
+
+    previews = [client.preview_template(TEMPLATE_ID, {"name": name, "date": "Monday"}) for name in ("Jo", "Sam")]
+
+    assert [preview["body"] for preview in previews] == ["Hi Jo, see you on Monday", "Hi Sam, see you on Monday"]
+    assert rmock.call_count == 1
+
+
+def test_client_preview_template_version(notifications_client, rmock):
+    rmock.request("GET", f"{TEMPLATE_URL}/version/3", json=EMAIL_TEMPLATE)
+
+    preview = notifications_client.preview_template(TEMPLATE_ID, {"name": "Jo", "show_extra": "yes"}, version=3)
+
+    assert preview["body"] == "Dear Jo,\n\nExtra text."
+
+
+def test_client_preview_template_raises_for_missing_personalisation(notifications_client, rmock):
+    rmock.request("GET", TEMPLATE_URL, json=SMS_TEMPLATE)
+
+    with pytest.raises(ValueError) as e:
+        notifications_client.preview_template(TEMPLATE_ID, {"name": "Jo"})
+
+    assert str(e.value) == "Missing personalisation: date"
+
+
+@pytest.mark.parametrize("random_value, expected_calls", [(0.09, 2), (0.1, 1)])
+def test_client_preview_template_verifies_a_sample(notifications_client, rmock, random_value, expected_calls):
+    rmock.request("GET", TEMPLATE_URL, json=SMS_TEMPLATE)
+    rmock.request("POST", f"{TEMPLATE_URL}/preview", json={**SMS_TEMPLATE, "body": "Hi Jo, see you on Monday"})
+
+    with mock.patch("notifications_python_client.notifications.random.random", return_value=random_value):
+        preview = notifications_client.preview_template(TEMPLATE_ID, {"name": "Jo", "date": "Monday"}, verify_rate=0.1)
+
+    assert preview["body"] == "Hi Jo, see you on Monday"
+    assert rmock.call_count == expected_calls
+
+
+def test_async_client_preview_template():
+    def handler(request):
+        return httpx.Response(200, json=SMS_TEMPLATE)
+
+    client = AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY)
+    client.request_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def preview():
+        async with client:
+            return await client.preview_template(TEMPLATE_ID, {"name": "Jo", "date": "Monday"})
+
+    assert asyncio.run(preview())["body"] == "Hi Jo, see you on Monday"
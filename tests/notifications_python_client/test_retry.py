@@ -0,0 +1,105 @@
+from unittest import mock
+
+import pytest
+import requests
+from freezegun import freeze_time
+
+from notifications_python_client.errors import HTTPError
+from notifications_python_client.retry import RetryPolicy
+
+
+def _error(status_code=None, headers=None):
+    if status_code is None:
+        # how connection errors are reported
+        return HTTPError.create(requests.exceptions.ConnectionError())
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return HTTPError.create(requests.exceptions.HTTPError(response=response))
+
+
+@pytest.mark.parametrize("method", ["GET", "PUT", "DELETE", "get"])
+@pytest.mark.parametrize("status_code", [None, 429, 502, 503, 504])
+def test_idempotent_requests_are_retried(method, status_code):
+    policy = RetryPolicy()
+
+    assert policy.get_retry_delay(method, _error(status_code), attempt=1) is not None
+    assert policy.retries == 1
+    assert policy.give_ups == 0
+
+
+@pytest.mark.parametrize("status_code", [None, 500, 502, 503, 504])
+def test_non_idempotent_requests_are_not_retried_if_they_may_have_been_acted_on(status_code):
+    policy = RetryPolicy()
+
+    assert policy.get_retry_delay("POST", _error(status_code), attempt=1) is None
+    assert policy.retries == 0
+    assert policy.give_ups == 0
+
+
+def test_non_idempotent_requests_are_retried_when_rate_limited():
+    policy = RetryPolicy()
+
+    assert policy.get_retry_delay("POST", _error(429), attempt=1) is not None
+
+
+def test_post_can_be_marked_as_idempotent():
+    policy = RetryPolicy(idempotent_methods={"GET", "post"})
+
+    assert policy.get_retry_delay("POST", _error(503), attempt=1) is not None
+
+
+@pytest.mark.parametrize("status_code", [400, 403, 404, 500])
+def test_client_errors_are_not_retried(status_code):
+    policy = RetryPolicy()
+
+    assert policy.get_retry_delay("GET", _error(status_code), attempt=1) is None
+    assert policy.give_ups == 0
+
+
+def test_gives_up_after_max_attempts():
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.get_retry_delay("GET", _error(503), attempt=1) is not None
+    assert policy.get_retry_delay("GET", _error(503), attempt=2) is not None
+    assert policy.get_retry_delay("GET", _error(503), attempt=3) is None
+    assert policy.retries == 2
+    assert policy.give_ups == 1
+
+
+@pytest.mark.parametrize("attempt, expected_upper_bound", [(1, 0.5), (2, 1), (3, 2), (4, 4), (10, 10)])
+def test_backoff_uses_full_jitter_capped_exponential(attempt, expected_upper_bound):
+    policy = RetryPolicy(max_attempts=20, backoff_base=0.5, backoff_cap=10)
+
+    with mock.patch("notifications_python_client.retry.random.uniform", return_value=0.1) as mock_uniform:
+        assert policy.get_retry_delay("GET", _error(503), attempt=attempt) == 0.1
+
+    mock_uniform.assert_called_once_with(0, expected_upper_bound)
+
+
+def test_retry_after_seconds_is_honoured():
+    policy = RetryPolicy(backoff_cap=10)
+
+    assert policy.get_retry_delay("POST", _error(429, {"Retry-After": "7"}), attempt=1) == 7
+
+
+@freeze_time("2015-10-21 07:28:00")
+def test_retry_after_date_is_honoured():
+    policy = RetryPolicy(backoff_cap=10)
+
+    delay = policy.get_retry_delay("GET", _error(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:05 GMT"}), attempt=1)
+
+    assert delay == 5
+
+
+def test_gives_up_if_retry_after_is_longer_than_backoff_cap():
+    policy = RetryPolicy(backoff_cap=10)
+
+    assert policy.get_retry_delay("POST", _error(429, {"Retry-After": "60"}), attempt=1) is None
+    assert policy.give_ups == 1
+
+
+def test_invalid_retry_after_falls_back_to_backoff():
+    policy = RetryPolicy(backoff_base=1)
+
+    assert 0 <= policy.get_retry_delay("GET", _error(503, {"Retry-After": "soon"}), attempt=1) <= 1
@@ -0,0 +1,134 @@
+import io
+import json
+from unittest import mock
+
+import pytest
+
+from notifications_python_client.base import BaseAPIClient
+from notifications_python_client.errors import InvalidResponse
+from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.serializers import (
+    JSONSerializer,
+    OrjsonSerializer,
+    UjsonSerializer,
+    get_json_serializer,
+)
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+
+@pytest.fixture(params=["json", "orjson", "ujson"])
+def json_serializer(request):
+    if request.param != "json":
+        pytest.importorskip(request.param)
+    return request.param
+
+
+@pytest.fixture
+def client(json_serializer):
+    return NotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, json_serializer=json_serializer)
+
+
+def test_client_uses_json_module_by_default(base_client):
+    assert isinstance(base_client.json_serializer, JSONSerializer)
+    assert base_client.json_serializer.name == "json"
+
+
+def test_client_serializer_can_be_chosen_by_name(json_serializer):
+    client = BaseAPIClient(api_key=COMBINED_API_KEY, json_serializer=json_serializer)
+
+    assert client.json_serializer.name == json_serializer
+
+
+def test_client_accepts_a_serializer_object():
+    serializer = mock.Mock()
+
+    client = BaseAPIClient(api_key=COMBINED_API_KEY, json_serializer=serializer)
+
+    assert client.json_serializer is serializer
+
+
+def test_unknown_serializer_name_raises_value_error():
+    with pytest.raises(ValueError) as e:
+        BaseAPIClient(api_key=COMBINED_API_KEY, json_serializer="simplejson")
+
+    assert str(e.value) == "Unknown JSON serializer: simplejson. Use one of json, orjson, ujson or auto"
+
+
+def test_auto_prefers_orjson():
+    pytest.importorskip("orjson")
+
+    assert isinstance(get_json_serializer("auto"), OrjsonSerializer)
+
+
+def test_auto_falls_back_to_json_module_when_nothing_faster_is_installed():
+    with mock.patch.dict("sys.modules", {"orjson": None, "ujson": None}):
+        assert type(get_json_serializer("auto")) is JSONSerializer
+
+
+def test_named_serializer_raises_import_error_if_not_installed():
+    with mock.patch.dict("sys.modules", {"ujson": None}), pytest.raises(ImportError):
+        get_json_serializer("ujson")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"personalisation": {"name": "Zoë", "url": "https://example.com/a/b", "count": 3, "ok": True, "x": None}},
+        {"personalisation": {1: "int key"}},
+        {"list": [1.5, "two", ["three"]]},
+    ],
+)
+def test_serializers_write_json_the_json_module_reads_the_same(client, rmock, data):
+    rmock.request("POST", "http://test-host/", json={})
+
+    client.post("/", data=data)
+
+    assert rmock.last_request.json() == json.loads(json.dumps(data))
+
+
+def test_serializers_convert_sets_to_lists(client, rmock):
+    rmock.request("POST", "http://test-host/", json={})
+
+    client.post("/", data={"set": {1, 2}})
+
+    assert sorted(rmock.last_request.json()["set"]) == [1, 2]
+
+
+def test_serializers_raise_type_error_for_unserialisable_data(client):
+    with pytest.raises(TypeError):
+        client.post("/", data={"value": object()})
+
+
+def test_serializers_parse_responses(client, rmock):
+    rmock.request("GET", "http://test-host/", json={"notifications": [{"id": "1", "body": "Zoë /"}]})
+
+    assert client.get("/") == {"notifications": [{"id": "1", "body": "Zoë /"}]}
+
+
+def test_serializers_raise_invalid_response_for_invalid_json(client, rmock):
+    rmock.request("GET", "http://test-host/", text="Internal Error", status_code=200)
+
+    with pytest.raises(InvalidResponse) as e:
+        client.get("/")
+
+    assert e.value.message == "No JSON response object could be decoded"
+
+
+def test_serializers_stream_precompiled_letters(client, rmock):
+    rmock.request("POST", "http://test-host/v2/notifications/letter", json={"id": "1"}, status_code=201)
+
+    client.send_precompiled_letter_notification(reference="ref", pdf_file=io.BytesIO(b"%PDF-1.4 file contents"))
+
+    body = json.loads(b"".join(rmock.last_request.body))
+    assert body == {"reference": "ref", "content": "JVBERi0xLjQgZmlsZSBjb250ZW50cw=="}
+
+
+@pytest.mark.parametrize("serializer_class", [JSONSerializer, OrjsonSerializer, UjsonSerializer])
+def test_serializer_loads_raises_value_error(serializer_class):
+    try:
+        serializer = serializer_class()
+    except ImportError:
+        pytest.skip(f"{serializer_class.name} is not installed")
+
+    with pytest.raises(ValueError):
+        serializer.loads(b"Internal Error")
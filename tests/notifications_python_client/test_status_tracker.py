@@ -0,0 +1,152 @@
+from unittest import mock
+
+import pytest
+
+from notifications_python_client.errors import HTTPError
+from notifications_python_client.status_tracker import StatusChange, StatusTracker
+from tests.conftest import TEST_HOST
+
+NOTIFICATIONS_URL = f"{TEST_HOST}/v2/notifications"
+
+
+@pytest.fixture
+def clock():
+    with mock.patch("notifications_python_client.status_tracker.time") as time:
+        time.monotonic.return_value = 1000
+
+        def sleep(seconds):
+            time.monotonic.return_value += seconds
+
+        time.sleep.side_effect = sleep
+        yield time
+
+
+@pytest.fixture
+def tracker(notifications_client, clock):
+    return StatusTracker(notifications_client, intervals={"sending": 10}, max_interval=100)
+
+
+def _notification(id, status, reference=None):
+    return {"id": id, "status": status, "reference": reference}
+
+
+def test_changes_looks_up_notifications_without_a_reference(tracker, clock, rmock):
+    rmock.request(
+        "GET",
+        f"{NOTIFICATIONS_URL}/1",
+        [{"json": _notification("1", "sending")}] * 3 + [{"json": _notification("1", "delivered")}],
+    )
+    tracker.track("1")
+
+    changes = list(tracker.changes())
+
+    assert [(change.previous_status, change.status) for change in changes] == [
+        (None, "sending"),
+        ("sending", "delivered"),
+    ]
+    # waits of 10, 20 and 40 seconds while the status stays the same
+    assert [call.args[0] for call in clock.sleep.call_args_list] == [10, 20, 40]
+    assert tracker.stats == {"lookups": 4, "pages": 0, "tracking": 0}
+
+
+def test_wait_is_capped_at_max_interval(tracker, clock, rmock):
+    rmock.request(
+        "GET",
+        f"{NOTIFICATIONS_URL}/1",
+        [{"json": _notification("1", "sending")}] * 6 + [{"json": _notification("1", "sent")}],
+    )
+    tracker.track("1")
+
+    list(tracker.changes())
+
+    assert [call.args[0] for call in clock.sleep.call_args_list] == [10, 20, 40, 80, 100, 100]
+
+
+def test_notifications_sharing_a_reference_are_checked_a_page_at_a_time(tracker, rmock):
+    rmock.request(
+        "GET",
+        NOTIFICATIONS_URL,
+        json={"notifications": [_notification(str(id), "delivered", "campaign") for id in range(3)], "links": {}},
+    )
+    for id in range(3):
+        tracker.track(id, reference="campaign")
+
+    changes = list(tracker.changes())
+
+    assert sorted(change.id for change in changes) == ["0", "1", "2"]
+    assert rmock.call_count == 1
+    assert rmock.last_request.qs == {"reference": ["campaign"]}
+    assert tracker.stats == {"lookups": 0, "pages": 1, "tracking": 0}
+
+
+def test_walk_stops_once_lookups_would_have_been_cheaper(tracker, rmock):
+    # the reference is shared with many other notifications, so the tracked ones aren't on the first page
+    others = {"notifications": [_notification("other", "delivered", "shared")], "links": {"next": "?older_than=x"}}
+    rmock.request("GET", NOTIFICATIONS_URL, json=others)
+    for id in range(3):
+        rmock.request("GET", f"{NOTIFICATIONS_URL}/{id}", json=_notification(str(id), "delivered", "shared"))
+        tracker.track(id, reference="shared")
+
+    assert len(list(tracker.poll())) == 3
+
+    assert tracker.stats == {"lookups": 3, "pages": 1, "tracking": 0}
+
+
+def test_reference_which_was_expensive_to_walk_is_looked_up_by_id(tracker, clock, rmock):
+    rmock.request("GET", NOTIFICATIONS_URL, json={"notifications": [], "links": {}})
+    rmock.request("GET", f"{NOTIFICATIONS_URL}/1", json=_notification("1", "sending"))
+    tracker.track("1", reference="shared")
+    tracker.track("2", reference="shared")
+    rmock.request("GET", f"{NOTIFICATIONS_URL}/2", json=_notification("2", "sending"))
+
+    list(tracker.poll())
+    clock.monotonic.return_value += 10
+    list(tracker.poll())
+
+    assert [request.path for request in rmock.request_history] == [
+        "/v2/notifications",
+        "/v2/notifications/1",
+        "/v2/notifications/2",
+        "/v2/notifications/1",
+        "/v2/notifications/2",
+    ]
+
+
+def test_changes_stops_at_timeout(tracker, clock, rmock):
+    rmock.request("GET", f"{NOTIFICATIONS_URL}/1", json=_notification("1", "sending"))
+    tracker.track("1")
+
+    assert list(tracker.changes(timeout=25)) == [StatusChange("1", None, "sending", _notification("1", "sending"))]
+    assert rmock.call_count == 2
+    assert len(tracker) == 1
+
+
+def test_notifications_which_are_not_found_are_no_longer_tracked(tracker, rmock, caplog):
+    rmock.request("GET", f"{NOTIFICATIONS_URL}/1", json={"errors": []}, status_code=404)
+    rmock.request("GET", f"{NOTIFICATIONS_URL}/2", json=_notification("2", "delivered"))
+    tracker.track("1")
+    tracker.track("2")
+
+    assert list(tracker.changes()) == [StatusChange("2", None, "delivered", _notification("2", "delivered"))]
+
+    assert len(tracker) == 0
+    assert "Notification 1 was not found, so is no longer tracked" in caplog.messages
+
+
+def test_errors_are_raised_after_the_other_results_are_applied(tracker, rmock):
+    rmock.request(
+        "GET",
+        f"{NOTIFICATIONS_URL}/1",
+        [{"json": {"errors": []}, "status_code": 500}, {"json": _notification("1", "delivered")}],
+    )
+    rmock.request("GET", f"{NOTIFICATIONS_URL}/2", json=_notification("2", "delivered"))
+    tracker.track("1")
+    tracker.track("2")
+
+    with pytest.raises(HTTPError) as e:
+        list(tracker.poll())
+
+    assert e.value.status_code == 500
+    assert len(tracker) == 1
+    assert list(tracker.changes()) == [StatusChange("1", None, "delivered", _notification("1", "delivered"))]
+    assert len(tracker) == 0
@@ -0,0 +1,128 @@
+import base64
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from notifications_python_client.streaming import (
+    CHUNK_SIZE,
+    Base64Stream,
+    StreamingJSONBody,
+    base64_file,
+    encode_json_body,
+)
+
+
+def _default(obj):
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, 3 * CHUNK_SIZE + 2])
+def test_base64_file_streams_encoded_file(size):
+    contents = bytes(i % 256 for i in range(size))
+
+    stream = base64_file(io.BytesIO(contents))
+
+    assert isinstance(stream, Base64Stream)
+    assert b"".join(stream) == base64.b64encode(contents)
+    assert len(stream) == len(base64.b64encode(contents))
+
+
+def test_base64_file_starts_from_current_position():
+    f = io.BytesIO(b"header:contents")
+    f.read(7)
+
+    stream = base64_file(f)
+
+    assert b"".join(stream) == base64.b64encode(b"contents")
+    # iterating again starts from the same place
+    assert b"".join(stream) == base64.b64encode(b"contents")
+
+
+def test_base64_file_encodes_unseekable_files_straight_away():
+    f = Mock(read=Mock(return_value=b"file_contents"))
+
+    assert base64_file(f) == base64.b64encode(b"file_contents").decode("ascii")
+
+
+def test_base64_stream_handles_short_reads():
+    class RawFile(io.BytesIO):
+        def read(self, size=-1):
+            return super().read(min(size, 5))
+
+    contents = b"a" * (CHUNK_SIZE + 10)
+
+    assert b"".join(base64_file(RawFile(contents))) == base64.b64encode(contents)
+
+
+def test_base64_stream_can_be_iterated_over_by_interleaved_iterations():
+    contents = bytes(i % 256 for i in range(3 * CHUNK_SIZE + 2))
+    stream = base64_file(io.BytesIO(contents))
+
+    first, second = iter(stream), iter(stream)
+    first_chunks, second_chunks = [next(first)], []
+    for chunk in second:
+        second_chunks.append(chunk)
+        first_chunks.extend(first)
+
+    assert b"".join(first_chunks) == b"".join(second_chunks) == base64.b64encode(contents)
+
+
+def test_base64_stream_can_be_sent_from_many_threads_at_once():
+    contents = bytes(i % 251 for i in range(5 * CHUNK_SIZE + 1))
+    stream = base64_file(io.BytesIO(contents))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        encoded = list(executor.map(lambda _: b"".join(stream), range(32)))
+
+    assert encoded == [base64.b64encode(contents)] * 32
+
+
+def test_base64_stream_errors_if_file_shrinks():
+    f = io.BytesIO(b"contents")
+    stream = base64_file(f)
+    f.truncate(2)
+
+    with pytest.raises(ValueError, match="File was shorter than expected"):
+        b"".join(stream)
+
+
+def test_encode_json_body_without_streams_returns_str():
+    data = {"a": {1}, "b": "c"}
+
+    assert encode_json_body(data, json.dumps, _default) == json.dumps({"a": [1], "b": "c"})
+
+
+def test_encode_json_body_uses_default_for_other_types():
+    with pytest.raises(TypeError):
+        encode_json_body({"a": object()}, json.dumps, _default)
+
+
+def test_encode_json_body_streams_files():
+    data = {
+        "reference": "ref\u0000",
+        "content": base64_file(io.BytesIO(b"first file")),
+        "personalisation": {"names": {"chris"}, "doc": {"file": base64_file(io.BytesIO(b"second file"))}},
+    }
+
+    body = encode_json_body(data, json.dumps, _default)
+
+    assert isinstance(body, StreamingJSONBody)
+    serialised = b"".join(body)
+    assert len(body) == len(serialised)
+    assert json.loads(serialised) == {
+        "reference": "ref\u0000",
+        "content": base64.b64encode(b"first file").decode(),
+        "personalisation": {"names": ["chris"], "doc": {"file": base64.b64encode(b"second file").decode()}},
+    }
+    assert b"".join(body) == serialised
+
+
+def test_streaming_json_body_never_holds_whole_file():
+    body = encode_json_body({"content": base64_file(io.BytesIO(b"a" * 10 * CHUNK_SIZE))}, json.dumps, _default)
+
+    assert max(len(chunk) for chunk in body) == len(base64.b64encode(b"a" * CHUNK_SIZE))
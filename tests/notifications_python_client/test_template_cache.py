@@ -0,0 +1,190 @@
+import asyncio
+from unittest import mock
+
+import httpx
+import pytest
+
+from notifications_python_client.async_notifications import AsyncNotificationsAPIClient
+from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.template_cache import TemplateCache, template_key, version_key
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+TEMPLATE_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+TEMPLATE_URL = f"{TEST_HOST}/v2/template/{TEMPLATE_ID}"
+
+
+def _template(version=1, body="Hello ((name))"):
+    return {"id": TEMPLATE_ID, "version": version, "type": "sms", "body": body}
+
+
+@pytest.fixture
+def clock():
+    with mock.patch("notifications_python_client.template_cache.time.monotonic", return_value=1000) as monotonic:
+        yield monotonic
+
+
+@pytest.fixture
+def cache(clock):
+    return TemplateCache(ttl=60)
+
+
+@pytest.fixture
+def client(cache):
+    return NotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, template_cache=cache)
+
+
+def test_templates_are_not_cached_by_default(notifications_client, rmock):
+    rmock.request("GET", TEMPLATE_URL, json=_template())
+
+    notifications_client.get_template(TEMPLATE_ID)
+    notifications_client.get_template(TEMPLATE_ID)
+
+    assert rmock.call_count == 2
+
+
+def test_get_template_is_cached_until_ttl_expires(client, cache, clock, rmock):
+    rmock.request("GET", TEMPLATE_URL, [{"json": _template(1)}, {"json": _template(2)}])
+
+    assert client.get_template(TEMPLATE_ID) == _template(1)
+    clock.return_value = 1059
+    assert client.get_template(TEMPLATE_ID) == _template(1)
+    assert rmock.call_count == 1
+
+    clock.return_value = 1060
+    assert client.get_template(TEMPLATE_ID) == _template(2)
+    assert rmock.call_count == 2
+    assert cache.stats == {"hits": 1, "misses": 2, "revalidations": 0, "evictions": 0, "size": 3}
+
+
+def test_get_template_version_is_cached_forever(client, clock, rmock):
+    rmock.request("GET", f"{TEMPLATE_URL}/version/3", json=_template(3))
+
+    client.get_template_version(TEMPLATE_ID, 3)
+    clock.return_value = 1_000_000
+    assert client.get_template_version(TEMPLATE_ID, "3") == _template(3)
+
+    assert rmock.call_count == 1
+
+
+def test_get_template_version_uses_versions_of_templates_already_fetched(client, cache, rmock):
+    rmock.request("GET", TEMPLATE_URL, json=_template(2))
+
+    client.get_template(TEMPLATE_ID)
+
+    assert client.get_template_version(TEMPLATE_ID, 2) == _template(2)
+    assert rmock.call_count == 1
+    assert cache.hits == 1
+
+
+def test_get_all_templates_is_cached_for_each_template_type(client, rmock):
+    rmock.request("GET", f"{TEST_HOST}/v2/templates", json={"templates": [_template(4)]})
+
+    client.get_all_templates()
+    client.get_all_templates()
+    client.get_all_templates(template_type="sms")
+
+    assert [request.qs for request in rmock.request_history] == [{}, {"type": ["sms"]}]
+    assert client.get_template_version(TEMPLATE_ID, 4) == _template(4)
+    assert rmock.call_count == 2
+
+
+def test_expired_templates_are_revalidated_with_etag(client, cache, clock, rmock):
+    rmock.request(
+        "GET",
+        TEMPLATE_URL,
+        [{"json": _template(1), "headers": {"ETag": '"abc"'}}, {"status_code": 304}],
+    )
+
+    client.get_template(TEMPLATE_ID)
+    clock.return_value = 1100
+    assert client.get_template(TEMPLATE_ID) == _template(1)
+
+    assert rmock.last_request.headers["If-None-Match"] == '"abc"'
+    assert cache.revalidations == 1
+
+    # the revalidated entry is fresh for another ttl
+    clock.return_value = 1159
+    client.get_template(TEMPLATE_ID)
+    assert rmock.call_count == 2
+
+
+def test_expired_templates_without_etag_are_fetched_again(client, clock, rmock):
+    rmock.request("GET", TEMPLATE_URL, json=_template(1))
+
+    client.get_template(TEMPLATE_ID)
+    clock.return_value = 1100
+    client.get_template(TEMPLATE_ID)
+
+    assert rmock.call_count == 2
+    assert "If-None-Match" not in rmock.last_request.headers
+
+
+def test_changing_a_returned_template_does_not_change_the_cache(client, rmock):
+    rmock.request("GET", TEMPLATE_URL, json=_template(1))
+
+    client.get_template(TEMPLATE_ID)["body"] = "changed"
+    template = client.get_template(TEMPLATE_ID)
+    template["body"] = "changed again"
+
+    assert client.get_template(TEMPLATE_ID) == _template(1)
+
+
+def test_invalidate_forgets_latest_versions_but_not_specific_versions(client, cache, rmock):
+    rmock.request("GET", TEMPLATE_URL, json=_template(1))
+
+    client.get_template(TEMPLATE_ID)
+    cache.invalidate(TEMPLATE_ID)
+    client.get_template(TEMPLATE_ID)
+    client.get_template_version(TEMPLATE_ID, 1)
+
+    assert rmock.call_count == 2
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = TemplateCache(maxsize=2)
+    response = mock.Mock(status_code=200, headers={})
+
+    cache.update(version_key(TEMPLATE_ID, 1), None, response, lambda: {"version": 1})
+    cache.update(version_key(TEMPLATE_ID, 2), None, response, lambda: {"version": 2})
+    cache.lookup(version_key(TEMPLATE_ID, 1))
+    cache.update(version_key(TEMPLATE_ID, 3), None, response, lambda: {"version": 3})
+
+    assert cache.lookup(version_key(TEMPLATE_ID, 2)) is None
+    assert cache.lookup(version_key(TEMPLATE_ID, 1)).value == {"version": 1}
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_lookup_of_expired_entry_is_not_fresh(cache, clock):
+    response = mock.Mock(status_code=200, headers={"ETag": "abc"})
+    cache.update(template_key(TEMPLATE_ID), None, response, lambda: {"id": "other"})
+
+    clock.return_value = 2000
+    cached = cache.lookup(template_key(TEMPLATE_ID))
+
+    assert cached == ({"id": "other"}, "abc", False)
+    assert cache.misses == 1
+
+
+@pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"ttl": -1}])
+def test_template_cache_validates_arguments(kwargs):
+    with pytest.raises(AssertionError):
+        TemplateCache(**kwargs)
+
+
+def test_async_client_uses_template_cache(cache):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=_template(1))
+
+    client = AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, template_cache=cache)
+    client.request_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def get_twice():
+        async with client:
+            return [await client.get_template(TEMPLATE_ID), await client.get_template(TEMPLATE_ID)]
+
+    assert asyncio.run(get_twice()) == [_template(1), _template(1)]
+    assert len(requests) == 1
@@ -0,0 +1,155 @@
+import asyncio
+from unittest import mock
+
+import httpx
+import pytest
+
+from notifications_python_client.async_notifications import AsyncNotificationsAPIClient
+from notifications_python_client.errors import HTTPError
+from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.tracing import TracingHook
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+NOTIFICATION_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer_provider(exporter):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider
+
+
+@pytest.fixture
+def client(tracer_provider):
+    return NotificationsAPIClient(
+        base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[TracingHook(tracer_provider=tracer_provider)]
+    )
+
+
+def test_request_span_has_endpoint_notification_type_template_and_status(client, exporter, rmock):
+    rmock.request("POST", "http://test-host/v2/notifications/email", json={"id": "1"}, status_code=201)
+
+    client.send_email_notification(email_address="to@example.com", template_id="456")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "POST /v2/notifications/email"
+    assert span.kind == trace.SpanKind.CLIENT
+    assert span.attributes["http.request.method"] == "POST"
+    assert span.attributes["url.full"] == "http://test-host/v2/notifications/email"
+    assert span.attributes["notify.endpoint"] == "/v2/notifications/email"
+    assert span.attributes["notify.notification_type"] == "email"
+    assert span.attributes["notify.template_id"] == "456"
+    assert span.attributes["http.response.status_code"] == 201
+    assert span.status.is_ok
+
+
+def test_request_span_is_a_child_of_the_current_span(client, exporter, rmock, tracer_provider):
+    rmock.request("GET", f"http://test-host/v2/notifications/{NOTIFICATION_ID}", json={})
+
+    with tracer_provider.get_tracer("test").start_as_current_span("caller") as caller:
+        client.get_notification_by_id(NOTIFICATION_ID)
+
+    request_span, caller_span = exporter.get_finished_spans()
+    assert request_span.name == "GET /v2/notifications/{id}"
+    assert request_span.parent.span_id == caller.get_span_context().span_id
+    assert caller_span.name == "caller"
+
+
+def test_trace_context_is_sent_in_request_headers(client, exporter, rmock):
+    rmock.request("GET", f"http://test-host/v2/notifications/{NOTIFICATION_ID}", json={})
+
+    client.get_notification_by_id(NOTIFICATION_ID)
+
+    (span,) = exporter.get_finished_spans()
+    traceparent = rmock.last_request.headers["traceparent"]
+    assert traceparent.startswith(f"00-{span.context.trace_id:032x}-{span.context.span_id:016x}-")
+
+
+def test_get_pdf_for_letter_has_a_span(client, exporter, rmock):
+    rmock.request("GET", f"http://test-host/v2/notifications/{NOTIFICATION_ID}/pdf", content=b"%PDF")
+
+    client.get_pdf_for_letter(NOTIFICATION_ID)
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "GET /v2/notifications/{id}/pdf"
+    assert span.attributes["http.response.status_code"] == 200
+
+
+def test_failed_request_span_records_error(client, exporter, rmock):
+    rmock.request("POST", "http://test-host/v2/notifications/sms", json={"errors": "Bad"}, status_code=400)
+
+    with pytest.raises(HTTPError):
+        client.send_sms_notification(phone_number="07700 900000", template_id="456")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["http.response.status_code"] == 400
+    assert span.attributes["error.type"] == "HTTPError"
+    assert span.status.status_code == trace.StatusCode.ERROR
+    assert span.events[0].name == "exception"
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 2])
+def test_iterator_has_a_parent_span_over_all_page_fetches(client, exporter, rmock, prefetch_pages):
+    rmock.request(
+        "GET",
+        "http://test-host/v2/notifications",
+        [
+            {"json": {"notifications": [{"id": "1"}], "links": {"next": "/v2/notifications?older_than=1"}}},
+            {"json": {"notifications": [{"id": "2"}], "links": {}}},
+        ],
+    )
+
+    assert [n["id"] for n in client.get_all_notifications_iterator(prefetch_pages=prefetch_pages)] == ["1", "2"]
+
+    *request_spans, iterator_span = exporter.get_finished_spans()
+    assert iterator_span.name == "get_all_notifications_iterator"
+    assert iterator_span.attributes["notify.pages"] == 2
+    assert [span.name for span in request_spans] == ["GET /v2/notifications"] * 2
+    assert all(span.parent.span_id == iterator_span.context.span_id for span in request_spans)
+
+
+def test_async_client_spans(tracer_provider, exporter):
+    def handler(request):
+        if request.url.params.get("older_than"):
+            return httpx.Response(200, json={"received_text_messages": [{"id": "2"}], "links": {}})
+        next_link = "/v2/received-text-messages?older_than=1"
+        return httpx.Response(200, json={"received_text_messages": [{"id": "1"}], "links": {"next": next_link}})
+
+    client = AsyncNotificationsAPIClient(
+        base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[TracingHook(tracer_provider=tracer_provider)]
+    )
+    client.request_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def iterate():
+        async with client:
+            return [text["id"] async for text in client.get_received_texts_iterator()]
+
+    assert asyncio.run(iterate()) == ["1", "2"]
+
+    *request_spans, iterator_span = exporter.get_finished_spans()
+    assert iterator_span.name == "get_received_texts_iterator"
+    assert len(request_spans) == 2
+    assert all(span.parent.span_id == iterator_span.context.span_id for span in request_spans)
+
+
+def test_tracing_hook_does_nothing_without_opentelemetry(rmock):
+    with mock.patch("notifications_python_client.tracing.trace", None):
+        hook = TracingHook()
+    client = NotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, hooks=[hook])
+    rmock.request("GET", "http://test-host/v2/notifications", json={"notifications": [{"id": "1"}], "links": {}})
+
+    assert list(client.get_all_notifications_iterator()) == [{"id": "1"}]
+    assert "traceparent" not in rmock.last_request.headers
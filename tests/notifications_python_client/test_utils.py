@@ -4,6 +4,7 @@ import io
 import pytest
 
 from notifications_python_client import prepare_upload
+from notifications_python_client.streaming import Base64Stream
 
 
 def test_prepare_upload_raises_an_error_for_large_files():
@@ -53,3 +54,70 @@ def test_prepare_upload_generates_expected_dict(filename, confirm_email_before_d
     assert file_dict["file"] == base64.b64encode(file_content).decode("ascii")
     assert file_dict["confirm_email_before_download"] is confirm_email_before_download
     assert file_dict["retention_period"] is retention_period
+
+
+class UnseekableFile(io.RawIOBase):
+    def __init__(self, contents):
+        self.contents = io.BytesIO(contents)
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        # return at most 1000 bytes at a time, like a pipe or socket might
+        data = self.contents.read(min(len(buffer), 1000))
+        buffer[: len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+
+def test_prepare_upload_rejects_large_seekable_files_without_reading_them(mocker):
+    f = io.BytesIO(b"a" * 3 * 1024 * 1024)
+    read = mocker.spy(f, "read")
+
+    with pytest.raises(ValueError, match="larger than 2MB"):
+        prepare_upload(f)
+
+    read.assert_not_called()
+
+
+def test_prepare_upload_reads_unseekable_files_no_further_than_limit():
+    f = UnseekableFile(b"a" * 3 * 1024 * 1024)
+
+    with pytest.raises(ValueError, match="larger than 2MB"):
+        prepare_upload(f)
+
+    assert f.bytes_read == 2 * 1024 * 1024 + 1
+
+
+def test_prepare_upload_accepts_file_of_exactly_limit():
+    contents = b"a" * 2 * 1024 * 1024
+
+    assert prepare_upload(io.BytesIO(contents))["file"] == base64.b64encode(contents).decode("ascii")
+
+
+def test_prepare_upload_encodes_unseekable_files():
+    contents = bytes(i % 256 for i in range(100_000))
+
+    file_dict = prepare_upload(UnseekableFile(contents))
+
+    assert file_dict["file"] == base64.b64encode(contents).decode("ascii")
+
+
+def test_prepare_upload_encodes_from_current_position():
+    f = io.BytesIO(b"header:contents")
+    f.read(7)
+
+    assert prepare_upload(f)["file"] == base64.b64encode(b"contents").decode("ascii")
+
+
+@pytest.mark.parametrize("make_file", [io.BytesIO, UnseekableFile])
+def test_prepare_upload_can_stream_file(make_file):
+    contents = bytes(i % 256 for i in range(100_000))
+
+    file_dict = prepare_upload(make_file(contents), filename="file.pdf", stream=True)
+
+    assert isinstance(file_dict["file"], Base64Stream)
+    assert b"".join(file_dict["file"]) == base64.b64encode(contents)
+    assert file_dict["filename"] == "file.pdf"
@@ -0,0 +1,153 @@
+import asyncio
+import io
+from unittest import mock
+
+import httpx
+import pytest
+
+from notifications_python_client.async_notifications import AsyncNotificationsAPIClient
+from notifications_python_client.errors import HTTPError, ValidationError
+from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.validation import validate_notification
+from tests.conftest import COMBINED_API_KEY, TEST_HOST
+
+TEMPLATE_ID = "c745a8d8-b48a-4b0d-96e5-dbea0165ebd1"
+
+
+@pytest.fixture
+def client():
+    return NotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, validate_notifications=True)
+
+
+@pytest.mark.parametrize(
+    "notification_type, notification",
+    [
+        ("sms", {"phone_number": "07700 900000", "template_id": TEMPLATE_ID}),
+        ("email", {"email_address": "to@example.com", "template_id": TEMPLATE_ID, "personalisation": {"a": 1}}),
+        ("letter", {"template_id": TEMPLATE_ID, "personalisation": {"address_line_1": "A"}}),
+        ("precompiled_letter", {"reference": "ref", "content": object(), "postage": "first"}),
+    ],
+)
+def test_validate_notification_accepts_valid_notifications(notification_type, notification):
+    validate_notification(notification_type, notification)
+
+
+@pytest.mark.parametrize(
+    "notification_type, notification, expected_messages",
+    [
+        ("sms", {"phone_number": "07700 900000"}, ["template_id is a required property"]),
+        (
+            "email",
+            {"email_address": "to@example.com", "template_id": "456", "personalisation": "name"},
+            ["template_id is not a valid UUID", "personalisation should contain key value pairs"],
+        ),
+        (
+            "email",
+            {"email_address": "to@example.com", "template_id": TEMPLATE_ID, "one_click_unsubscribe_url": "http://a"},
+            ["one_click_unsubscribe_url is not a valid https url"],
+        ),
+        ("letter", {"template_id": TEMPLATE_ID}, ["personalisation is a required property"]),
+        (
+            "precompiled_letter",
+            {"reference": "ref", "content": "abc", "postage": "third"},
+            ["postage third is not one of [first, second, economy, europe, rest-of-world]"],
+        ),
+    ],
+)
+def test_validate_notification_raises_with_api_style_messages(notification_type, notification, expected_messages):
+    with pytest.raises(ValidationError) as e:
+        validate_notification(notification_type, notification)
+
+    assert e.value.status_code == 400
+    assert sorted(e.value.message, key=lambda error: error["message"]) == [
+        {"error": "ValidationError", "message": message} for message in sorted(expected_messages)
+    ]
+
+
+def test_validation_error_is_an_http_error():
+    error = ValidationError([{"error": "ValidationError", "message": "template_id is a required property"}])
+
+    assert isinstance(error, HTTPError)
+    assert str(error) == "400 - [{'error': 'ValidationError', 'message': 'template_id is a required property'}]"
+
+
+def test_notifications_are_not_validated_by_default(notifications_client, rmock):
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/sms", json={"id": "1"}, status_code=201)
+
+    notifications_client.send_sms_notification(phone_number="07700 900000", template_id="456")
+
+    assert rmock.called
+
+
+def test_invalid_notification_is_not_sent(client, rmock):
+    with pytest.raises(ValidationError) as e:
+        client.send_email_notification(email_address="to@example.com", template_id="456")
+
+    assert e.value.message == [{"error": "ValidationError", "message": "template_id is not a valid UUID"}]
+    assert not rmock.called
+
+
+def test_valid_notification_is_sent(client, rmock):
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/letter", json={"id": "1"}, status_code=201)
+
+    client.send_precompiled_letter_notification("ref", io.BytesIO(b"%PDF"), postage="second")
+
+    assert rmock.call_count == 1
+
+
+@pytest.mark.parametrize("sanitise_content_for", [["a"], ("a",), {"a"}, frozenset({"a"})])
+def test_arrays_can_be_any_type_the_client_sends_as_an_array(client, rmock, sanitise_content_for):
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/email", json={"id": "1"}, status_code=201)
+
+    client.send_email_notification(
+        "to@example.com", TEMPLATE_ID, personalisation={"a": "b"}, sanitise_content_for=sanitise_content_for
+    )
+
+    assert rmock.last_request.json()["sanitise_content_for"] == ["a"]
+
+
+@pytest.mark.parametrize("sanitise_content_for", ["a", {"a": "b"}, {1}, (None,)])
+def test_arrays_must_still_be_arrays_of_the_right_type(sanitise_content_for):
+    notification = {"email_address": "to@example.com", "template_id": TEMPLATE_ID}
+
+    with pytest.raises(ValidationError):
+        validate_notification("email", {**notification, "sanitise_content_for": sanitise_content_for})
+
+
+def test_bulk_send_returns_validation_errors_for_invalid_rows(client, rmock):
+    rmock.request("POST", f"{TEST_HOST}/v2/notifications/sms", json={"id": "1"}, status_code=201)
+    notifications = [
+        {"type": "sms", "phone_number": "07700 900000", "template_id": TEMPLATE_ID},
+        {"type": "sms", "phone_number": "07700 900000", "template_id": "not-a-uuid"},
+    ]
+
+    (_, sent), (_, invalid) = client.send_notifications_bulk(notifications, max_workers=2)
+
+    assert sent == {"id": "1"}
+    assert isinstance(invalid, ValidationError)
+    assert rmock.call_count == 1
+
+
+def test_validation_needs_jsonschema():
+    with mock.patch("notifications_python_client.validation.jsonschema_installed", return_value=False):
+        with pytest.raises(AssertionError):
+            NotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, validate_notifications=True)
+
+
+def test_async_client_validates_notifications():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(201, json={"id": "1"})
+
+    client = AsyncNotificationsAPIClient(base_url=TEST_HOST, api_key=COMBINED_API_KEY, validate_notifications=True)
+    client.request_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def send():
+        async with client:
+            return await client.send_sms_notification(phone_number="07700 900000", template_id="456")
+
+    with pytest.raises(ValidationError):
+        asyncio.run(send())
+    assert requests == []
@@ -0,0 +1,192 @@
+import json
+
+import pytest
+
+from tests.conftest import TEST_HOST
+from utils.make_api_call import committed_offset, notification_from_row, send_bulk
+
+SMS_URL = f"{TEST_HOST}/v2/notifications/sms"
+
+
+@pytest.fixture
+def sms(rmock):
+    def respond(request, context):
+        context.status_code = 201
+        return {"id": request.json()["reference"]}
+
+    return rmock.request("POST", SMS_URL, json=respond)
+
+
+def _send_bulk(client, input_path, **options):
+    kwargs = {
+        "--input": str(input_path),
+        "--results": "<input>.results.jsonl",
+        "--concurrency": "2",
+        "--type": None,
+        "--template": None,
+        **options,
+    }
+    return send_bulk(client, **kwargs)
+
+
+def _write_jsonl(path, rows):
+    path.write_text("".join(f"{json.dumps(row)}\n" for row in rows))
+
+
+def _results(path):
+    with open(f"{path}.results.jsonl") as results_file:
+        return [json.loads(line) for line in results_file]
+
+
+def _sms_row(number):
+    return {"type": "sms", "phone_number": "07700 900000", "template_id": "1", "reference": f"ref-{number}"}
+
+
+def test_committed_offset_removes_a_partly_written_last_result(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"row": 1, "id": "a"}\n{"row": 2, "id": "b"}\n{"row": 3, "i')
+
+    with open(path, "a+", encoding="utf-8") as results_file:
+        assert committed_offset(results_file) == 2
+
+    assert path.read_text() == '{"row": 1, "id": "a"}\n{"row": 2, "id": "b"}\n'
+
+
+def test_committed_offset_of_new_results_file(tmp_path):
+    with open(tmp_path / "results.jsonl", "a+", encoding="utf-8") as results_file:
+        assert committed_offset(results_file) == 0
+
+
+def test_send_bulk_writes_a_result_for_each_row_in_order(notifications_client, sms, tmp_path):
+    input_path = tmp_path / "notifications.jsonl"
+    _write_jsonl(input_path, [_sms_row(number) for number in range(1, 6)])
+
+    result = _send_bulk(notifications_client, input_path)
+
+    assert result == {"resumed_after_row": 0, "sent": 5, "failed": 0, "results": f"{input_path}.results.jsonl"}
+    assert _results(input_path) == [{"row": row, "id": f"ref-{row}"} for row in range(1, 6)]
+
+
+def test_send_bulk_resumes_after_the_last_committed_row(notifications_client, sms, tmp_path):
+    input_path = tmp_path / "notifications.jsonl"
+    _write_jsonl(input_path, [_sms_row(number) for number in range(1, 6)])
+    # a crash after writing two results and part of a third
+    with open(f"{input_path}.results.jsonl", "w") as results_file:
+        results_file.write('{"row": 1, "id": "ref-1"}\n{"row": 2, "id": "ref-2"}\n{"row": 3,')
+
+    result = _send_bulk(notifications_client, input_path)
+
+    assert result["resumed_after_row"] == 2
+    assert result["sent"] == 3
+    assert sorted(request.json()["reference"] for request in sms.request_history) == ["ref-3", "ref-4", "ref-5"]
+    assert _results(input_path) == [{"row": row, "id": f"ref-{row}"} for row in range(1, 6)]
+
+
+def test_send_bulk_from_csv(notifications_client, sms, tmp_path):
+    input_path = tmp_path / "notifications.csv"
+    # with the byte order mark spreadsheets often save CSV files with
+    input_path.write_text(
+        "\n".join(
+            [
+                "\ufeffphone_number,reference,sms_sender_id,name,date",
+                "07700 900000,ref-1,,Jo,Monday",
+                "07700 900001,ref-2,,Sam,",
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    result = _send_bulk(notifications_client, input_path, **{"--type": "sms", "--template": "template-1"})
+
+    assert result["sent"] == 2
+    sent = sorted((request.json() for request in sms.request_history), key=lambda request: request["reference"])
+    assert sent == [
+        {
+            "phone_number": "07700 900000",
+            "template_id": "template-1",
+            "reference": "ref-1",
+            "personalisation": {"name": "Jo", "date": "Monday"},
+        },
+        {
+            "phone_number": "07700 900001",
+            "template_id": "template-1",
+            "reference": "ref-2",
+            "personalisation": {"name": "Sam", "date": ""},
+        },
+    ]
+
+
+def test_send_bulk_records_rows_which_cannot_be_sent_without_sending_them(notifications_client, sms, tmp_path):
+    input_path = tmp_path / "notifications.jsonl"
+    rows = [
+        json.dumps(_sms_row(1)),
+        json.dumps({**_sms_row(2), "type": "pigeon"}),
+        json.dumps({"type": "sms", "template_id": "1"}),
+        "not json",
+        json.dumps(_sms_row(5)),
+    ]
+    input_path.write_text("\n".join(rows) + "\n")
+
+    result = _send_bulk(notifications_client, input_path)
+
+    assert (result["sent"], result["failed"]) == (2, 3)
+    assert [(record["row"], record.get("status_code"), record.get("error")) for record in _results(input_path)] == [
+        (1, None, None),
+        (2, 400, [{"error": "ValidationError", "message": "type pigeon is not one of [sms, email, letter]"}]),
+        (3, 400, [{"error": "ValidationError", "message": "phone_number is a required property"}]),
+        (4, 400, [{"error": "ValidationError", "message": "notification is not a JSON object"}]),
+        (5, None, None),
+    ]
+    assert sms.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "row, kwargs, expected",
+    [
+        (
+            {"type": "email", "email_address": "a@b.com"},
+            {"default_template_id": "t"},
+            {"type": "email", "email_address": "a@b.com", "template_id": "t"},
+        ),
+        (
+            {"phone_number": "07700 900000", "template_id": "1"},
+            {"default_type": "sms", "default_template_id": "t"},
+            {"type": "sms", "phone_number": "07700 900000", "template_id": "1"},
+        ),
+        (
+            {"type": "sms", "phone_number": "07700 900000", "template_id": "1", "reference": "", "name": "Jo"},
+            {"from_csv": True},
+            {"type": "sms", "phone_number": "07700 900000", "template_id": "1", "personalisation": {"name": "Jo"}},
+        ),
+        (
+            {"type": "letter", "template_id": "1", "address_line_1": "A", "email_reply_to_id": "x"},
+            {"from_csv": True},
+            {
+                "type": "letter",
+                "template_id": "1",
+                "personalisation": {"address_line_1": "A", "email_reply_to_id": "x"},
+            },
+        ),
+        (
+            {"type": "sms", "phone_number": "07700 900000", "name": "Jo"},
+            {},
+            {"type": "sms", "phone_number": "07700 900000", "name": "Jo"},
+        ),
+        (["not", "an", "object"], {"default_type": "sms"}, ["not", "an", "object"]),
+    ],
+)
+def test_notification_from_row(row, kwargs, expected):
+    assert notification_from_row(row, **kwargs) == expected
+
+
+def test_send_bulk_records_the_errors_send_notifications_bulk_finds(notifications_client, sms, tmp_path):
+    input_path = tmp_path / "notifications.jsonl"
+    _write_jsonl(input_path, [{**_sms_row(1), "name": "Jo"}])
+
+    result = _send_bulk(notifications_client, input_path)
+
+    assert result["failed"] == 1
+    assert _results(input_path)[0]["error"] == [
+        {"error": "ValidationError", "message": "name is not allowed for sms notifications"}
+    ]
+    assert sms.call_count == 0
@@ -13,19 +13,40 @@ Options:
     --one_click_unsubscribe_url=<''>
     --sms_sender_id=<''>
     --filename=<''>
+    --input=<recipients.csv>  CSV or JSONL file of notifications to send with bulk
+    --results=<results.jsonl>  file of bulk's results, to resume from [default: <input>.results.jsonl]
+    --concurrency=<n>  number of notifications bulk sends at once [default: 10]
+    --rate=<n>  most notifications bulk sends each second
 
 Example:
     ./make_api_call.py http://api my_service super_secret \
-    fetch|fetch-all|fetch-generator|create|preview|template|all_templates|template_version|all_template_versions
+    fetch|fetch-all|fetch-generator|create|bulk|preview|template|all_templates|template_version|all_template_versions
+
+Bulk:
+    Each row of a JSONL file is an object of the arguments to send_sms_notification, send_email_notification or
+    send_letter_notification, and a "type" of sms, email or letter. Each row of a CSV file has columns named after
+    those arguments, and every other column is personalisation. --type and --template are used for rows without a
+    type or template_id.
+
+    Rows are checked before they are sent, and a line with the notification id or the error is written to the results
+    file for each row, in the same order as the input. Run the same command again after a crash to carry on from the
+    first row without a result. Rows which were being sent at the time of the crash are sent again, so give each one a
+    reference to find duplicates by.
 """
 
+import csv
+import itertools
 import json
 import sys
+from collections import Counter
+from functools import partial
 from pprint import pprint
 
 from docopt import docopt
 
-from notifications_python_client.notifications import NotificationsAPIClient
+from notifications_python_client.notifications import BULK_SEND_METHODS, NotificationsAPIClient, _arguments
+from notifications_python_client.rate_limit import RateLimiter
+from notifications_python_client.retry import RetryPolicy
 
 
 def create_notification(notifications_client, **kwargs):
@@ -99,6 +120,109 @@ def create_precompiled_letter_notification(notifications_client, **kwargs):
         return notifications_client.send_precompiled_letter_notification(reference=reference, pdf_file=pdf_file)
 
 
+def send_bulk(notifications_client, **kwargs):
+    input_filename = kwargs["--input"] or input("input file (csv or jsonl): ")
+    results_filename = kwargs["--results"].replace("<input>", input_filename)
+    concurrency = int(kwargs["--concurrency"])
+    counts = Counter()
+
+    with open(results_filename, "a+", encoding="utf-8") as results_file:
+        offset = committed_offset(results_file)
+        rows = itertools.islice(read_rows(input_filename), offset, None)
+        to_notification = partial(
+            notification_from_row,
+            default_type=kwargs["--type"],
+            default_template_id=kwargs["--template"],
+            from_csv=input_filename.endswith(".csv"),
+        )
+        notifications = map(to_notification, rows)
+        for index, result in notifications_client.send_notifications_bulk(notifications, max_workers=concurrency):
+            record = result_record(offset + index + 1, result)
+            # flushed for every row, so the results file is never behind what has been sent by more than the rows in
+            # flight when the process stopped
+            results_file.write(json.dumps(record) + "\n")
+            results_file.flush()
+            counts["failed" if "error" in record else "sent"] += 1
+
+    return {
+        "resumed_after_row": offset,
+        "sent": counts["sent"],
+        "failed": counts["failed"],
+        "results": results_filename,
+    }
+
+
+def bulk_client(base_url, api_key, concurrency, rate):
+    return NotificationsAPIClient(
+        base_url=base_url,
+        api_key=api_key,
+        pool_maxsize=concurrency,
+        retry_policy=RetryPolicy(),
+        rate_limiter=RateLimiter(rate) if rate else None,
+        validate_notifications=True,
+    )
+
+
+def committed_offset(results_file):
+    """
+    :return: number of rows with a result, after removing any result which was only partly written
+    """
+    results_file.seek(0)
+    offset = 0
+    committed_length = 0
+    for line in results_file:
+        if not line.endswith("\n"):
+            break
+        offset += 1
+        committed_length += len(line.encode("utf-8"))
+    results_file.truncate(committed_length)
+    results_file.seek(0, 2)
+    return offset
+
+
+def read_rows(filename):
+    # utf-8-sig, because spreadsheets often save CSV files with a byte order mark
+    with open(filename, newline="", encoding="utf-8-sig") as input_file:
+        if filename.endswith(".csv"):
+            yield from csv.DictReader(input_file)
+            return
+        for line in input_file:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def notification_from_row(row, default_type=None, default_template_id=None, from_csv=False):
+    """
+    :return: the row as a notification for send_notifications_bulk, which checks its type and arguments. A row which
+        isn't a JSON object is returned as it is, for send_notifications_bulk to reject
+    """
+    if not isinstance(row, dict):
+        return row
+    notification = dict(row)
+    notification["type"] = notification.get("type") or default_type
+    if from_csv and notification["type"] in BULK_SEND_METHODS:
+        # empty cells are missing arguments, and columns which aren't arguments are personalisation
+        arguments = _arguments(getattr(NotificationsAPIClient, BULK_SEND_METHODS[notification["type"]]))[0]
+        personalisation = {key: value for key, value in notification.items() if key not in arguments | {"type"}}
+        notification = {key: value for key, value in notification.items() if key not in personalisation and value}
+        if personalisation:
+            notification["personalisation"] = personalisation
+
+    if not notification.get("template_id") and default_template_id:
+        notification["template_id"] = default_template_id
+    return notification
+
+
+def result_record(row_number, result):
+    if isinstance(result, Exception):
+        return {"row": row_number, "status_code": result.status_code, "error": result.message}
+    return {"row": row_number, "id": result["id"]}
+
+
 def get_notification(notifications_client):
     id = input("Notification id: ")
     return notifications_client.get_notification_by_id(id)
@@ -153,7 +277,15 @@ def get_template_version(notifications_client):
 if __name__ == "__main__":
     arguments = docopt(__doc__)
 
-    client = NotificationsAPIClient(base_url=arguments["<base_url>"], api_key=arguments["<secret>"])
+    if arguments["<call>"] == "bulk":
+        client = bulk_client(
+            arguments["<base_url>"],
+            arguments["<secret>"],
+            concurrency=int(arguments["--concurrency"]),
+            rate=float(arguments["--rate"] or 0),
+        )
+    else:
+        client = NotificationsAPIClient(base_url=arguments["<base_url>"], api_key=arguments["<secret>"])
 
     if arguments["<call>"] == "create":
         pprint(
@@ -162,6 +294,9 @@ if __name__ == "__main__":
             )
         )
 
+    if arguments["<call>"] == "bulk":
+        pprint(send_bulk(notifications_client=client, **{k: arguments[k] for k in arguments if k.startswith("--")}))
+
     if arguments["<call>"] == "fetch":
         pprint(get_notification(notifications_client=client))
 